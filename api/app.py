@@ -1,4 +1,8 @@
-from quart import Quart, request, jsonify
+import time
+# Measured from the first import so /api/stats can report the cost of starting the app
+IMPORT_STARTED = time.perf_counter()
+
+from quart import Quart, request, jsonify, make_response
 from quart_cors import cors
 import asyncio
 import uuid
@@ -7,20 +11,194 @@ from datetime import datetime
 from dotenv import load_dotenv
 import sys
 import traceback
+import hashlib
+import json
+import re
 
 # Add the src directory to the path so we can import our crew
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from linkedin_post_creator.crew import LinkedinPostCreator
+from linkedin_post_creator.crew_pool import CrewPool
+from linkedin_post_creator.job_store import create_job_store, TERMINAL_STATUSES
+from linkedin_post_creator.pipeline import PostPipeline, post_result
+from linkedin_post_creator.prefetch import create_research_prefetcher
+from linkedin_post_creator.research_cache import create_research_cache
+from linkedin_post_creator.scheduler import JobScheduler, QueueFullError, SchedulerShutdownError, PRIORITIES
+from linkedin_post_creator.checkpoints import CheckpointRecorder, create_checkpoint_store, recording as record_checkpoints
+from linkedin_post_creator.coalescer import create_coalescer, request_key
+from linkedin_post_creator.context_budget import context_budget_stats
+from linkedin_post_creator.knowledge import knowledge_stats, shared_knowledge_index
+from linkedin_post_creator.events import EventBroker, install_crew_listener, format_sse, STREAM_TASKS
+from linkedin_post_creator.artifacts import create_artifact_store
+from linkedin_post_creator.batch import BatchCheckpoint, BatchError, BatchRunner, parse_rows
+from linkedin_post_creator.cancellation import (
+    DeadlineExceededError, JobCancelledError, bind as bind_cancel_token, default_deadline_seconds,
+    stats as cancellation_stats,
+)
+from linkedin_post_creator.instrumentation import record_stages
+from linkedin_post_creator.llm_cache import llm_cache_stats
+from linkedin_post_creator.logs import configure_logging, trace_job, stats as logging_stats
+from linkedin_post_creator.metrics import REGISTRY, render_prometheus
+from linkedin_post_creator.rate_limit import rate_limit_stats
+from linkedin_post_creator.startup import PROFILE, loaded
+from linkedin_post_creator.variants import VariantError, VariantRunner, parse_variants
+from linkedin_post_creator.validator import stats as validation_stats
 
 # Load environment variables
 load_dotenv()
 
+# Crew output, job trace sampling and the background log writer follow LOG_PROFILE
+configure_logging()
+
 app = Quart(__name__)
-app = cors(app, allow_origin="*")
+app = cors(app, allow_origin="*", expose_headers=["ETag", "Retry-After", "X-Batch-Id"])
+
+# Job status storage; JOB_STORE=sqlite shares jobs between worker processes
+job_store = create_job_store()
+
+# Bounded worker pool for crew executions; excess requests are rejected with 429
+scheduler = JobScheduler(
+    workers=int(os.environ.get('CREW_WORKERS', 4)),
+    max_queue=int(os.environ.get('JOB_QUEUE_SIZE', 100))
+)
+
+# Pre-built crews reused across jobs instead of building one per request;
+# crewAI itself is loaded by the warm-up after the server starts
+crew_pool = CrewPool(
+    max_size=int(os.environ.get('CREW_POOL_SIZE', scheduler.workers))
+)
+
+# Job execution on pooled crews, skipping research that was done recently
+pipeline = PostPipeline(crew_pool, research_cache=create_research_cache())
+
+# Research for hot topic/industry pairs refreshed ahead of demand on the scheduler's low lane
+# (off unless PREFETCH_TOPICS or PREFETCH_LEARN_TOP is set)
+prefetcher = create_research_prefetcher(pipeline, scheduler, job_store)
+
+# Task outputs saved as each task finishes, so failed jobs resume at the failed task
+checkpoint_store = create_checkpoint_store()
+
+# Times a failed crew run is retried from its last checkpointed task before the job fails
+JOB_RETRIES = int(os.environ.get('JOB_RETRIES', 1))
+
+# Identical concurrent requests share one crew run; recent results are reused
+coalescer = create_coalescer()
+
+# Per-job post files; off by default since results are already kept in the job store
+artifacts = create_artifact_store()
+
+# Progress events pushed to /api/jobs/<job_id>/events subscribers
+events = EventBroker(retention_seconds=float(os.environ.get('EVENT_RETENTION_SECONDS', 300)))
+
+# Seconds between keep-alive comments on idle streams
+EVENT_STREAM_KEEPALIVE = float(os.environ.get('EVENT_STREAM_KEEPALIVE', 15))
+# Seconds between job store re-checks while waiting on a job, which may be running in another worker process
+JOB_STORE_POLL_INTERVAL = float(os.environ.get('JOB_STORE_POLL_INTERVAL', 1))
+# Tasks whose answers /api/generate-post-stream can stream
+STREAMABLE_TASKS = {'content_creation_task', 'content_review_task'}
+
+# Batch endpoint limits; checkpoints let a batch be resumed by re-posting it with its batch_id
+BATCH_MAX_ROWS = int(os.environ.get('BATCH_MAX_ROWS', 1000))
+BATCH_CHECKPOINT_DIR = os.environ.get('BATCH_CHECKPOINT_DIR', '.cache/batches')
+
+# Most posts one /api/generate-variants request may ask for
+VARIANTS_MAX = int(os.environ.get('VARIANTS_MAX', 8))
+
+# Upper bound for ?wait= on long-polled status requests
+STATUS_MAX_WAIT = float(os.environ.get('STATUS_MAX_WAIT', 30))
+
+# Longest a job may take from its request to its result; requests may ask for less with deadline_seconds
+JOB_DEADLINE_SECONDS = default_deadline_seconds()
+
+# Seconds queued and running jobs get to finish on shutdown before they are marked failed
+DRAIN_TIMEOUT = float(os.environ.get('DRAIN_TIMEOUT', 30))
+
+# Load crewAI and build pooled crews in the background once serving starts
+# (false: load them on the first job instead)
+WARM_UP = os.environ.get('WARM_UP', 'true').lower() not in ('0', 'false', 'no', 'off')
 
-# In-memory storage for job status (in production, use Redis or a database)
-job_storage = {}
+PROFILE.record('app_import', time.perf_counter() - IMPORT_STARTED)
+
+def warm_up():
+    """Import the agent stack, hook up crew events and prefill the crew pool"""
+    prefill = int(os.environ.get('CREW_POOL_PREFILL', 1))
+    steps = [('install_crew_listener', install_crew_listener)]
+    index = shared_knowledge_index()
+    if index is not None:
+        steps.append(('knowledge_index', index.refresh))
+    if prefill > 0:
+        steps.append(('crew_pool_prefill', lambda: crew_pool.prefill(prefill)))
+    PROFILE.warm_up(steps=steps)
+
+@app.before_serving
+async def start_warm_up():
+    """Warm up off the startup path so /api/health answers as soon as the socket is open"""
+    if WARM_UP:
+        app.add_background_task(warm_up)
+
+@app.before_serving
+async def start_job_store_compaction():
+    """Periodically drop finished jobs older than JOB_TTL_SECONDS"""
+    job_store.start_background_compaction(float(os.environ.get('JOB_COMPACTION_INTERVAL', 300)))
+
+@app.before_serving
+async def start_prefetch():
+    """Start refreshing the research of hot topics in the background"""
+    if prefetcher is not None:
+        prefetcher.start()
+
+@app.after_serving
+async def close_job_store():
+    """Drain running jobs, then flush pending artifact and job writes on shutdown"""
+    await asyncio.to_thread(drain_jobs, DRAIN_TIMEOUT)
+    if artifacts is not None:
+        artifacts.close()
+    job_store.close()
+
+def drain_jobs(timeout):
+    """Let queued and running jobs finish for up to ``timeout`` seconds, then fail the rest.
+
+    No other process will pick these jobs up, so they are marked failed rather
+    than left 'running' in a shared job store.
+    """
+    # Prefetches would only hold up the drain
+    if prefetcher is not None:
+        prefetcher.stop()
+    if not scheduler.drain(timeout):
+        print(f"Shutdown: jobs still running after {timeout:g}s, marking them failed")
+    scheduler.shutdown(wait=False, cancel_pending=True)
+    error = SchedulerShutdownError('Server shut down before the job finished, please retry')
+    for execution in coalescer.unfinished():
+        # Stop runs still going so they don't keep calling Gemini and Serper
+        execution.token.cancel(str(error))
+        job_ids = coalescer.finish(execution, error=error)
+        update_jobs(job_ids, status='failed', error=str(error), progress=f'Failed: {str(error)}')
+
+def queue_full_response(error):
+    """429 response telling the client when to retry"""
+    response = jsonify({
+        'error': 'Server is busy, please retry later',
+        'retry_after': error.retry_after
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def shutting_down_response():
+    """503 response for requests arriving while this worker drains"""
+    response = jsonify({'error': 'Server is shutting down, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+def public_job(job):
+    """Job fields returned to clients"""
+    return {k: v for k, v in job.items() if k not in ('created_at', 'updated_at')}
+
+def job_etag(job):
+    """Strong validator for a job's client-visible state"""
+    payload = json.dumps(public_job(job), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
 
 @app.route('/api/health', methods=['GET'])
 async def health_check():
@@ -28,8 +206,113 @@ async def health_check():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'service': 'linkedin-post-creator'
+        'service': 'linkedin-post-creator',
+        'pid': os.getpid(),
+        'warm': PROFILE.warm
+    })
+
+def search_stats():
+    """Search tool counters; none until the tool module has been loaded by a crew"""
+    if not loaded('linkedin_post_creator.tools.custom_tool'):
+        return None
+    from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool
+    return CachedSerperDevTool.stats()
+
+@app.route('/api/stats', methods=['GET'])
+async def get_stats():
+    """Runtime statistics for capacity tuning"""
+    return jsonify({
+        'crew_pool': crew_pool.stats(),
+        'job_store': job_store.stats(),
+        'scheduler': scheduler.stats(),
+        'coalescer': coalescer.stats(),
+        'events': events.stats(),
+        'artifacts': artifacts.stats() if artifacts is not None else None,
+        **pipeline.stats(),
+        'prefetch': prefetcher.stats() if prefetcher is not None else None,
+        'search': search_stats(),
+        'llm_cache': llm_cache_stats(),
+        'context_budget': context_budget_stats(),
+        'knowledge': knowledge_stats(),
+        'checkpoints': checkpoint_store.stats() if checkpoint_store is not None else None,
+        'rate_limits': rate_limit_stats(),
+        'cancellation': cancellation_stats(),
+        'validation': validation_stats(),
+        'logging': logging_stats(),
+        'startup': PROFILE.stats(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+async def get_metrics():
+    """Counters, gauges and histograms (including per-task stage timings) in Prometheus text format.
+
+    Each worker process keeps its own metrics, so with several workers a
+    scrape sees the worker that served it.
+    """
+    return render_prometheus(REGISTRY), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+def job_deadline(data):
+    """time.monotonic() deadline of a request's job, ``deadline_seconds`` from now (None: no deadline).
+
+    Requests can shorten JOB_DEADLINE_SECONDS but not extend it. Raises
+    ValueError when ``deadline_seconds`` is not a positive number.
+    """
+    seconds = data.get('deadline_seconds', JOB_DEADLINE_SECONDS)
+    if seconds is None:
+        return None
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds <= 0:
+        raise ValueError('deadline_seconds must be a positive number')
+    if JOB_DEADLINE_SECONDS is not None:
+        seconds = min(seconds, JOB_DEADLINE_SECONDS)
+    return time.monotonic() + seconds
+
+def start_job(job_id, inputs, priority, debug=False, deadline=None):
+    """Create a job and attach it to a crew run.
+
+    Returns the cached result when an identical request finished recently (the
+    job is then already completed), otherwise None. Raises QueueFullError,
+    leaving no job behind, when the scheduler is full, or SchedulerShutdownError
+    when this worker is draining. ``debug`` jobs skip the result cache and
+    turn on debug tracing for the run they attach to. The run stops at
+    ``deadline`` (see job_deadline), or later if other jobs share it.
+    """
+    key = request_key(inputs)
+    
+    # Serve a recent identical request without running the crew
+    cached = coalescer.cached_result(key) if not debug else None
+    if cached is not None:
+        job_store.create(job_id, {
+            'status': 'completed',
+            'progress': 'LinkedIn post generated successfully!',
+            'result': cached,
+            'error': None,
+            'timestamp': datetime.now().isoformat()
+        })
+        return cached
+    
+    # Initialize job status
+    job_store.create(job_id, {
+        'status': 'started',
+        'progress': 'Initializing AI agents...',
+        'result': None,
+        'error': None,
+        'timestamp': datetime.now().isoformat()
     })
+    
+    # Attach to an identical in-flight run, or queue a new one on the scheduler
+    execution, leader = coalescer.join(key, job_id, deadline)
+    if debug:
+        execution.debug = True
+    if leader:
+        try:
+            execution.scheduled = scheduler.submit(run_crew_job, execution, inputs, priority=priority)
+        except (QueueFullError, SchedulerShutdownError) as e:
+            job_ids = coalescer.finish(execution, error=e)
+            update_jobs([j for j in job_ids if j != job_id], status='failed', error=str(e), progress=f'Failed: {str(e)}')
+            job_store.delete(job_id)
+            raise
+    return None
 
 @app.route('/api/generate-post', methods=['POST'])
 async def generate_post():
@@ -46,21 +329,42 @@ async def generate_post():
         industry = data.get('industry', 'Technology')
         tone = data.get('tone', 'professional')
         audience = data.get('audience', 'professionals')
+        priority = data.get('priority', 'normal')
+        debug = data.get('debug', False)
+        
+        if priority not in PRIORITIES:
+            return jsonify({'error': f'Priority must be one of {list(PRIORITIES)}'}), 400
+        if not isinstance(debug, bool):
+            return jsonify({'error': 'debug must be true or false'}), 400
+        try:
+            deadline = job_deadline(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        inputs = {
+            'topic': topic,
+            'industry': industry,
+            'tone': tone,
+            'audience': audience,
+            'current_year': str(datetime.now().year)
+        }
         
         # Generate unique job ID
         job_id = str(uuid.uuid4())
         
-        # Initialize job status
-        job_storage[job_id] = {
-            'status': 'started',
-            'progress': 'Initializing AI agents...',
-            'result': None,
-            'error': None,
-            'timestamp': datetime.now().isoformat()
-        }
+        try:
+            cached = start_job(job_id, inputs, priority, debug, deadline)
+        except QueueFullError as e:
+            return queue_full_response(e)
+        except SchedulerShutdownError:
+            return shutting_down_response()
         
-        # Start the crew execution in the background
-        asyncio.create_task(run_crew_async(job_id, topic, industry, tone, audience))
+        if cached is not None:
+            return jsonify({
+                'job_id': job_id,
+                'status': 'completed',
+                'message': 'LinkedIn post served from cache'
+            }), 202
         
         return jsonify({
             'job_id': job_id,
@@ -76,59 +380,541 @@ async def generate_post():
 
 @app.route('/api/status/<job_id>', methods=['GET'])
 async def get_job_status(job_id):
-    """Check the status of a post generation job"""
-    if job_id not in job_storage:
+    """Check the status of a post generation job.
+
+    Responses carry an ETag. A request with a matching If-None-Match gets 304,
+    and with ?wait=<seconds> the request is held until the job changes
+    (long-poll fallback for clients without EventSource).
+    """
+    job = job_store.get(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    return jsonify(job_storage[job_id])
+    etag = job_etag(job)
+    if request.if_none_match.contains(etag):
+        wait = min(request.args.get('wait', 0, type=float), STATUS_MAX_WAIT)
+        if wait > 0 and job['status'] not in TERMINAL_STATUSES:
+            subscription = events.subscribe(job_id)
+            try:
+                deadline = asyncio.get_running_loop().time() + wait
+                while etag == job_etag(job):
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    # Wake on local events, re-checking the store for jobs run by other processes
+                    await subscription.get(min(remaining, JOB_STORE_POLL_INTERVAL))
+                    job = job_store.get(job_id)
+                    if job is None:
+                        return jsonify({'error': 'Job not found'}), 404
+            finally:
+                subscription.close()
+            etag = job_etag(job)
+        
+        if request.if_none_match.contains(etag):
+            response = await make_response('', 304)
+            response.set_etag(etag)
+            return response
+    
+    response = jsonify(public_job(job))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-async def run_crew_async(job_id, topic, industry, tone, audience):
-    """Run the CrewAI crew asynchronously"""
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+async def stream_job_events(job_id):
+    """Server-Sent Events stream of a job's progress.
+
+    Emits ``status`` events with the full job on every state change plus
+    ``task_started``, ``task_completed``, ``agent_started``, ``agent_step``,
+    ``tool_started``, ``tool_finished``, ``context_compacted`` and ``token``
+    events from the crew.
+    The stream ends after the job completes, fails or is cancelled.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    
+    async def event_stream():
+        subscription = events.subscribe(job_id)
+        try:
+            current = job
+            last_seq = 0
+            if last_event_id is not None:
+                # Reconnect: replay what the client missed
+                for event in events.history(job_id, after=last_event_id):
+                    last_seq = event.seq
+                    yield event.to_sse()
+            else:
+                last_seq = events.last_seq(job_id)
+            
+            etag = job_etag(current)
+            yield format_sse('status', public_job(current), last_seq)
+            
+            idle = 0.0
+            while current['status'] not in TERMINAL_STATUSES:
+                event = await subscription.get(JOB_STORE_POLL_INTERVAL)
+                if event is not None:
+                    if event.seq <= last_seq:
+                        continue
+                    last_seq = event.seq
+                    idle = 0.0
+                    yield event.to_sse()
+                    if event.type != 'status':
+                        continue
+                    current = event.data
+                    etag = job_etag(current)
+                    continue
+                
+                # Idle: the job may be running in another worker process, which
+                # only shares its status through the job store
+                latest = job_store.get(job_id)
+                if latest is None:
+                    break
+                if job_etag(latest) != etag:
+                    current = latest
+                    etag = job_etag(current)
+                    idle = 0.0
+                    yield format_sse('status', public_job(current))
+                else:
+                    idle += JOB_STORE_POLL_INTERVAL
+                    if idle >= EVENT_STREAM_KEEPALIVE:
+                        idle = 0.0
+                        yield ": keep-alive\n\n"
+        finally:
+            subscription.close()
+    
+    response = await make_response(event_stream(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None
+    return response
+
+@app.route('/api/jobs', methods=['GET'])
+async def list_jobs():
+    """List recent jobs, optionally filtered by status and age in seconds"""
+    status = request.args.get('status')
+    older_than = request.args.get('older_than', type=float)
+    newer_than = request.args.get('newer_than', type=float)
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    
+    jobs = job_store.list_jobs(status=status, older_than=older_than, newer_than=newer_than, limit=limit)
+    return jsonify({
+        'jobs': [
+            {
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'progress': job['progress'],
+                'timestamp': job['timestamp']
+            }
+            for job in jobs
+        ],
+        'count': len(jobs)
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+async def delete_job(job_id):
+    """Cancel a queued or running job, or delete a finished one.
+
+    The crew run behind a cancelled job stops, releasing its worker, unless
+    an identical request still shares it. A finished job is removed along
+    with its stored artifacts; posts other jobs share are kept.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] in TERMINAL_STATUSES:
+        job_store.delete(job_id)
+        if artifacts is not None:
+            await asyncio.to_thread(artifacts.delete_job, job_id)
+        return jsonify({'job_id': job_id, 'status': job['status'], 'deleted': True})
+    
+    cancel_job(job_id)
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(public_job(job))
+
+def resume_job(job_id, checkpoint, priority, deadline=None):
+    """Queue a failed or cancelled job again, starting at the first task its checkpoint lacks.
+
+    Raises QueueFullError or SchedulerShutdownError, leaving the job failed,
+    when the run can't be queued.
+    """
+    update_jobs([job_id], status='started', progress=f'Resuming at {checkpoint.next_task()}...', error=None, result=None)
+    execution, leader = coalescer.join(request_key(checkpoint.inputs), job_id, deadline)
+    if leader:
+        try:
+            execution.scheduled = scheduler.submit(
+                run_crew_job, execution, checkpoint.inputs, checkpoint.outputs, priority=priority
+            )
+        except (QueueFullError, SchedulerShutdownError) as e:
+            job_ids = coalescer.finish(execution, error=e)
+            update_jobs(job_ids, status='failed', error=str(e), progress=f'Failed: {str(e)}')
+            raise
+
+@app.route('/api/jobs/<job_id>/resume', methods=['POST'])
+async def resume(job_id):
+    """Re-run a failed or cancelled job from the first task that didn't finish.
+
+    Finished tasks are taken from the job's checkpoint, so only the failed
+    stage and those after it spend tokens. Accepts ``priority`` and
+    ``deadline_seconds`` like /api/generate-post.
+    """
+    if checkpoint_store is None:
+        return jsonify({'error': 'Checkpoints are disabled'}), 404
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] not in ('failed', 'cancelled'):
+        return jsonify({'error': f"Only failed or cancelled jobs can be resumed, job is {job['status']}"}), 409
+    checkpoint = checkpoint_store.load(job_id)
+    if checkpoint is None:
+        return jsonify({'error': 'Job has no checkpoint to resume from'}), 409
+    
+    data = await request.get_json(silent=True) or {}
+    priority = data.get('priority', 'normal')
+    if priority not in PRIORITIES:
+        return jsonify({'error': f'Priority must be one of {list(PRIORITIES)}'}), 400
+    try:
+        deadline = job_deadline(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resume_job(job_id, checkpoint, priority, deadline)
+    except QueueFullError as e:
+        return queue_full_response(e)
+    except SchedulerShutdownError:
+        return shutting_down_response()
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': 'started',
+        'resumed_at': checkpoint.next_task(),
+        'message': 'LinkedIn post generation resumed'
+    }), 202
+
+@app.route('/api/generate-post-stream', methods=['POST'])
+async def generate_post_stream():
+    """Generate a LinkedIn post and stream the final answer token by token.
+
+    Responds with Server-Sent Events: ``job`` (the job id), ``token`` events
+    with the text of the tasks listed in ``stream_tasks`` (default: the
+    draft and, if it runs, the critic's review) as the LLM generates it,
+    then ``result`` or ``error``.
+    """
+    data = await request.get_json()
+    
+    # Validate required fields
+    if not data or 'topic' not in data:
+        return jsonify({'error': 'Topic is required'}), 400
+    
+    priority = data.get('priority', 'high')
+    if priority not in PRIORITIES:
+        return jsonify({'error': f'Priority must be one of {list(PRIORITIES)}'}), 400
+    
+    stream_tasks = data.get('stream_tasks', list(STREAM_TASKS))
+    if not isinstance(stream_tasks, list) or not set(stream_tasks) <= STREAMABLE_TASKS:
+        return jsonify({'error': f'stream_tasks must be a list of {sorted(STREAMABLE_TASKS)}'}), 400
+    
+    debug = data.get('debug', False)
+    if not isinstance(debug, bool):
+        return jsonify({'error': 'debug must be true or false'}), 400
+    
+    try:
+        deadline = job_deadline(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    inputs = {
+        'topic': data['topic'],
+        'industry': data.get('industry', 'Technology'),
+        'tone': data.get('tone', 'professional'),
+        'audience': data.get('audience', 'professionals'),
+        'current_year': str(datetime.now().year)
+    }
+    
+    # Subscribe before the job starts so no token is missed
+    job_id = str(uuid.uuid4())
+    subscription = events.subscribe(job_id)
+    try:
+        cached = start_job(job_id, inputs, priority, debug, deadline)
+    except QueueFullError as e:
+        subscription.close()
+        return queue_full_response(e)
+    except SchedulerShutdownError:
+        subscription.close()
+        return shutting_down_response()
+    
+    def final_event(job):
+        if job is not None and job['status'] == 'completed':
+            return format_sse('result', job['result'])
+        return format_sse('error', {'error': job['error'] if job else 'Job not found'})
+    
+    async def token_stream():
+        finished = cached is not None
+        try:
+            yield format_sse('job', {'job_id': job_id})
+            if cached is not None:
+                yield format_sse('result', cached)
+                return
+            
+            while True:
+                event = await subscription.get(EVENT_STREAM_KEEPALIVE)
+                if event is None:
+                    job = job_store.get(job_id)
+                    if job is None or job['status'] in TERMINAL_STATUSES:
+                        finished = True
+                        yield final_event(job)
+                        return
+                    yield ": keep-alive\n\n"
+                elif event.type == 'token' and event.data['task'] in stream_tasks:
+                    yield format_sse('token', event.data)
+                elif event.type == 'status' and event.data['status'] in TERMINAL_STATUSES:
+                    finished = True
+                    yield final_event(event.data)
+                    return
+        finally:
+            subscription.close()
+            # Nobody reads this job's answer once the client has gone
+            if not finished:
+                cancel_job(job_id, 'Client disconnected')
+    
+    response = await make_response(token_stream(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None
+    return response
+
+@app.route('/api/generate-batch', methods=['POST'])
+async def generate_batch():
+    """Generate posts for a JSONL body of requests, streaming JSONL results in completion order.
+
+    Rows are run on the shared scheduler at low priority with at most
+    ``?concurrency=`` in flight, and rows with the same topic/industry share
+    their research. Finished rows are checkpointed under ``batch_id`` (returned
+    in X-Batch-Id); posting the same body with ``?batch_id=`` again resumes the
+    batch, returning saved rows with ``"resumed": true``.
+    """
+    body = (await request.get_data()).decode('utf-8')
+    try:
+        rows = parse_rows(body.splitlines())
+    except BatchError as e:
+        return jsonify({'error': str(e)}), 400
+    if not rows:
+        return jsonify({'error': 'At least one request is required'}), 400
+    if len(rows) > BATCH_MAX_ROWS:
+        return jsonify({'error': f'Batches are limited to {BATCH_MAX_ROWS} requests'}), 400
+    
+    batch_id = request.args.get('batch_id') or str(uuid.uuid4())
+    if not re.fullmatch(r'[\w-]{1,64}', batch_id):
+        return jsonify({'error': 'batch_id may only contain letters, digits, - and _'}), 400
+    concurrency = max(1, min(request.args.get('concurrency', scheduler.workers, type=int), scheduler.workers))
+    
+    runner = BatchRunner(
+        crew_pool,
+        research_cache=pipeline.research_cache,
+        concurrency=concurrency,
+        submit=lambda fn, *args: scheduler.submit(fn, *args, priority='low')
+    )
+    checkpoint = BatchCheckpoint(os.path.join(BATCH_CHECKPOINT_DIR, f'{batch_id}.jsonl'))
+    
+    # Rows run on scheduler workers; the response only awaits their futures
+    async def jsonl_stream():
+        try:
+            async for record in runner.run_async(rows, checkpoint):
+                yield json.dumps(record, default=str) + '\n'
+        except Exception as e:
+            print(f"Error in batch {batch_id}: {e}")
+            traceback.print_exc()
+            yield json.dumps({'status': 'failed', 'error': str(e)}) + '\n'
+    
+    response = await make_response(jsonl_stream(), {
+        'Content-Type': 'application/x-ndjson',
+        'X-Batch-Id': batch_id
+    })
+    response.timeout = None
+    return response
+
+@app.route('/api/generate-variants', methods=['POST'])
+async def generate_variants():
+    """Generate several posts for one topic, streaming JSONL results as each finishes.
+
+    Research runs once and is shared; every variant (a ``tone``/``audience``
+    combination from ``variants`` or ``tones`` x ``audiences``) is then
+    written and reviewed concurrently on the scheduler. The first line is the
+    research record, then one line per variant in completion order.
+    """
+    data = await request.get_json()
+    
+    if not data or 'topic' not in data:
+        return jsonify({'error': 'Topic is required'}), 400
+    
+    priority = data.get('priority', 'normal')
+    if priority not in PRIORITIES:
+        return jsonify({'error': f'Priority must be one of {list(PRIORITIES)}'}), 400
+    
+    try:
+        variants = parse_variants(data, VARIANTS_MAX)
+    except VariantError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    inputs = {
+        'topic': data['topic'],
+        'industry': data.get('industry', 'Technology'),
+        'tone': data.get('tone', 'professional'),
+        'audience': data.get('audience', 'professionals'),
+        'current_year': str(datetime.now().year)
+    }
+    
+    runner = VariantRunner(
+        pipeline,
+        concurrency=min(len(variants), scheduler.workers),
+        submit=lambda fn, *args: scheduler.submit(fn, *args, priority=priority)
+    )
+    
+    async def jsonl_stream():
+        try:
+            async for record in runner.run_async(inputs, variants):
+                yield json.dumps(record, default=str) + '\n'
+        except SchedulerShutdownError:
+            yield json.dumps({'status': 'failed', 'error': 'Server is shutting down, please retry'}) + '\n'
+        except Exception as e:
+            print(f"Error generating variants: {e}")
+            traceback.print_exc()
+            yield json.dumps({'status': 'failed', 'error': str(e)}) + '\n'
+    
+    response = await make_response(jsonl_stream(), {'Content-Type': 'application/x-ndjson'})
+    response.timeout = None
+    return response
+
+def update_jobs(job_ids, **fields):
+    """Apply the same update to every job sharing a crew run and notify subscribers"""
+    for job_id in job_ids:
+        job_store.update(job_id, **fields)
+        job = job_store.get(job_id)
+        if job is not None:
+            events.publish(job_id, 'status', public_job(job), final=job['status'] in TERMINAL_STATUSES)
+
+def cancelled_elsewhere(execution):
+    """Whether every job attached to a run was cancelled through another worker process"""
+    job_ids = coalescer.job_ids(execution)
+    return bool(job_ids) and all(job_store.committed_status(job_id) == 'cancelled' for job_id in job_ids)
+
+def cancel_job(job_id, reason='Cancelled by client'):
+    """Mark a job cancelled and stop its crew run once no other job or request waits for it.
+
+    A run that has not left the queue is removed from it; a running one stops
+    at its next LLM or search call. Jobs running in another worker process
+    stop when that process next polls the job store.
+    """
+    execution, orphaned = coalescer.detach(job_id)
+    if execution is None:
+        # Finished meanwhile, or running in another worker process
+        job = job_store.get(job_id)
+        if job is None or job['status'] in TERMINAL_STATUSES:
+            return
+    update_jobs([job_id], status='cancelled', error=reason, progress='Cancelled')
+    if execution is None or not orphaned:
+        return
+    execution.token.cancel(reason)
+    if execution.scheduled is not None and scheduler.cancel(execution.scheduled):
+        coalescer.finish(execution, error=JobCancelledError(reason))
+
+def run_pipeline(inputs, recorder):
+    """Run the pipeline, retrying a failed attempt from the first task it didn't finish"""
+    for attempt in range(JOB_RETRIES + 1):
+        try:
+            return pipeline.run(inputs, checkpoint=recorder.outputs)
+        except JobCancelledError:
+            raise
+        except Exception as e:
+            if attempt == JOB_RETRIES:
+                raise
+            print(f"Crew run failed, retrying at {recorder.next_task()}: {e}")
+            update_jobs(recorder.job_ids(), progress=f'Retrying at {recorder.next_task()}...')
+
+def run_crew_job(execution, inputs, checkpoint=None):
+    """Run the CrewAI crew for a coalesced execution on a scheduler worker thread.
+
+    ``checkpoint`` holds the task outputs of an earlier attempt of a resumed job.
+    """
     try:
         # Update status
-        job_storage[job_id]['status'] = 'running'
-        job_storage[job_id]['progress'] = 'Research agent searching for trending topics...'
-        
-        # Prepare inputs for the crew
-        inputs = {
-            'topic': topic,
-            'industry': industry,
-            'tone': tone,
-            'audience': audience,
-            'current_year': str(datetime.now().year)
-        }
+        update_jobs(coalescer.job_ids(execution), status='running', progress='Research agent searching for trending topics...')
         
         # Create and run the crew
-        job_storage[job_id]['progress'] = 'Creating LinkedIn post...'
+        update_jobs(coalescer.job_ids(execution), progress='Creating LinkedIn post...')
+        
+        # Time between the request arriving and a worker picking it up
+        queue_wait = max(time.time() - execution.started_at, 0.0)
+        job_ids = lambda: coalescer.job_ids(execution)
+        # Jobs may also be cancelled through another worker process sharing the job store
+        execution.token.poll = lambda: cancelled_elsewhere(execution)
+        execution.token.poll_interval = JOB_STORE_POLL_INTERVAL
+        # Each finished task is checkpointed for every attached job
+        recorder = CheckpointRecorder(checkpoint_store, job_ids, inputs, checkpoint)
+        if checkpoint_store is not None:
+            checkpoint_store.begin(job_ids(), inputs)
+            if checkpoint:
+                checkpoint_store.resumed()
+        with bind_cancel_token(execution.token), events.bind(job_ids), record_stages(queue_wait) as stages, \
+                trace_job(job_ids, debug=lambda: execution.debug, run=execution.key[:16]) as trace, \
+                record_checkpoints(recorder):
+            output = run_pipeline(inputs, recorder)
+            trace.finish(output)
+        result = post_result(output, inputs, stages.summary())
         
-        # Run the crew in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, 
-            lambda: LinkedinPostCreator().crew().kickoff(inputs=inputs)
+        # Keep a content-addressed copy of the post for every attached job
+        if artifacts is not None:
+            result['artifact'] = artifacts.put(result['post'], coalescer.job_ids(execution))
+        
+        # Update every attached job with success
+        job_ids = coalescer.finish(execution, result=result)
+        update_jobs(
+            job_ids,
+            status='completed',
+            progress='LinkedIn post generated successfully!',
+            result=result
         )
+        # Completed jobs have nothing left to resume
+        if checkpoint_store is not None:
+            checkpoint_store.delete(job_ids)
+        return result
         
-        # Update job with success
-        job_storage[job_id]['status'] = 'completed'
-        job_storage[job_id]['progress'] = 'LinkedIn post generated successfully!'
-        job_storage[job_id]['result'] = {
-            'post': str(result),
-            'topic': topic,
-            'industry': industry,
-            'tone': tone,
-            'audience': audience,
-            'word_count': len(str(result).split()),
-            'generated_at': datetime.now().isoformat()
-        }
+    except JobCancelledError as e:
+        # Jobs cancelled here were already detached and updated by cancel_job
+        job_ids = coalescer.finish(execution, error=e)
+        if isinstance(e, DeadlineExceededError):
+            update_jobs(job_ids, status='failed', error=str(e), progress=f'Failed: {str(e)}')
+        else:
+            update_jobs(job_ids, status='cancelled', error=str(e), progress='Cancelled')
         
     except Exception as e:
-        # Update job with error
-        job_storage[job_id]['status'] = 'failed'
-        job_storage[job_id]['error'] = str(e)
-        job_storage[job_id]['progress'] = f'Failed: {str(e)}'
+        # Update every attached job with the error
+        job_ids = coalescer.finish(execution, error=e)
+        update_jobs(job_ids, status='failed', error=str(e), progress=f'Failed: {str(e)}')
         print(f"Error in crew execution: {e}")
         traceback.print_exc()
 
+@app.route('/api/artifacts/<key>', methods=['GET'])
+async def get_artifact(key):
+    """Download a stored post by its content hash"""
+    if artifacts is None:
+        return jsonify({'error': 'Artifact storage is disabled'}), 404
+    if not re.fullmatch(r'[0-9a-f]{64}', key):
+        return jsonify({'error': 'Invalid artifact key'}), 400
+    content = artifacts.get(key)
+    if content is None:
+        return jsonify({'error': 'Artifact not found'}), 404
+    return content, 200, {'Content-Type': 'text/markdown; charset=utf-8', 'Cache-Control': 'public, max-age=31536000, immutable'}
+
 @app.route('/api/generate-post-sync', methods=['POST'])
 async def generate_post_sync():
     """Generate a LinkedIn post synchronously (for testing)"""
@@ -144,6 +930,14 @@ async def generate_post_sync():
         industry = data.get('industry', 'Technology')
         tone = data.get('tone', 'professional')
         audience = data.get('audience', 'professionals')
+        debug = data.get('debug', False)
+        
+        if not isinstance(debug, bool):
+            return jsonify({'error': 'debug must be true or false'}), 400
+        try:
+            deadline = job_deadline(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Prepare inputs for the crew
         inputs = {
@@ -154,20 +948,28 @@ async def generate_post_sync():
             'current_year': str(datetime.now().year)
         }
         
-        # Run the crew synchronously (for small requests)
-        result = LinkedinPostCreator().crew().kickoff(inputs=inputs)
+        key = request_key(inputs)
+        result = coalescer.cached_result(key) if not debug else None
+        if result is None:
+            # Share an identical in-flight run, or start one on a worker, and
+            # wait for it without blocking the event loop
+            execution, leader = coalescer.join(key, deadline=deadline)
+            if debug:
+                execution.debug = True
+            if leader:
+                try:
+                    execution.scheduled = scheduler.submit(run_crew_job, execution, inputs, priority='high')
+                except QueueFullError as e:
+                    coalescer.finish(execution, error=e)
+                    return queue_full_response(e)
+                except SchedulerShutdownError as e:
+                    coalescer.finish(execution, error=e)
+                    return shutting_down_response()
+            result = await asyncio.wrap_future(execution.future)
         
         return jsonify({
             'status': 'completed',
-            'result': {
-                'post': str(result),
-                'topic': topic,
-                'industry': industry,
-                'tone': tone,
-                'audience': audience,
-                'word_count': len(str(result).split()),
-                'generated_at': datetime.now().isoformat()
-            }
+            'result': result
         })
         
     except Exception as e:
@@ -177,5 +979,6 @@ async def generate_post_sync():
         }), 500
 
 if __name__ == '__main__':
+    # Development server; use `python -m api.serve` for production
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
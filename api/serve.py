@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Production Server
+
+Runs the API under Hypercorn with several worker processes accepting
+connections on one shared socket, so request handling is not limited to a
+single core. Workers share job state through the SQLite job store; each
+worker runs its own CREW_WORKERS crews.
+
+On SIGTERM or SIGINT the workers stop accepting connections, give open
+requests GRACEFUL_TIMEOUT seconds, then give queued and running jobs
+DRAIN_TIMEOUT seconds before marking them failed (see api/app.py).
+
+Usage:
+    python -m api.serve
+    python -m api.serve --workers 4 --bind 0.0.0.0:8080
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+
+from dotenv import load_dotenv
+from hypercorn.asyncio.run import asyncio_worker
+from hypercorn.config import Config
+
+# Spare seconds on top of the drain for the job store and artifact flush
+SHUTDOWN_MARGIN = 10
+
+
+def default_workers():
+    # Every worker runs its own crews against the same Gemini quota, so stay modest
+    return min(os.cpu_count() or 1, 4)
+
+
+def build_config(args) -> Config:
+    """Hypercorn settings for the API workers"""
+    config = Config()
+    config.application_path = args.app
+    config.bind = [args.bind]
+    config.workers = args.workers
+    config.graceful_timeout = args.graceful_timeout
+    # after_serving drains jobs for DRAIN_TIMEOUT seconds before returning
+    config.shutdown_timeout = float(os.environ.get('DRAIN_TIMEOUT', 30)) + SHUTDOWN_MARGIN
+    config.keep_alive_timeout = float(os.environ.get('KEEP_ALIVE_TIMEOUT', 5))
+    config.accesslog = '-' if args.access_log else None
+    config.errorlog = '-'
+    return config
+
+
+def serve(config: Config) -> int:
+    """Run ``config.workers`` worker processes until SIGTERM/SIGINT, then wait for them to drain.
+
+    A worker that exits cleanly is replaced. A worker that crashes stops the
+    whole server (after draining the others) so the process supervisor, e.g.
+    Docker's restart policy, can restart it with a clean slate.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    sockets = config.create_sockets()
+    shutdown_event = ctx.Event()
+    stopping = False
+    exitcode = 0
+
+    def stop(*args):
+        nonlocal stopping
+        stopping = True
+        shutdown_event.set()
+
+    def spawn():
+        process = ctx.Process(
+            target=asyncio_worker,
+            kwargs={'config': config, 'sockets': sockets, 'shutdown_event': shutdown_event}
+        )
+        process.start()
+        return process
+
+    # Workers inherit the ignored SIGINT, so Ctrl+C reaches only this process
+    # and shuts them down through the event instead of interrupting jobs
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    processes = [spawn() for _ in range(config.workers)]
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Started {len(processes)} workers: {', '.join(str(p.pid) for p in processes)}")
+
+    while not stopping:
+        wait([process.sentinel for process in processes], timeout=1)
+        for index, process in enumerate(processes):
+            if process.exitcode is None or stopping:
+                continue
+            if process.exitcode != 0:
+                print(f"Worker {process.pid} exited with code {process.exitcode}, shutting down")
+                exitcode = process.exitcode
+                stop()
+                break
+            processes[index] = spawn()
+            print(f"Worker {process.pid} exited, started {processes[index].pid}")
+
+    deadline = time.monotonic() + config.graceful_timeout + config.shutdown_timeout + SHUTDOWN_MARGIN
+    print(f"Draining {len(processes)} workers...")
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.exitcode is None:
+            print(f"Worker {process.pid} did not drain in time, terminating")
+            process.terminate()
+            process.join(5)
+        if process.exitcode and not exitcode:
+            exitcode = process.exitcode
+
+    for sock in sockets.secure_sockets + sockets.insecure_sockets:
+        sock.close()
+    return exitcode
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Serve the LinkedIn Post Creator API with several worker processes")
+    parser.add_argument(
+        '--workers', type=int, default=int(os.environ.get('SERVER_WORKERS', default_workers())),
+        help='Worker processes (default: SERVER_WORKERS or min(CPUs, 4))'
+    )
+    parser.add_argument('--bind', default=f"0.0.0.0:{os.environ.get('PORT', 8080)}", help='host:port to listen on')
+    parser.add_argument('--app', default='api.app:app', help='ASGI application to serve')
+    parser.add_argument(
+        '--graceful-timeout', type=float, default=float(os.environ.get('GRACEFUL_TIMEOUT', 10)),
+        help='Seconds open requests get to finish on shutdown'
+    )
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stdout')
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Status requests can land on any worker, so job state must live outside the process
+    if args.workers > 1:
+        os.environ.setdefault('JOB_STORE', 'sqlite')
+        if os.environ['JOB_STORE'].lower() != 'sqlite':
+            print(f"JOB_STORE={os.environ['JOB_STORE']} cannot be shared by {args.workers} workers; use JOB_STORE=sqlite")
+            return 2
+
+    return serve(build_config(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
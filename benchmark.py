@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Offline Benchmark
+
+Measures orchestration overhead without calling Gemini or Serper, using the
+deterministic FakeLLM and FakeSerperSession from linkedin_post_creator.fakes:
+1. Crew build time
+2. Per-task overhead (crew time around zero-latency LLM calls)
+3. End-to-end job latency percentiles on pooled crews
+4. API throughput and latency under N concurrent clients
+5. Memory per job (peak and retained)
+6. HTTP throughput of the production server (api.serve) with 1 vs N worker processes
+7. Search throughput and errors against a provider quota, with and without the rate limiter
+
+Results are written as JSON; --compare flags regressions against a previous run.
+
+Usage:
+    python benchmark.py --output benchmark.json
+    python benchmark.py --quick --compare benchmark.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Offline: keep crewAI telemetry and every cache inside a scratch directory
+SCRATCH_DIR = tempfile.mkdtemp(prefix="linkedin-bench-")
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ['SERPER_API_KEY'] = os.environ.get('SERPER_API_KEY') or 'offline'
+os.environ['SEARCH_CACHE_DIR'] = os.path.join(SCRATCH_DIR, 'search')
+os.environ['RESEARCH_CACHE_DIR'] = os.path.join(SCRATCH_DIR, 'research')
+os.environ['BATCH_CHECKPOINT_DIR'] = os.path.join(SCRATCH_DIR, 'batches')
+os.environ['RATE_LIMIT_DB'] = os.path.join(SCRATCH_DIR, 'rate_limits.db')
+# Provider rate limits would pace the fakes; the rate limit benchmark sets up its own
+os.environ.setdefault('RATE_LIMIT', 'false')
+os.environ.setdefault('JOB_STORE', 'memory')
+
+# Add src and the repo root to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from linkedin_post_creator.crew import LinkedinPostCreator
+from linkedin_post_creator.crew_pool import CrewPool
+from linkedin_post_creator.events import capture
+from linkedin_post_creator.fakes import FakeLLM, FakeSerperSession, install_fake_search, use_fake_llm
+from linkedin_post_creator.logs import log_profile
+from linkedin_post_creator.pipeline import PostPipeline
+from linkedin_post_creator.rate_limit import AdaptiveConcurrency, ProviderLimiter, SharedTokenBucket
+from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool
+
+# Metrics where a higher value is better; everything else timed is lower-is-better
+HIGHER_IS_BETTER = ('throughput_rps',)
+
+
+def percentiles(samples):
+    """Summary of a list of seconds, reported in milliseconds"""
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+    return {
+        'count': len(ordered),
+        'mean_ms': round(1000 * sum(ordered) / len(ordered), 3),
+        'p50_ms': round(1000 * rank(0.50), 3),
+        'p95_ms': round(1000 * rank(0.95), 3),
+        'p99_ms': round(1000 * rank(0.99), 3),
+        'max_ms': round(1000 * ordered[-1], 3),
+    }
+
+
+def make_inputs(n, prefix="benchmark"):
+    # Unique topics so no cache or coalescing hides the work being measured
+    return {
+        'topic': f'{prefix} topic {n}',
+        'industry': 'Technology',
+        'tone': 'professional',
+        'audience': 'software engineers',
+        'current_year': str(datetime.now().year)
+    }
+
+
+def fake_factory(config):
+    """Crew factory whose agents use a FakeLLM configured from the CLI"""
+    def factory():
+        return use_fake_llm(LinkedinPostCreator(), FakeLLM(
+            latency=config.llm_latency,
+            tokens=config.llm_tokens,
+            seconds_per_token=config.seconds_per_token,
+            searches=config.searches,
+        ))
+    return factory
+
+
+def bench_crew_build(config):
+    """Test 1: Time to build a LinkedinPostCreator and its crew"""
+    print("🏗️  Benchmarking crew build...")
+    samples = []
+    for _ in range(config.build_iterations):
+        start = time.perf_counter()
+        LinkedinPostCreator().crew()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def bench_task_overhead(config):
+    """Test 2: Crew time per task with a zero-latency LLM and search"""
+    print("⚙️  Benchmarking per-task overhead...")
+    llm = FakeLLM(latency=0, tokens=config.llm_tokens, searches=config.searches)
+    creator = use_fake_llm(LinkedinPostCreator(), llm)
+    crew = creator.crew()
+
+    durations = {}
+    started = {}
+
+    def sink(type, data):
+        now = time.perf_counter()
+        if type == 'task_started':
+            started[data['task']] = now
+        elif type == 'task_completed' and data['task'] in started:
+            durations.setdefault(data['task'], []).append(now - started.pop(data['task']))
+
+    kickoffs = []
+    with capture(sink):
+        for n in range(config.overhead_runs):
+            start = time.perf_counter()
+            crew.kickoff(inputs=make_inputs(n, "overhead"))
+            kickoffs.append(time.perf_counter() - start)
+
+    return {
+        'kickoff': percentiles(kickoffs),
+        'tasks': {name: percentiles(samples) for name, samples in durations.items()},
+        'llm_calls_per_job': round(llm.calls / max(config.overhead_runs, 1), 2),
+    }
+
+
+def bench_end_to_end(config):
+    """Test 3: Job latency through PostPipeline on a pooled crew"""
+    print("⏱️  Benchmarking end-to-end job latency...")
+    pool = CrewPool(factory=fake_factory(config), max_size=1)
+    pipeline = PostPipeline(pool)
+    pool.prefill(1)
+
+    samples = []
+    reviewed = 0
+    for n in range(config.jobs):
+        start = time.perf_counter()
+        result = pipeline.run(make_inputs(n, "e2e"))
+        samples.append(time.perf_counter() - start)
+        # The critic is skipped when the draft passes validation
+        reviewed += bool(result.tasks_output[-1].raw)
+
+    calls_per_job = 2 + config.searches + reviewed / max(config.jobs, 1)
+    llm_seconds = calls_per_job * (config.llm_latency + config.seconds_per_token * config.llm_tokens)
+    latency = percentiles(samples)
+    latency['simulated_llm_ms'] = round(1000 * llm_seconds, 3)
+    latency['critic_runs'] = reviewed
+    latency['overhead_p50_ms'] = round(latency['p50_ms'] - 1000 * (llm_seconds + config.searches * config.search_latency), 3)
+    return latency
+
+
+async def _api_clients(app, clients, requests_per_client, offset):
+    test_client = app.test_client()
+    latencies = []
+    errors = 0
+
+    async def client(index):
+        nonlocal errors
+        for n in range(requests_per_client):
+            inputs = make_inputs(offset + index * requests_per_client + n, "api")
+            start = time.perf_counter()
+            response = await test_client.post('/api/generate-post-sync', json=inputs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def bench_api_throughput(config):
+    """Test 4: Throughput of /api/generate-post-sync under concurrent clients"""
+    print("🌐 Benchmarking API throughput...")
+    import api.app as api_app
+
+    api_app.crew_pool.factory = fake_factory(config)
+    api_app.crew_pool.prefill(api_app.crew_pool.max_size)
+
+    results = {}
+    offset = 0
+    for clients in config.clients:
+        latencies, errors, elapsed = asyncio.run(
+            _api_clients(api_app.app, clients, config.requests_per_client, offset)
+        )
+        offset += clients * config.requests_per_client
+        results[str(clients)] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'throughput_rps': round(len(latencies) / elapsed, 3),
+            'latency': percentiles(latencies),
+        }
+    results['workers'] = api_app.scheduler.workers
+    return results
+
+
+def serve_app():
+    """api.app with the fakes described by BENCHMARK_FAKES, for api.serve worker processes"""
+    fakes = json.loads(os.environ['BENCHMARK_FAKES'])
+    install_fake_search(FakeSerperSession(latency=fakes.pop('search_latency')))
+    import api.app as api_app
+    api_app.crew_pool.factory = fake_factory(argparse.Namespace(**fakes))
+    return api_app.app
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_workers(client, workers, timeout=120):
+    # Health answers with the worker's pid; new connections spread over the workers
+    pids = set()
+    deadline = time.monotonic() + timeout
+    while len(pids) < workers and time.monotonic() < deadline:
+        try:
+            response = await client.get('/api/health', headers={'Connection': 'close'})
+            pids.add(response.json()['pid'])
+        except Exception:
+            await asyncio.sleep(0.2)
+    return len(pids)
+
+
+async def _serve_clients(base_url, workers, clients_list, requests_per_client):
+    import httpx
+
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        results['workers_ready'] = await _wait_for_workers(client, workers)
+
+    offset = 0
+    for clients in clients_list:
+        latencies = []
+        errors = 0
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+            async def run_client(index):
+                nonlocal errors
+                for n in range(requests_per_client):
+                    inputs = make_inputs(offset + index * requests_per_client + n, f"serve-{workers}")
+                    start = time.perf_counter()
+                    response = await client.post('/api/generate-post-sync', json=inputs)
+                    latencies.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(run_client(i) for i in range(clients)))
+            elapsed = time.perf_counter() - start
+        offset += clients * requests_per_client
+        results[str(clients)] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'throughput_rps': round(len(latencies) / elapsed, 3),
+            'latency': percentiles(latencies),
+        }
+    return results
+
+
+def bench_serve(config):
+    """Test 6: HTTP throughput of api.serve with each of --server-workers worker processes.
+
+    The crew threads are split across the workers (``--crew-workers`` in
+    total) so runs differ only in how they are spread over processes.
+    """
+    print("🖥️  Benchmarking multi-worker server...")
+    root = os.path.dirname(os.path.abspath(__file__))
+    fakes = {
+        'llm_latency': config.llm_latency,
+        'llm_tokens': config.llm_tokens,
+        'seconds_per_token': config.seconds_per_token,
+        'searches': config.searches,
+        'search_latency': config.search_latency,
+    }
+
+    results = {}
+    for workers in config.server_workers:
+        port = _free_port()
+        crew_workers = max(1, config.crew_workers // workers)
+        env = dict(
+            os.environ,
+            BENCHMARK_FAKES=json.dumps(fakes),
+            JOB_STORE='sqlite',
+            JOB_STORE_PATH=os.path.join(SCRATCH_DIR, f'serve-{workers}', 'jobs.db'),
+            CREW_WORKERS=str(crew_workers),
+            CREW_POOL_PREFILL=str(crew_workers),
+            DRAIN_TIMEOUT='10',
+        )
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'api.serve', '--app', 'benchmark:serve_app()',
+             '--workers', str(workers), '--bind', f'127.0.0.1:{port}'],
+            cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            run = asyncio.run(_serve_clients(
+                f'http://127.0.0.1:{port}', workers, config.clients, config.requests_per_client
+            ))
+        finally:
+            start = time.perf_counter()
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=120)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+        run['crew_workers_per_process'] = crew_workers
+        run['shutdown_seconds'] = round(time.perf_counter() - start, 3)
+        run['exit_code'] = server.returncode
+        results[f'{workers}_workers'] = run
+    return results
+
+
+def bench_memory(config):
+    """Test 5: Peak and retained Python heap per job"""
+    print("🧠 Benchmarking memory per job...")
+    pool = CrewPool(factory=fake_factory(config), max_size=1)
+    pipeline = PostPipeline(pool)
+    pool.prefill(1)
+    # Warm up lazy imports and caches so they aren't attributed to jobs
+    pipeline.run(make_inputs(0, "memory-warmup"))
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for n in range(config.memory_jobs):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        pipeline.run(make_inputs(n, "memory"))
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'jobs': config.memory_jobs,
+        'peak_kb_per_job': round(max(peaks) / 1024, 1) if peaks else 0,
+        'mean_peak_kb_per_job': round(sum(peaks) / len(peaks) / 1024, 1) if peaks else 0,
+        'retained_kb_per_job': round((current - baseline) / max(config.memory_jobs, 1) / 1024, 1),
+    }
+
+
+def _search_burst(send, threads, searches_per_thread, prefix):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(index):
+        nonlocal errors
+        for n in range(searches_per_thread):
+            start = time.perf_counter()
+            try:
+                send(f"{prefix} query {index} {n}", "search")
+            except Exception:
+                with lock:
+                    errors += 1
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'latency': percentiles(latencies),
+    }
+
+
+def bench_rate_limit(config):
+    """Test 7: Searches from many threads against a Serper quota, without and with the limiter.
+
+    Without it, requests beyond the quota fail with 429; with it, they are
+    paced to the quota and throttled requests are retried after Retry-After.
+    """
+    print("🚦 Benchmarking rate limiting against a provider quota...")
+    quota = config.search_quota
+    session = FakeSerperSession(latency=config.search_latency, quota_rps=quota)
+    previous = CachedSerperDevTool._session
+    install_fake_search(session)
+    tool = CachedSerperDevTool()
+    threads = config.crew_workers * 4
+    per_thread = 3 if config.quick else 10
+
+    results = {'quota_rps': quota, 'threads': threads}
+    try:
+        before = session.throttled
+        results['unlimited'] = _search_burst(tool._send, threads, per_thread, "unlimited")
+        results['unlimited']['throttled'] = session.throttled - before
+
+        # The fake quota is a sliding one-second window, so a burst would overrun it;
+        # a rate just under the quota absorbs timing jitter
+        limiter = ProviderLimiter(
+            'serper-benchmark',
+            SharedTokenBucket(quota * 0.95, 1, os.environ['RATE_LIMIT_DB'], 'serper-benchmark'),
+            AdaptiveConcurrency(threads),
+        )
+        time.sleep(1.0)
+        before = session.throttled
+        results['limited'] = _search_burst(
+            lambda query, kind: limiter.call(tool._send, query, kind), threads, per_thread, "limited"
+        )
+        results['limited']['throttled'] = session.throttled - before
+        succeeded = results['limited']['requests'] - results['limited']['errors']
+        results['limited']['throughput_rps'] = round(succeeded / results['limited']['seconds'], 3)
+        results['limited']['quota_utilization'] = round(results['limited']['throughput_rps'] / quota, 3)
+        stats = limiter.stats()
+        results['limited']['wait_p95_ms'] = round(1000 * stats['wait_seconds']['p95'], 3)
+        results['limited']['retries'] = stats['retries']
+        results['limited']['final_concurrency'] = stats['concurrency_limit']
+    finally:
+        install_fake_search(previous)
+    return results
+
+
+def metadata(config):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        from importlib.metadata import version
+        crewai_version = version('crewai')
+    except Exception:
+        crewai_version = None
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'crewai': crewai_version,
+        # Crew console output is part of the measured overhead (LOG_PROFILE=quiet turns it off)
+        'log_profile': log_profile(),
+        'config': {k: v for k, v in vars(config).items() if k not in ('output', 'compare')},
+    }
+
+
+def compare(baseline, current, tolerance, path=""):
+    """List metrics that got worse than ``baseline`` by more than ``tolerance``"""
+    regressions = []
+    for key, old in baseline.items():
+        new = current.get(key) if isinstance(current, dict) else None
+        name = f"{path}.{key}" if path else key
+        if isinstance(old, dict) and isinstance(new, dict):
+            regressions.extend(compare(old, new, tolerance, name))
+        elif isinstance(old, (int, float)) and isinstance(new, (int, float)) and old > 0:
+            if key in HIGHER_IS_BETTER:
+                change = (old - new) / old
+            elif key.endswith('_ms') or key.endswith('_kb_per_job'):
+                change = (new - old) / old
+            else:
+                continue
+            if change > tolerance:
+                regressions.append((name, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for LinkedIn Post Creator")
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Previous results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown before a metric is flagged')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations, for smoke runs')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Seconds per fake LLM call')
+    parser.add_argument('--llm-tokens', type=int, default=120, help='Words in each fake LLM answer')
+    parser.add_argument('--seconds-per-token', type=float, default=0.0, help='Extra fake LLM time per word')
+    parser.add_argument('--search-latency', type=float, default=0.02, help='Seconds per fake Serper request')
+    parser.add_argument('--searches', type=int, default=1, help='Searches made by the research agent')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 8], help='Concurrent API clients')
+    parser.add_argument('--requests-per-client', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=20, help='Jobs for the latency benchmark')
+    parser.add_argument(
+        '--server-workers', type=int, nargs='+', default=sorted({1, min(os.cpu_count() or 1, 4)}),
+        help='Worker process counts to compare in the server benchmark'
+    )
+    parser.add_argument('--crew-workers', type=int, default=4, help='Crew threads in total across server workers')
+    parser.add_argument('--search-quota', type=int, default=20, help='Requests per second the fake Serper allows')
+    parser.add_argument('--only', nargs='+', choices=['build', 'overhead', 'e2e', 'api', 'memory', 'serve', 'ratelimit'])
+    config = parser.parse_args()
+
+    config.build_iterations = 3 if config.quick else 10
+    config.overhead_runs = 3 if config.quick else 10
+    config.memory_jobs = 3 if config.quick else 10
+    if config.quick:
+        config.jobs = min(config.jobs, 5)
+        config.requests_per_client = min(config.requests_per_client, 2)
+
+    install_fake_search(FakeSerperSession(latency=config.search_latency))
+
+    benchmarks = {
+        'build': ('crew_build', bench_crew_build),
+        'overhead': ('task_overhead', bench_task_overhead),
+        'e2e': ('end_to_end', bench_end_to_end),
+        'api': ('api_throughput', bench_api_throughput),
+        'memory': ('memory', bench_memory),
+        'serve': ('server', bench_serve),
+        'ratelimit': ('rate_limit', bench_rate_limit),
+    }
+    selected = config.only or list(benchmarks)
+
+    print("🚀 LinkedIn Post Creator - Offline Benchmark")
+    print("=" * 60)
+    results = {}
+    # Crew verbose output is part of the measured cost but not of the report
+    with open(os.devnull, 'w') as devnull:
+        for key in selected:
+            name, bench = benchmarks[key]
+            with contextlib.redirect_stdout(devnull):
+                results[name] = bench(config)
+            print(f"   {name}: {json.dumps(results[name])[:200]}")
+
+    report = {'meta': metadata(config), 'results': results}
+    with open(config.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results written to {config.output}")
+
+    if config.compare:
+        with open(config.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(baseline, results, config.tolerance)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) beyond {config.tolerance:.0%}:")
+            for name, old, new, change in regressions:
+                print(f"   {name}: {old} -> {new} ({change:+.0%})")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {config.tolerance:.0%} against {config.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Shared Test Fixtures
+
+Fixtures used by several test modules; pytest loads them for every test.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import knowledge, llm_cache, rate_limit
+from linkedin_post_creator.fakes import FakeSerperSession, install_fake_search, use_fake_llm
+from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool
+
+# Settings naming every file and directory a crew or the API writes under .cache
+CACHE_PATHS = {
+    'SEARCH_CACHE_DIR': "search",
+    'RESEARCH_CACHE_DIR': "research",
+    'KNOWLEDGE_INDEX_DIR': "knowledge",
+    'LLM_CACHE_DIR': "llm",
+    'ARTIFACT_DIR': "artifacts",
+    'RATE_LIMIT_DB': "rate_limits.db",
+    'CHECKPOINT_DB': "checkpoints.db",
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point every cache at a temporary directory, so tests leave nothing in .cache"""
+    directory = tmp_path / "cache"
+    for name, path in CACHE_PATHS.items():
+        monkeypatch.setenv(name, str(directory / path))
+    # Process-wide instances may already have been built on the default paths
+    monkeypatch.setattr(rate_limit, '_limiters', {})
+    monkeypatch.setattr(knowledge, '_shared', None)
+    monkeypatch.setattr(llm_cache, '_shared', None)
+    return directory
+
+
+@pytest.fixture
+def fake_search(cache_dir, monkeypatch):
+    """Answer every Serper search from a FakeSerperSession"""
+    monkeypatch.setenv('SERPER_API_KEY', 'test')
+    monkeypatch.setattr(CachedSerperDevTool, '_session', None)
+    session = FakeSerperSession()
+    install_fake_search(session)
+    return session
+
+
+@pytest.fixture
+def fake_creator(fake_search):
+    """Build a LinkedinPostCreator whose agents all use the given FakeLLM"""
+    from linkedin_post_creator.crew import LinkedinPostCreator
+
+    return lambda llm: use_fake_llm(LinkedinPostCreator(), llm)
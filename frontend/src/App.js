@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
   Container,
   Paper,
@@ -24,6 +24,13 @@ import './App.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 
+// keepalive lets the request outlive the page it was sent from
+const cancelJob = (jobId) => {
+  if (jobId) {
+    fetch(`${API_BASE_URL}/api/jobs/${jobId}`, { method: 'DELETE', keepalive: true }).catch(() => {});
+  }
+};
+
 function App() {
   const [topic, setTopic] = useState('');
   const [industry, setIndustry] = useState('Technology');
@@ -34,6 +41,9 @@ function App() {
   const [error, setError] = useState(null);
   const [progress, setProgress] = useState('');
   const [jobId, setJobId] = useState(null);
+  // The running job and its event stream, for cancelling when the user leaves
+  const jobIdRef = useRef(null);
+  const sourceRef = useRef(null);
 
   const industries = [
     'Technology', 'Healthcare', 'Finance', 'Education', 'Marketing',
@@ -49,32 +59,136 @@ function App() {
     'entrepreneurs', 'students', 'executives', 'consultants'
   ];
 
-  const pollJobStatus = async (jobId) => {
-    try {
-      const response = await axios.get(`${API_BASE_URL}/api/status/${jobId}`);
-      const { status, progress, result, error } = response.data;
-      
-      setProgress(progress || '');
-      
-      if (status === 'completed') {
-        setResult(result);
-        setLoading(false);
-        setJobId(null);
-      } else if (status === 'failed') {
-        setError(error || 'Generation failed');
+  const trackJob = (id) => {
+    jobIdRef.current = id;
+    setJobId(id);
+  };
+
+  useEffect(() => {
+    // Stop the job when the user leaves, so it doesn't keep spending tokens
+    const leave = () => {
+      if (sourceRef.current) {
+        sourceRef.current.close();
+        sourceRef.current = null;
+      }
+      const id = jobIdRef.current;
+      jobIdRef.current = null;
+      cancelJob(id);
+      return id;
+    };
+    // A page restored from the back/forward cache shows the job as cancelled
+    const hide = () => {
+      if (leave()) {
+        setError('Generation was cancelled');
         setLoading(false);
         setJobId(null);
-      } else {
-        // Continue polling
-        setTimeout(() => pollJobStatus(jobId), 2000);
+      }
+    };
+    window.addEventListener('pagehide', hide);
+    window.addEventListener('beforeunload', hide);
+    return () => {
+      window.removeEventListener('pagehide', hide);
+      window.removeEventListener('beforeunload', hide);
+      // Unmounting (navigating away within the app) abandons the job too
+      leave();
+    };
+  }, []);
+
+  const handleJobUpdate = (job) => {
+    const { status, progress, result, error } = job;
+
+    setProgress(progress || '');
+
+    if (status === 'completed') {
+      setResult(result);
+      setLoading(false);
+      trackJob(null);
+      return true;
+    }
+    if (status === 'failed' || status === 'cancelled') {
+      setError(error || (status === 'cancelled' ? 'Generation was cancelled' : 'Generation failed'));
+      setLoading(false);
+      trackJob(null);
+      return true;
+    }
+    return false;
+  };
+
+  const describeEvent = (type, data) => {
+    switch (type) {
+      case 'task_started':
+        return `${data.agent || 'Agent'} started ${data.task}...`;
+      case 'agent_step':
+        return `${data.agent || 'Agent'} is thinking...`;
+      case 'tool_started':
+        return `${data.agent || 'Agent'} is using ${data.tool}...`;
+      case 'task_completed':
+        return `${data.agent || 'Agent'} finished ${data.task}`;
+      default:
+        return null;
+    }
+  };
+
+  // Long-poll fallback: the server holds the request until the job's ETag changes
+  const pollJobStatus = async (jobId, etag = null) => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/status/${jobId}`, {
+        params: { wait: 25 },
+        headers: etag ? { 'If-None-Match': etag } : {},
+        validateStatus: (status) => status === 200 || status === 304
+      });
+
+      if (response.status === 304) {
+        pollJobStatus(jobId, etag);
+        return;
+      }
+
+      if (!handleJobUpdate(response.data)) {
+        pollJobStatus(jobId, response.headers.etag || null);
       }
     } catch (err) {
       setError('Failed to check job status');
       setLoading(false);
-      setJobId(null);
+      trackJob(null);
     }
   };
 
+  // Push channel: progress, crew events and the final result over Server-Sent Events
+  const streamJobEvents = (jobId) => {
+    if (typeof EventSource === 'undefined') {
+      pollJobStatus(jobId);
+      return;
+    }
+
+    const source = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/events`);
+    sourceRef.current = source;
+    let finished = false;
+
+    source.addEventListener('status', (event) => {
+      if (handleJobUpdate(JSON.parse(event.data))) {
+        finished = true;
+        source.close();
+        sourceRef.current = null;
+      }
+    });
+
+    ['task_started', 'agent_step', 'tool_started', 'task_completed'].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        const message = describeEvent(type, JSON.parse(event.data));
+        if (message) {
+          setProgress(message);
+        }
+      });
+    });
+
+    source.onerror = () => {
+      // EventSource retries on its own; fall back to long-polling if the stream is unusable
+      if (!finished && source.readyState === EventSource.CLOSED && jobIdRef.current === jobId) {
+        pollJobStatus(jobId);
+      }
+    };
+  };
+
   const generatePost = async () => {
     if (!topic.trim()) {
       setError('Please enter a topic');
@@ -95,10 +209,10 @@ function App() {
       });
 
       const { job_id } = response.data;
-      setJobId(job_id);
+      trackJob(job_id);
       
-      // Start polling for status
-      setTimeout(() => pollJobStatus(job_id), 1000);
+      // Subscribe to progress updates
+      streamJobEvents(job_id);
       
     } catch (err) {
       setError(err.response?.data?.error || 'Failed to generate post');
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Unreferenced posts younger than this are kept: another process may be about to write their manifest
+ORPHAN_GRACE_SECONDS = 300
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write ``content`` to ``path`` via a temp file and rename so readers never see a partial file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def content_key(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ArtifactStore:
+    """Content-addressed store for generated posts.
+
+    Each post is written once to ``objects/<key[:2]>/<key>.md`` no matter how
+    many jobs produced it, and ``jobs/<job_id>.json`` maps a job's artifact
+    names to keys. All writes are atomic renames, so concurrent jobs never
+    share or tear a file.
+
+    Manifests are dropped ``ttl_seconds`` after they were written, like the
+    finished jobs they belong to, and posts no manifest refers to any more
+    go with them. At most ``max_objects`` posts are kept, the least recently
+    written first to go.
+    """
+
+    def __init__(self, directory: str = ".cache/artifacts", ttl_seconds: Optional[float] = 24 * 3600,
+                 max_objects: int = 10000, name: str = "artifacts", registry: MetricsRegistry = REGISTRY):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_objects = max_objects
+        self._writes_since_prune = 0
+        self._writes = registry.counter(f"{name}_writes_total", "Artifacts written to disk")
+        self._dedup = registry.counter(f"{name}_deduplicated_total", "Artifacts that were already stored")
+        self._removed = registry.counter(f"{name}_removed_total", "Artifacts and manifests deleted")
+        self._write_seconds = registry.histogram(f"{name}_write_seconds", "Time spent writing artifacts")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, "objects", key[:2], f"{key}.md")
+
+    def _manifest_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, "jobs", f"{job_id}.json")
+
+    def write(self, entries: Iterable[Tuple[str, str, Iterable[str], str]]) -> None:
+        """Persist (key, content, job_ids, name) entries"""
+        start = time.perf_counter()
+        manifests: Dict[str, Dict[str, str]] = {}
+        for key, content, job_ids, name in entries:
+            path = self.path(key)
+            if os.path.exists(path):
+                # The modification time orders posts for eviction
+                os.utime(path)
+                self._dedup.inc()
+            else:
+                atomic_write(path, content)
+                self._writes.inc()
+            for job_id in job_ids:
+                manifests.setdefault(job_id, {})[name] = key
+
+        for job_id, names in manifests.items():
+            manifest = self.job_artifacts(job_id)
+            manifest.update(names)
+            atomic_write(self._manifest_path(job_id), json.dumps(manifest))
+        self._write_seconds.observe(time.perf_counter() - start)
+
+        self._writes_since_prune += len(manifests)
+        if self._writes_since_prune >= 100:
+            self._writes_since_prune = 0
+            self.prune()
+
+    def put(self, content: str, job_ids: Iterable[str] = (), name: str = "linkedin_post.md") -> str:
+        """Store ``content`` and link it to ``job_ids``; returns its key"""
+        key = content_key(content)
+        self.write([(key, content, list(job_ids), name)])
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def job_artifacts(self, job_id: str) -> Dict[str, str]:
+        """Artifact name -> key for a job"""
+        try:
+            with open(self._manifest_path(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _files(self, kind: str) -> List[Tuple[float, str]]:
+        files = []
+        for root, _, names in os.walk(os.path.join(self.directory, kind)):
+            for filename in names:
+                path = os.path.join(root, filename)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        return files
+
+    def _referenced(self, manifests: Iterable[str]) -> Set[str]:
+        keys: Set[str] = set()
+        for path in manifests:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    keys.update(json.load(f).values())
+            except (OSError, ValueError, AttributeError):
+                continue
+        return keys
+
+    def _remove(self, paths: Iterable[str]) -> int:
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        self._removed.inc(removed)
+        return removed
+
+    def delete_job(self, job_id: str) -> int:
+        """Delete a job's manifest and the posts no other job refers to; returns how many files went"""
+        keys = set(self.job_artifacts(job_id).values())
+        removed = self._remove([self._manifest_path(job_id)])
+        if keys:
+            keys -= self._referenced(path for _, path in self._files("jobs"))
+            removed += self._remove(self.path(key) for key in keys)
+        return removed
+
+    def prune(self) -> int:
+        """Delete expired manifests, posts nothing refers to and the oldest posts beyond ``max_objects``"""
+        now = time.time()
+        live, expired = [], []
+        for mtime, path in self._files("jobs"):
+            stale = self.ttl_seconds is not None and now - mtime > self.ttl_seconds
+            (expired if stale else live).append(path)
+        removed = self._remove(expired)
+        referenced = self._referenced(live)
+
+        kept, orphans = [], []
+        for mtime, path in sorted(self._files("objects")):
+            key = os.path.splitext(os.path.basename(path))[0]
+            orphan = key not in referenced and now - mtime > ORPHAN_GRACE_SECONDS
+            (orphans if orphan else kept).append(path)
+        removed += self._remove(orphans)
+        # Oldest first, so the most recently written posts are the ones kept
+        removed += self._remove(kept[:max(len(kept) - self.max_objects, 0)])
+        return removed
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': 'sync',
+            'ttl_seconds': self.ttl_seconds,
+            'max_objects': self.max_objects,
+            'writes': self._writes.value,
+            'deduplicated': self._dedup.value,
+            'removed': self._removed.value,
+            'write_seconds': self._write_seconds.snapshot(),
+        }
+
+
+class AsyncArtifactWriter:
+    """Writes artifacts on a background thread, batching flushes.
+
+    ``put`` only hashes the content and enqueues it, so crew workers never
+    wait on disk. The writer drains up to ``max_batch`` entries, or whatever
+    arrived within ``flush_interval`` seconds, and writes them together.
+    """
+
+    def __init__(self, store: ArtifactStore, flush_interval: float = 0.2, max_batch: int = 64):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._errors = 0
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self.store.write(batch)
+            except Exception as e:
+                self._errors += len(batch)
+                print(f"Failed to write {len(batch)} artifact(s): {e}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def put(self, content: str, job_ids: Iterable[str] = (), name: str = "linkedin_post.md") -> str:
+        key = content_key(content)
+        self._queue.put((key, content, list(job_ids), name))
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        return self.store.get(key)
+
+    def job_artifacts(self, job_id: str) -> Dict[str, str]:
+        return self.store.job_artifacts(job_id)
+
+    def delete_job(self, job_id: str) -> int:
+        # Queued writes for the job would bring its manifest back
+        self.flush(timeout=5.0)
+        return self.store.delete_job(job_id)
+
+    def prune(self) -> int:
+        return self.store.prune()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is on disk"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats()
+        stats.update({
+            'mode': 'async',
+            'queued': self._queue.qsize(),
+            'errors': self._errors,
+        })
+        return stats
+
+
+def create_artifact_store(default_mode: str = "off"):
+    """Build the artifact store from ARTIFACT_MODE (off, sync or async), or None when off"""
+    mode = os.environ.get('ARTIFACT_MODE', default_mode).lower()
+    if mode in ('off', '0', 'false', 'no', 'none'):
+        return None
+    store = ArtifactStore(
+        os.environ.get('ARTIFACT_DIR', '.cache/artifacts'),
+        ttl_seconds=float(os.environ.get('ARTIFACT_TTL_SECONDS', os.environ.get('JOB_TTL_SECONDS', 24 * 3600))),
+        max_objects=int(os.environ.get('ARTIFACT_MAX_OBJECTS', 10000)),
+    )
+    if mode == 'async':
+        return AsyncArtifactWriter(
+            store,
+            flush_interval=float(os.environ.get('ARTIFACT_FLUSH_INTERVAL', 0.2)),
+            max_batch=int(os.environ.get('ARTIFACT_MAX_BATCH', 64))
+        )
+    if mode != 'sync':
+        raise ValueError(f"Unknown ARTIFACT_MODE '{mode}', expected off, sync or async")
+    return store
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+from linkedin_post_creator.coalescer import request_key
+from linkedin_post_creator.crew_pool import CrewPool
+from linkedin_post_creator.instrumentation import record_stages
+from linkedin_post_creator.pipeline import PostPipeline, post_result
+from linkedin_post_creator.research_cache import ResearchCache, create_research_cache, research_key
+from linkedin_post_creator.scheduler import QueueFullError
+
+# Values used for fields a batch row leaves out, matching the API defaults
+ROW_DEFAULTS = {'industry': 'Technology', 'tone': 'professional', 'audience': 'professionals'}
+
+
+class BatchError(ValueError):
+    """Raised for malformed batch input"""
+
+
+class BatchRow:
+    """One post request of a batch"""
+
+    __slots__ = ('id', 'inputs', 'key')
+
+    def __init__(self, id: str, inputs: Dict[str, Any]):
+        self.id = id
+        self.inputs = inputs
+        self.key = request_key(inputs)
+
+
+def parse_rows(lines: Iterable[str]) -> List[BatchRow]:
+    """Parse JSONL post requests; rows without an ``id`` are numbered by line"""
+    rows = []
+    seen = set()
+    year = str(datetime.now().year)
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise BatchError(f"Line {number}: invalid JSON ({e})")
+        if not isinstance(data, dict) or not data.get('topic'):
+            raise BatchError(f"Line {number}: topic is required")
+
+        row_id = str(data.get('id', number))
+        if row_id in seen:
+            raise BatchError(f"Line {number}: duplicate id '{row_id}'")
+        seen.add(row_id)
+
+        inputs = {'topic': data['topic'], 'current_year': str(data.get('current_year', year))}
+        for field, default in ROW_DEFAULTS.items():
+            inputs[field] = data.get(field, default)
+        rows.append(BatchRow(row_id, inputs))
+    return rows
+
+
+class BatchCheckpoint:
+    """Append-only JSONL log of finished rows, used to resume an interrupted batch.
+
+    Each record is flushed and fsynced as soon as its row finishes, so a crash
+    loses at most the rows that were still running. A torn last line from a
+    crash mid-write is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._records[record['id']] = record
+        except FileNotFoundError:
+            pass
+
+    def completed(self, row: BatchRow) -> Optional[Dict[str, Any]]:
+        """The saved record for ``row`` if it already completed with the same inputs"""
+        record = self._records.get(row.id)
+        if record and record.get('key') == row.key and record.get('status') == 'completed':
+            return record
+        return None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._records[record['id']] = record
+
+
+class BatchRunner:
+    """Runs batch rows with bounded concurrency and yields records in completion order.
+
+    Rows with the same topic/industry/year need the same research, so only the
+    first row of each such group starts right away; the rest of the group is
+    released once it finishes and finds the research in the cache. If that row
+    fails, the next row of the group takes its place.
+    """
+
+    def __init__(
+        self,
+        pool: CrewPool,
+        research_cache: Optional[ResearchCache] = None,
+        concurrency: int = 4,
+        submit: Optional[Callable[..., Future]] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        # Research sharing needs a cache even when the process-wide one is disabled
+        if research_cache is None:
+            research_cache = ResearchCache(directory=None, name="batch_research_cache")
+        self.pipeline = PostPipeline(pool, research_cache=research_cache)
+        self.concurrency = concurrency
+        self.submit = submit
+
+    def _run_row(self, row: BatchRow) -> Dict[str, Any]:
+        start = time.perf_counter()
+        record = {'id': row.id, 'key': row.key, 'status': 'completed', 'result': None, 'error': None}
+        try:
+            with record_stages() as stages:
+                output = self.pipeline.run(row.inputs)
+            record['result'] = post_result(output, row.inputs, stages.summary())
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        return record
+
+    @staticmethod
+    def _record(row: BatchRow, future: Future) -> Dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            return {'id': row.id, 'key': row.key, 'status': 'failed', 'result': None, 'error': str(e)}
+
+    def run(self, rows: List[BatchRow], checkpoint: Optional[BatchCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one record per row; rows already in ``checkpoint`` are yielded first with ``resumed``"""
+        plan = _BatchPlan(rows, checkpoint)
+        yield from plan.resumed
+        in_flight: Dict[Future, BatchRow] = {}
+
+        executor = None
+        submit = self.submit
+        if submit is None:
+            executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch")
+            submit = executor.submit
+
+        try:
+            while plan.ready or in_flight:
+                retry_after = self._fill(plan, in_flight, submit)
+                if not in_flight:
+                    time.sleep(retry_after)
+                    continue
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    row = in_flight.pop(future)
+                    record = plan.complete(row, self._record(row, future))
+                    if checkpoint is not None:
+                        checkpoint.append(record)
+                    yield record
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run_async(
+        self, rows: List[BatchRow], checkpoint: Optional[BatchCheckpoint] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of ``run`` that waits for rows on the event loop instead of a thread.
+
+        ``submit`` must be set (e.g. to JobScheduler.submit). Rows that have not
+        been submitted yet are dropped if the consumer stops iterating; the
+        checkpoint lets the batch be resumed later.
+        """
+        if self.submit is None:
+            raise ValueError("run_async needs a submit function")
+        plan = _BatchPlan(rows, checkpoint)
+        for record in plan.resumed:
+            yield record
+        in_flight: Dict[Future, BatchRow] = {}
+
+        while plan.ready or in_flight:
+            retry_after = self._fill(plan, in_flight, self.submit)
+            if not in_flight:
+                await asyncio.sleep(retry_after)
+                continue
+            waiting = {asyncio.wrap_future(future): future for future in in_flight}
+            # Leftover wrappers are simply dropped; cancelling them would cancel the rows
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                future = waiting[task]
+                row = in_flight.pop(future)
+                record = plan.complete(row, self._record(row, future))
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.append, record)
+                yield record
+
+    def _fill(self, plan: "_BatchPlan", in_flight: Dict[Future, BatchRow], submit: Callable[..., Future]) -> float:
+        """Submit ready rows up to the concurrency limit; returns a back-off when the queue is full"""
+        while plan.ready and len(in_flight) < self.concurrency:
+            row = plan.ready[0]
+            try:
+                future = submit(self._run_row, row)
+            except QueueFullError as e:
+                return e.retry_after
+            plan.ready.popleft()
+            in_flight[future] = row
+        return 0
+
+
+class _BatchPlan:
+    """Order in which batch rows may start, given research sharing within groups"""
+
+    def __init__(self, rows: List[BatchRow], checkpoint: Optional[BatchCheckpoint]):
+        self.resumed: List[Dict[str, Any]] = []
+        self.groups: "OrderedDict[str, deque]" = OrderedDict()
+        for row in rows:
+            saved = checkpoint.completed(row) if checkpoint else None
+            if saved is not None:
+                self.resumed.append(dict(saved, resumed=True))
+                continue
+            self.groups.setdefault(research_key(row.inputs), deque()).append(row)
+        self.ready = deque(group.popleft() for group in self.groups.values())
+
+    def complete(self, row: BatchRow, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Release the rest of the row's group once its research is available"""
+        group = self.groups.get(research_key(row.inputs))
+        if group:
+            if record['status'] == 'completed':
+                self.ready.extend(group)
+                group.clear()
+            else:
+                self.ready.append(group.popleft())
+        return record
+
+
+def run_batch_cli(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: generate posts for every row of a JSONL file"""
+    parser = argparse.ArgumentParser(
+        prog="run_batch",
+        description="Generate LinkedIn posts for JSONL requests, writing JSONL results in completion order."
+    )
+    parser.add_argument("input", help="JSONL file of post requests, or - for stdin")
+    parser.add_argument("-o", "--output", help="Write results here instead of stdout")
+    parser.add_argument("--checkpoint", help="Resume file (default: <input>.checkpoint.jsonl)")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=int(os.environ.get('CREW_WORKERS', 4)),
+        help="Rows generated at once"
+    )
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        rows = parse_rows(sys.stdin)
+        checkpoint_path = args.checkpoint
+    else:
+        with open(args.input, "r", encoding="utf-8") as f:
+            rows = parse_rows(f)
+        checkpoint_path = args.checkpoint or f"{args.input}.checkpoint.jsonl"
+
+    checkpoint = BatchCheckpoint(checkpoint_path) if checkpoint_path else None
+    runner = BatchRunner(
+        CrewPool(max_size=args.concurrency),
+        research_cache=create_research_cache(),
+        concurrency=args.concurrency
+    )
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        # Crew logging goes to stderr so stdout stays valid JSONL
+        with contextlib.redirect_stdout(sys.stderr):
+            for record in runner.run(rows, checkpoint):
+                failed += record['status'] != 'completed'
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{len(rows) - failed}/{len(rows)} posts generated", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+import litellm
+from crewai import LLM
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    LLMStreamChunkEvent,
+    crewai_event_bus,
+)
+from crewai.utilities.events.llm_events import LLMCallType
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+from linkedin_post_creator import cancellation, events
+from linkedin_post_creator.llm_cache import LLMResponseCache
+from linkedin_post_creator.rate_limit import ProviderLimiter
+
+# LLM settings that change what the model returns for the same messages
+CACHE_KEY_PARAMS = (
+    'temperature', 'top_p', 'n', 'stop', 'max_tokens', 'max_completion_tokens',
+    'presence_penalty', 'frequency_penalty', 'logit_bias', 'seed', 'reasoning_effort',
+)
+
+# Providers whose litellm clients take an HTTPHandler we can close to stop a call
+CLOSABLE_PROVIDERS = ('gemini', 'vertex_ai', 'vertex_ai_beta')
+
+# HTTP clients of the provider call running on each thread
+_calls = threading.local()
+
+
+class CachedLLM(LLM):
+    """crewAI LLM that answers repeated prompts from an LLMResponseCache.
+
+    Text responses are cached; calls that run tool functions are not. A hit
+    emits the same call events as a real call (and the whole answer as one
+    stream chunk when streaming), so progress and token streams still see it.
+    Calls that reach the provider go through ``limiter`` when one is given;
+    a throttled call is only retried if it hadn't streamed any tokens yet.
+    Their request timeout is cut to the time left until the job's deadline,
+    and for CLOSABLE_PROVIDERS the call's HTTP client is closed as soon as
+    the job is cancelled, so the stream stops instead of running on.
+    """
+
+    def __init__(self, *args, cache: Optional[LLMResponseCache] = None,
+                 limiter: Optional[ProviderLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        self.limiter = limiter
+
+    def _prepare_completion_params(self, messages, tools=None) -> Dict[str, Any]:
+        params = super()._prepare_completion_params(messages, tools)
+        params['timeout'] = cancellation.timeout(self.timeout or litellm.request_timeout)
+        clients = getattr(_calls, 'clients', None)
+        if clients is not None and self.model.split('/', 1)[0] in CLOSABLE_PROVIDERS:
+            client = HTTPHandler(timeout=params['timeout'])
+            clients.append(client)
+            params['client'] = client
+        return params
+
+    def _provider_call(self, *args) -> Union[str, Any]:
+        cancellation.check()
+        clients = _calls.clients = []
+
+        def interrupt():
+            for client in list(clients):
+                client.close()
+
+        try:
+            with cancellation.interrupt(interrupt):
+                if self.limiter is None:
+                    response = super().call(*args)
+                else:
+                    # Tokens already sent to the job's stream can't be taken back,
+                    # so a call throttled mid-stream isn't retried
+                    sent = events.tokens_sent()
+                    response = self.limiter.call(
+                        super().call, *args, retry=lambda: events.tokens_sent() == sent)
+        except Exception:
+            # A connection closed by a cancel surfaces as the cancellation
+            cancellation.check()
+            raise
+        finally:
+            _calls.clients = None
+            for client in clients:
+                client.close()
+        # crewAI returns the text streamed so far when the stream breaks off
+        cancellation.check()
+        return response
+
+    def cache_params(self, tools: Optional[List[dict]] = None) -> Dict[str, Any]:
+        params = {name: getattr(self, name, None) for name in CACHE_KEY_PARAMS}
+        params['response_format'] = repr(self.response_format) if self.response_format else None
+        params['tools'] = tools
+        return params
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+    ) -> Union[str, Any]:
+        if self.cache is None or available_functions:
+            return self._provider_call(messages, tools, callbacks, available_functions)
+
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        params = self.cache_params(tools)
+        cached = self.cache.get(self.model, messages, params)
+        if cached is not None:
+            crewai_event_bus.emit(self, LLMCallStartedEvent(messages=messages, tools=tools, callbacks=callbacks))
+            if self.stream:
+                crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=cached))
+            crewai_event_bus.emit(self, LLMCallCompletedEvent(response=cached, call_type=LLMCallType.LLM_CALL))
+            return cached
+
+        response = self._provider_call(messages, tools, callbacks, available_functions)
+        if isinstance(response, str) and response.strip():
+            self.cache.put(self.model, messages, params, response)
+        return response
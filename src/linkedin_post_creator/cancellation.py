@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from linkedin_post_creator.metrics import REGISTRY
+
+# The cancel token of the crew run executed on each thread
+_current = threading.local()
+
+_cancelled = REGISTRY.counter("runs_cancelled_total", "Crew runs stopped because every job waiting on them was cancelled")
+_expired = REGISTRY.counter("runs_deadline_exceeded_total", "Crew runs stopped at their deadline")
+_interrupted = REGISTRY.counter("calls_interrupted_total", "LLM calls whose connection was closed because their run stopped")
+
+
+class JobCancelledError(TimeoutError):
+    """Raised inside a crew run that was cancelled.
+
+    A TimeoutError, so crewAI agents give up the task instead of retrying it.
+    """
+
+
+class DeadlineExceededError(JobCancelledError):
+    """Raised inside a crew run that has passed its deadline"""
+
+
+class CancelToken:
+    """Cancellation and deadline of one crew run.
+
+    The run checks the token between tasks and before every LLM and search
+    call. Provider calls are bounded by ``timeout`` (the time left until
+    ``deadline``, a time.monotonic() value) and register an ``interrupt``
+    callback that closes their connection when the token is cancelled, so
+    a stopped run doesn't keep a call, its rate limit slot or its tokens
+    going. ``poll`` is asked every ``poll_interval`` seconds, while the
+    token is bound to a thread, whether the run should be cancelled, for
+    cancellations recorded by another process.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, poll: Optional[Callable[[], bool]] = None,
+                 poll_interval: float = 1.0):
+        self.deadline = deadline
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._expired = False
+        self._polled_at = time.monotonic()
+        self._interrupts: List[Callable[[], None]] = []
+        self._bound = 0
+        self._lock = threading.Lock()
+
+    def extend(self, deadline: Optional[float]) -> None:
+        """Move the deadline to ``deadline`` if that is later (None: no deadline)"""
+        with self._lock:
+            if self.deadline is not None and (deadline is None or deadline > self.deadline):
+                self.deadline = deadline
+
+    def cancel(self, reason: str = "Job cancelled") -> bool:
+        """Stop the run, interrupting its pending calls; returns False if it was already cancelled"""
+        with self._lock:
+            if self._cancelled.is_set():
+                return False
+            self.reason = reason
+            self._cancelled.set()
+            interrupts = list(self._interrupts)
+        for interrupt in interrupts:
+            try:
+                interrupt()
+            except Exception as e:
+                print(f"Interrupting a cancelled call failed: {e}")
+            _interrupted.inc()
+        _cancelled.inc()
+        return True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one"""
+        deadline = self.deadline
+        return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """Timeout for a call: ``default``, cut to the time left until the deadline"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return remaining if default is None else min(default, remaining)
+
+    def _poll(self) -> None:
+        now = time.monotonic()
+        if self.poll is None or self._cancelled.is_set() or now - self._polled_at < self.poll_interval:
+            return
+        self._polled_at = now
+        if self.poll():
+            self.cancel("Job cancelled")
+
+    def check(self) -> None:
+        """Raise JobCancelledError or DeadlineExceededError if the run should stop"""
+        self._poll()
+        if self._cancelled.is_set():
+            raise JobCancelledError(self.reason)
+        if self.remaining() == 0.0:
+            with self._lock:
+                first, self._expired = not self._expired, True
+            if first:
+                _expired.inc()
+            raise DeadlineExceededError("Job did not finish before its deadline")
+
+    def wait(self, seconds: float) -> None:
+        """Sleep for ``seconds``, raising as soon as the run is cancelled or reaches its deadline"""
+        self.check()
+        end = time.monotonic() + seconds
+        while True:
+            left = end - time.monotonic()
+            if left <= 0:
+                return
+            timeout = self.timeout(left)
+            if self.poll is not None:
+                timeout = min(timeout, self.poll_interval)
+            self._cancelled.wait(timeout)
+            self.check()
+
+    @contextmanager
+    def interrupt(self, callback: Callable[[], None]) -> Iterator[None]:
+        """Call ``callback`` (e.g. closing a connection) if the run is cancelled inside the block"""
+        with self._lock:
+            self._interrupts.append(callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._interrupts.remove(callback)
+
+
+class _Poller:
+    """Single daemon thread polling the bound tokens that have a ``poll``, so their calls are interrupted"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._tokens: Set[CancelToken] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, token: CancelToken) -> None:
+        with self._lock:
+            self._tokens.add(token)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cancel-poller", daemon=True)
+                self._thread.start()
+
+    def discard(self, token: CancelToken) -> None:
+        with self._lock:
+            self._tokens.discard(token)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                tokens = list(self._tokens)
+            for token in tokens:
+                try:
+                    token._poll()
+                except Exception as e:
+                    print(f"Cancellation poll failed: {e}")
+
+
+_poller = _Poller()
+
+
+def current() -> Optional[CancelToken]:
+    """Cancel token of the crew run on this thread, if any"""
+    return getattr(_current, 'token', None)
+
+
+@contextmanager
+def bind(token: CancelToken) -> Iterator[CancelToken]:
+    """Make ``token`` the cancel token of the crew run executed on this thread"""
+    previous = current()
+    _current.token = token
+    with token._lock:
+        token._bound += 1
+    if token.poll is not None:
+        _poller.add(token)
+    try:
+        yield token
+    finally:
+        _current.token = previous
+        with token._lock:
+            token._bound -= 1
+            unbound = not token._bound
+        if unbound:
+            _poller.discard(token)
+
+
+def check() -> None:
+    """Stop the crew run on this thread if it was cancelled or is past its deadline"""
+    token = current()
+    if token is not None:
+        token.check()
+
+
+def timeout(default: Optional[float] = None) -> Optional[float]:
+    """Timeout for a call of the crew run on this thread (see CancelToken.timeout)"""
+    token = current()
+    return default if token is None else token.timeout(default)
+
+
+def wait(seconds: float) -> None:
+    """Sleep, waking up to stop the crew run on this thread if it is cancelled or past its deadline"""
+    token = current()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.wait(seconds)
+
+
+@contextmanager
+def interrupt(callback: Callable[[], None]) -> Iterator[None]:
+    """Call ``callback`` if the crew run on this thread is cancelled inside the block"""
+    token = current()
+    if token is None:
+        yield
+    else:
+        with token.interrupt(callback):
+            yield
+
+
+def default_deadline_seconds() -> Optional[float]:
+    """Longest a job may run, from JOB_DEADLINE_SECONDS (0: no limit)"""
+    seconds = float(os.environ.get('JOB_DEADLINE_SECONDS', 600))
+    return seconds if seconds > 0 else None
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        'deadline_seconds': default_deadline_seconds(),
+        'runs_cancelled': _cancelled.value,
+        'deadlines_exceeded': _expired.value,
+        'calls_interrupted': _interrupted.value,
+    }
@@ -0,0 +1,251 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Tasks of a full run in execution order; a resumed run starts at the first one without a checkpoint
+TASK_ORDER = ('research_task', 'content_creation_task', 'content_review_task')
+
+# Adds a job, or marks it as updated so the TTL counts from its latest task
+_UPSERT_JOB = (
+    "INSERT INTO checkpoint_jobs (job_id, inputs, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (job_id) DO UPDATE SET updated_at = excluded.updated_at"
+)
+
+# The checkpoint recorder of the crew run executed on each thread
+_current = threading.local()
+
+
+def next_task(outputs: Dict[str, str]) -> str:
+    """First task of TASK_ORDER that ``outputs`` has no output for"""
+    for task in TASK_ORDER:
+        if task not in outputs:
+            return task
+    return TASK_ORDER[-1]
+
+
+class JobCheckpoint:
+    """Inputs and finished task outputs of one job"""
+
+    __slots__ = ('job_id', 'inputs', 'outputs', 'updated_at')
+
+    def __init__(self, job_id: str, inputs: Dict[str, Any], outputs: Dict[str, str], updated_at: float):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.outputs = outputs
+        self.updated_at = updated_at
+
+    def next_task(self) -> str:
+        return next_task(self.outputs)
+
+
+class CheckpointStore:
+    """SQLite (WAL mode) store of task outputs, keyed by job id.
+
+    Each output is committed as soon as its task finishes, so a job that
+    fails, is cancelled or whose process dies can be resumed from the first
+    task that didn't finish, by any process sharing the file. Checkpoints of
+    completed jobs are deleted; the rest are dropped after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: str = ".cache/checkpoints.db",
+        ttl_seconds: float = 24 * 3600,
+        compact_interval: float = 300.0,
+        name: str = "checkpoints",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.compact_interval = compact_interval
+        self._local = threading.local()
+        self._compacted_at = 0.0
+
+        self._saved = registry.counter(f"{name}_saved_total", "Task outputs checkpointed")
+        self._resumed = registry.counter(f"{name}_resumed_total", "Runs started from a checkpoint")
+        self._compacted = registry.counter(f"{name}_compacted_total", "Expired job checkpoints removed")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoint_jobs (
+                job_id TEXT PRIMARY KEY,
+                inputs TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_tasks (
+                job_id TEXT NOT NULL,
+                task TEXT NOT NULL,
+                agent TEXT,
+                output TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, task)
+            );
+            CREATE INDEX IF NOT EXISTS idx_checkpoint_jobs_updated ON checkpoint_jobs (updated_at);
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements: Iterable[tuple]) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.executemany(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT may already have ended the transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def begin(self, job_ids: List[str], inputs: Dict[str, Any]) -> None:
+        """Record the inputs of jobs about to run, keeping outputs saved by earlier attempts"""
+        now = time.time()
+        payload = json.dumps(inputs, sort_keys=True)
+        self._write([(_UPSERT_JOB, [(job_id, payload, now) for job_id in job_ids])])
+        if now - self._compacted_at >= self.compact_interval:
+            self.compact()
+
+    def save(self, job_ids: List[str], inputs: Dict[str, Any], task: str, output: str,
+             agent: Optional[str] = None) -> None:
+        """Checkpoint the output of ``task`` for every job sharing the run"""
+        now = time.time()
+        payload = json.dumps(inputs, sort_keys=True)
+        self._write([
+            (_UPSERT_JOB, [(job_id, payload, now) for job_id in job_ids]),
+            (
+                "INSERT OR REPLACE INTO checkpoint_tasks (job_id, task, agent, output, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(job_id, task, agent, output, now) for job_id in job_ids],
+            ),
+        ])
+        self._saved.inc(len(job_ids))
+
+    def load(self, job_id: str) -> Optional[JobCheckpoint]:
+        conn = self._connect()
+        row = conn.execute("SELECT inputs, updated_at FROM checkpoint_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        tasks = conn.execute(
+            "SELECT task, output FROM checkpoint_tasks WHERE job_id = ? ORDER BY created_at", (job_id,)
+        ).fetchall()
+        return JobCheckpoint(job_id, json.loads(row['inputs']), {t['task']: t['output'] for t in tasks},
+                             row['updated_at'])
+
+    def delete(self, job_ids: List[str]) -> None:
+        params = [(job_id,) for job_id in job_ids]
+        self._write([
+            ("DELETE FROM checkpoint_tasks WHERE job_id = ?", params),
+            ("DELETE FROM checkpoint_jobs WHERE job_id = ?", params),
+        ])
+
+    def resumed(self) -> None:
+        self._resumed.inc()
+
+    def compact(self) -> int:
+        """Drop checkpoints of jobs not updated within the TTL, returning how many were removed"""
+        self._compacted_at = time.time()
+        cutoff = self._compacted_at - self.ttl_seconds
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM checkpoint_tasks WHERE job_id IN "
+                "(SELECT job_id FROM checkpoint_jobs WHERE updated_at < ?)", (cutoff,)
+            )
+            removed = conn.execute("DELETE FROM checkpoint_jobs WHERE updated_at < ?", (cutoff,)).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT may already have ended the transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self._compacted.inc(removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        jobs = conn.execute("SELECT COUNT(*) FROM checkpoint_jobs").fetchone()[0]
+        tasks = conn.execute("SELECT COUNT(*) FROM checkpoint_tasks").fetchone()[0]
+        return {
+            'path': self.path,
+            'ttl_seconds': self.ttl_seconds,
+            'jobs': jobs,
+            'task_outputs': tasks,
+            'saved': self._saved.value,
+            'resumed': self._resumed.value,
+            'compacted': self._compacted.value,
+        }
+
+
+class CheckpointRecorder:
+    """Collects the task outputs of one crew run and checkpoints them for its jobs.
+
+    ``outputs`` starts with those of an earlier attempt, so a retry can start
+    where that attempt stopped. Without a store, outputs are only kept in
+    memory for retries within this run.
+    """
+
+    def __init__(self, store: Optional[CheckpointStore], job_ids: Callable[[], List[str]],
+                 inputs: Dict[str, Any], outputs: Optional[Dict[str, str]] = None):
+        self.store = store
+        self.job_ids = job_ids
+        self.inputs = inputs
+        self.outputs: Dict[str, str] = dict(outputs or {})
+
+    def next_task(self) -> str:
+        return next_task(self.outputs)
+
+    def __call__(self, task: str, output: str, agent: Optional[str] = None) -> None:
+        self.outputs[task] = output
+        if self.store is None:
+            return
+        try:
+            self.store.save(self.job_ids(), self.inputs, task, output, agent)
+        except sqlite3.Error as e:
+            # A lost checkpoint only costs a longer resume
+            print(f"Checkpoint of {task} failed: {e}")
+
+
+@contextmanager
+def recording(recorder: CheckpointRecorder) -> Iterator[CheckpointRecorder]:
+    """Checkpoint the tasks finished by the crew run executed on this thread"""
+    previous = getattr(_current, 'recorder', None)
+    _current.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _current.recorder = previous
+
+
+def record(task: str, output: str, agent: Optional[str] = None) -> None:
+    """Checkpoint a finished task of the crew run on this thread, if it is being recorded"""
+    recorder = getattr(_current, 'recorder', None)
+    if recorder is not None and task in TASK_ORDER and output:
+        recorder(task, output, agent)
+
+
+def create_checkpoint_store() -> Optional[CheckpointStore]:
+    """Build the checkpoint store from environment settings (None when disabled)"""
+    if os.environ.get('CHECKPOINTS', 'true').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return CheckpointStore(
+        path=os.environ.get('CHECKPOINT_DB', '.cache/checkpoints.db'),
+        ttl_seconds=float(os.environ.get('CHECKPOINT_TTL_SECONDS', 24 * 3600)),
+    )
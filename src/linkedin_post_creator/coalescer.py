@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from linkedin_post_creator.cancellation import CancelToken
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+from linkedin_post_creator.research_cache import normalize_text
+
+# Inputs that determine the generated post
+REQUEST_KEY_FIELDS = ('topic', 'industry', 'tone', 'audience', 'current_year')
+
+
+def request_key(inputs: Dict[str, Any]) -> str:
+    """Canonical key for a post generation request"""
+    normalized = {field: normalize_text(inputs.get(field)) for field in REQUEST_KEY_FIELDS}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Execution:
+    """One in-flight crew run shared by every job with the same request key"""
+
+    def __init__(self, key: str, deadline: Optional[float] = None):
+        self.key = key
+        self.job_ids: List[str] = []
+        # Callers waiting on ``future`` without a job id, which can't be cancelled
+        self.waiters = 0
+        self.future: Future = Future()
+        self.started_at = time.time()
+        # Set when a job that asked for debug tracing is attached
+        self.debug = False
+        # Stops the run once no job waits for it, or at the latest deadline of its jobs
+        self.token = CancelToken(deadline)
+        # The scheduler future of the run, while it may still be queued
+        self.scheduled: Optional[Future] = None
+
+
+class RequestCoalescer:
+    """Single-flight coalescing of identical post requests plus a short-lived result cache.
+
+    The first request for a key becomes the leader and runs the crew; requests
+    that arrive while it is running attach their job ids to the same
+    Execution and receive its result. Successful results are kept for
+    ``result_ttl`` seconds so repeats are answered without running a crew.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        result_ttl: float = 300.0,
+        max_results: int = 1000,
+        name: str = "coalescer",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.enabled = enabled
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self._inflight: Dict[str, Execution] = {}
+        # Every unfinished run, including uncoalesced ones when disabled
+        self._running: Set[Execution] = set()
+        self._results: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._executions = registry.counter(f"{name}_executions_total", "Crew runs started for a request key")
+        self._coalesced = registry.counter(f"{name}_coalesced_total", "Requests attached to an in-flight run")
+        self._cache_hits = registry.counter(f"{name}_result_cache_hits_total", "Requests served from the result cache")
+
+    def cached_result(self, key: str) -> Optional[Any]:
+        """Return a recent successful result for ``key``, if any"""
+        if self.result_ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at > self.result_ttl:
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+        self._cache_hits.inc()
+        return result
+
+    def join(self, key: str, job_id: Optional[str] = None,
+             deadline: Optional[float] = None) -> Tuple[Execution, bool]:
+        """Attach to the in-flight run for ``key``; returns (execution, is_leader).
+
+        ``deadline`` (time.monotonic(), None for none) extends the run's
+        deadline when it is later than those of the jobs already attached.
+        """
+        with self._lock:
+            execution = self._inflight.get(key) if self.enabled else None
+            leader = execution is None
+            if leader:
+                execution = Execution(key, deadline)
+                if self.enabled:
+                    self._inflight[key] = execution
+                self._running.add(execution)
+            else:
+                execution.token.extend(deadline)
+            if job_id is not None:
+                execution.job_ids.append(job_id)
+            else:
+                execution.waiters += 1
+
+        if leader:
+            self._executions.inc()
+        else:
+            self._coalesced.inc()
+        return execution, leader
+
+    def job_ids(self, execution: Execution) -> List[str]:
+        with self._lock:
+            return list(execution.job_ids)
+
+    def detach(self, job_id: str) -> Tuple[Optional[Execution], bool]:
+        """Detach a job from its unfinished run; returns (execution, orphaned).
+
+        An orphaned run has nobody left waiting for it, so new requests for
+        its key start a fresh run instead of joining it and the caller should
+        stop it. ``execution`` is None if the job is not running here.
+        """
+        with self._lock:
+            for execution in self._running:
+                if job_id in execution.job_ids:
+                    break
+            else:
+                return None, False
+            execution.job_ids.remove(job_id)
+            orphaned = not execution.job_ids and not execution.waiters
+            if orphaned and self._inflight.get(execution.key) is execution:
+                del self._inflight[execution.key]
+        return execution, orphaned
+
+    def finish(self, execution: Execution, result: Any = None, error: Optional[BaseException] = None) -> List[str]:
+        """Complete a run and return every job id that was attached to it.
+
+        Finishing a run that was already finished (e.g. failed during a
+        shutdown drain) is a no-op returning no job ids.
+        """
+        with self._lock:
+            if execution not in self._running:
+                return []
+            self._running.discard(execution)
+            if self._inflight.get(execution.key) is execution:
+                del self._inflight[execution.key]
+            job_ids = list(execution.job_ids)
+            if error is None and self.result_ttl > 0:
+                self._results[execution.key] = (time.time(), result)
+                self._results.move_to_end(execution.key)
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+
+        if error is None:
+            execution.future.set_result(result)
+        else:
+            execution.future.set_exception(error)
+        return job_ids
+
+    def unfinished(self) -> List[Execution]:
+        """Runs that have been started but not finished"""
+        with self._lock:
+            return list(self._running)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._inflight)
+            cached = len(self._results)
+        return {
+            'enabled': self.enabled,
+            'inflight': inflight,
+            'cached_results': cached,
+            'result_ttl': self.result_ttl,
+            'executions': self._executions.value,
+            'coalesced': self._coalesced.value,
+            'result_cache_hits': self._cache_hits.value,
+        }
+
+
+def create_coalescer() -> RequestCoalescer:
+    """Build the request coalescer from environment settings"""
+    enabled = os.environ.get('COALESCE_REQUESTS', 'true').lower() not in ('0', 'false', 'no', 'off')
+    return RequestCoalescer(
+        enabled=enabled,
+        result_ttl=float(os.environ.get('RESULT_CACHE_TTL', 300)),
+        max_results=int(os.environ.get('RESULT_CACHE_SIZE', 1000)),
+    )
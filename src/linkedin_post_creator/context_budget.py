@@ -0,0 +1,241 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Context tokens each task may spend on compactable outputs (the research report).
+# The writer needs the findings; the critic only needs enough to check the draft's claims.
+DEFAULT_BUDGETS = {
+    'content_creation_task': 1200,
+    'content_review_task': 300,
+}
+
+# Task outputs that may be compacted when passed on as context; drafts are always passed whole
+COMPACTABLE_TASKS = ('research_task',)
+
+# Rough tokens-per-character ratio of English text for Gemini and GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_HEADING = re.compile(r"^\s*(?:#{1,6}\s+.*|\*\*[^*]+\*\*:?|[^.!?]{1,60}:)\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_LABEL = re.compile(r"^[^.!?:]{1,40}:\s")
+_TERM = re.compile(r"[^\W_]{4,}")
+_NUMBER = re.compile(r"\d")
+# Words too common in prompts to say anything about relevance
+_STOPWORDS = frozenset(
+    "this that with from have will your they their about what when which would there these those "
+    "into more most also than then them been were make should could while where such each other "
+    "post posts linkedin task ensure include including".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _terms(text: str) -> set:
+    return {term for term in (t.lower() for t in _TERM.findall(text or "")) if term not in _STOPWORDS}
+
+
+def split_findings(report: str) -> List[str]:
+    """Split a research report into findings: list items, or sentences of plain paragraphs.
+
+    A heading is prefixed to the findings under it unless they carry their
+    own label, and wrapped lines stay with their list item or paragraph.
+    """
+    findings: List[str] = []
+    heading = ""
+    item: List[str] = []
+    paragraph: List[str] = []
+
+    def add(text: str, label: str) -> None:
+        if text:
+            findings.append(f"{label}: {text}" if label and not _LABEL.match(text) else text)
+
+    def flush() -> None:
+        add(" ".join(item), heading)
+        item.clear()
+        text, label = " ".join(paragraph), heading
+        # A paragraph that opens with "Label:" labels all of its sentences
+        match = _LABEL.match(text)
+        if match:
+            text, label = text[match.end():], text[:match.end()].strip().rstrip(":")
+        for sentence in _SENTENCE_END.split(text):
+            add(sentence.strip(), label)
+        paragraph.clear()
+
+    for line in (report or "").splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+        elif _BULLET.match(line):
+            flush()
+            item.append(_BULLET.sub("", line).strip())
+        elif _HEADING.match(line):
+            flush()
+            heading = stripped.strip("#*: ").strip()
+        elif item:
+            item.append(stripped)
+        else:
+            paragraph.append(stripped)
+    flush()
+    return findings
+
+
+def _shorten(finding: str, max_tokens: int) -> str:
+    """Leading sentences of ``finding`` that fit ``max_tokens``, or a word-boundary cut"""
+    if estimate_tokens(finding) <= max_tokens:
+        return finding
+    kept = ""
+    for sentence in _SENTENCE_END.split(finding):
+        candidate = f"{kept} {sentence}".strip()
+        if estimate_tokens(candidate) > max_tokens:
+            break
+        kept = candidate
+    if kept:
+        return kept
+    cut = finding[:max_tokens * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+    return f"{cut.rstrip(',;:')}…"
+
+
+def compact(text: str, budget: int, focus: str = "") -> str:
+    """Extract the findings of ``text`` most relevant to ``focus`` that fit ``budget`` tokens.
+
+    Repeated findings are dropped. The rest are scored by the terms they
+    share with ``focus``, with a bonus for figures and for appearing early,
+    and the best ones are kept in their original order. Text already within
+    the budget is returned unchanged.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    if budget <= 0:
+        return ""
+
+    findings = split_findings(text)
+    focus_terms = _terms(focus)
+    header = "Key research findings (compacted):"
+    max_item = max(budget // 3, 24)
+
+    scored: List[Tuple[float, int, str]] = []
+    seen = set()
+    for index, finding in enumerate(findings):
+        key = " ".join(finding.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        terms = _terms(finding)
+        overlap = len(terms & focus_terms) / (len(terms) ** 0.5) if terms else 0.0
+        score = overlap + 0.5 * bool(_NUMBER.search(finding)) + 0.3 / (1 + index)
+        scored.append((score, index, _shorten(finding, max_item)))
+
+    chosen: List[Tuple[int, str]] = []
+    used = estimate_tokens(header)
+    for score, index, finding in sorted(scored, key=lambda item: (-item[0], item[1])):
+        cost = estimate_tokens(finding) + 1
+        if used + cost <= budget:
+            chosen.append((index, finding))
+            used += cost
+    if not chosen:
+        return _shorten(text, budget)
+    return "\n".join([header] + [f"- {finding}" for _, finding in sorted(chosen)])
+
+
+class ContextBudget:
+    """Per-task token budgets for the context passed between tasks.
+
+    ``budgets`` maps a task name to the tokens its compactable context (see
+    COMPACTABLE_TASKS) may use; tasks without a budget get their context
+    unchanged. Savings are counted per task in the metrics registry.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        name: str = "context_budget",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self.name = name
+        self.registry = registry
+        self._compactions = registry.counter(f"{name}_compactions_total", "Task contexts compacted to fit a budget")
+        self._tokens_in = registry.counter(f"{name}_tokens_in_total", "Estimated context tokens before compaction")
+        self._tokens_saved = registry.counter(f"{name}_tokens_saved_total", "Estimated context tokens removed by compaction")
+
+    def fit(self, task: str, sources: List[Tuple[str, str]], focus: str = "") -> Tuple[List[str], Dict[str, Any]]:
+        """Apply ``task``'s budget to its context ``sources`` of (task name, output).
+
+        Returns the context parts and a report of the estimated tokens before
+        and after. Outputs that are not compactable, such as the draft, are
+        kept whole and join the focus, so the critic keeps the findings
+        behind the draft's claims.
+        """
+        budget = self.budgets.get(task)
+        parts = [text for _, text in sources]
+        original = sum(estimate_tokens(text) for text in parts)
+        report = {'task': task, 'budget': budget, 'original_tokens': original, 'context_tokens': original,
+                  'tokens_saved': 0}
+        if budget is None:
+            return parts, report
+
+        focus = " ".join([focus] + [text for name, text in sources if name not in COMPACTABLE_TASKS])
+        compactable = [i for i, (name, _) in enumerate(sources) if name in COMPACTABLE_TASKS]
+        share = budget // len(compactable) if compactable else 0
+        for i in compactable:
+            parts[i] = compact(parts[i], share, focus)
+
+        report['context_tokens'] = sum(estimate_tokens(text) for text in parts)
+        report['tokens_saved'] = original - report['context_tokens']
+        if report['tokens_saved'] > 0:
+            labels = {'task': task}
+            self._compactions.inc()
+            self._tokens_in.inc(original)
+            self._tokens_saved.inc(report['tokens_saved'])
+            self.registry.counter(
+                "crew_context_tokens_saved_total", "Estimated context tokens removed by compaction", labels=labels
+            ).inc(report['tokens_saved'])
+        return parts, report
+
+    def stats(self) -> Dict[str, Any]:
+        tokens_in = self._tokens_in.value
+        return {
+            'budgets': dict(self.budgets),
+            'compactions': self._compactions.value,
+            'tokens_saved': self._tokens_saved.value,
+            'saved_ratio': round(self._tokens_saved.value / tokens_in, 4) if tokens_in else 0.0,
+        }
+
+
+def parse_budgets(value: str) -> Dict[str, int]:
+    """``task=tokens`` pairs separated by commas"""
+    budgets = {}
+    for pair in filter(None, (part.strip() for part in value.split(","))):
+        task, _, tokens = pair.partition("=")
+        if not task.strip() or not tokens.strip().isdigit():
+            raise ValueError(f"CONTEXT_BUDGETS entries must look like task=tokens, got {pair!r}")
+        budgets[task.strip()] = int(tokens)
+    return budgets
+
+
+_shared: Optional[ContextBudget] = None
+
+
+def create_context_budget() -> Optional[ContextBudget]:
+    """Build the context budget from environment settings (None when disabled)"""
+    if os.environ.get('CONTEXT_BUDGET', 'true').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    value = os.environ.get('CONTEXT_BUDGETS')
+    return ContextBudget(parse_budgets(value) if value else None)
+
+
+def shared_context_budget() -> Optional[ContextBudget]:
+    """Process-wide context budget shared by every crew"""
+    global _shared
+    if _shared is None:
+        _shared = create_context_budget()
+    return _shared
+
+
+def context_budget_stats() -> Optional[Dict[str, Any]]:
+    return _shared.stats() if _shared is not None else None
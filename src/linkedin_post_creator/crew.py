@@ -1,13 +1,78 @@
-from crewai import Agent, Crew, Process, Task, LLM
-from crewai.project import CrewBase, agent, crew, task
+from crewai import Agent, Crew, Process, Task
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from crewai_tools import SerperDevTool
-from typing import List
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.constants import NOT_SPECIFIED
+from pydantic import Field
+from linkedin_post_creator import cancellation, checkpoints
+from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool, PostValidatorTool
+from linkedin_post_creator.cached_llm import CachedLLM
+from linkedin_post_creator.context_budget import shared_context_budget
+from linkedin_post_creator.events import STREAM_TASKS, capture, emit
+from linkedin_post_creator.knowledge import KNOWLEDGE_TASKS, shared_knowledge_index
+from linkedin_post_creator.llm_cache import shared_llm_cache
+from linkedin_post_creator.logs import crew_verbose
+from linkedin_post_creator.rate_limit import provider_limiter
+from linkedin_post_creator.validator import ValidationReport, check_draft
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 import os
+import queue
+import threading
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
+# Separator crewAI puts between the outputs that make up a task's context
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+# Heading of the validator findings appended to drafts that still need the critic
+FINDINGS_HEADER = "Validator findings (fix these in the final post):"
+
+# Job inputs the knowledge index is searched with
+KNOWLEDGE_QUERY_FIELDS = ('topic', 'industry', 'audience', 'tone')
+
+
+class BudgetedCrew(Crew):
+    """Crew that fits the context handed to each task into a ContextBudget.
+
+    Each task with a budget gets the research report compacted to the
+    findings most relevant to its description and the other context (the
+    draft, for the critic). A ``context_compacted`` event reports the tokens
+    saved. Tasks in KNOWLEDGE_TASKS also get the passages of the knowledge
+    index most relevant to the job.
+    """
+
+    # A ContextBudget and a KnowledgeIndex; typed loosely since pydantic can't build a schema for them
+    context_budget: Optional[Any] = Field(default=None, exclude=True)
+    knowledge_index: Optional[Any] = Field(default=None, exclude=True)
+
+    def _get_context(self, task: Task, task_outputs: List[TaskOutput]) -> str:
+        context = self._budgeted_context(task, task_outputs)
+        if self.knowledge_index is None or task.name not in KNOWLEDGE_TASKS:
+            return context
+        inputs = self._inputs or {}
+        query = " ".join(str(inputs[field]) for field in KNOWLEDGE_QUERY_FIELDS if inputs.get(field))
+        snippets = self.knowledge_index.context_for(query or task.description)
+        return CONTEXT_DIVIDER.join(part for part in (context, snippets) if part)
+
+    def _budgeted_context(self, task: Task, task_outputs: List[TaskOutput]) -> str:
+        if self.context_budget is None or not task.context:
+            return super()._get_context(task, task_outputs)
+
+        if task.context is NOT_SPECIFIED:
+            sources = [(output.name, output.raw) for output in task_outputs]
+        else:
+            sources = [(source.name, source.output.raw) for source in task.context if source.output is not None]
+        parts, report = self.context_budget.fit(task.name, sources, focus=task.description)
+        if report['budget'] is not None:
+            emit('context_compacted', report)
+        return CONTEXT_DIVIDER.join(part for part in parts if part)
+
+
 @CrewBase
 class LinkedinPostCreator():
     """LinkedinPostCreator crew"""
@@ -17,14 +82,45 @@ class LinkedinPostCreator():
 
     def __init__(self):
         super().__init__()
-        # Initialize search tools - using only SerperDevTool since WebsiteSearchTool requires OpenAI
-        self.serper_tool = SerperDevTool()
+        # Initialize search tools - using only SerperDevTool since WebsiteSearchTool requires OpenAI.
+        # The cached variant de-duplicates repeated queries within and across runs.
+        self.serper_tool = CachedSerperDevTool()
         
-        # Initialize Gemini LLM
-        self.llm = LLM(
+        # Initialize Gemini LLM; repeated prompts are answered from the shared response cache
+        # and calls to Gemini share one rate and concurrency limit across crews
+        self.llm = CachedLLM(
             model="gemini/gemini-2.5-pro-preview-03-25",
-            api_key=os.getenv("GEMINI_API_KEY")
+            api_key=os.getenv("GEMINI_API_KEY"),
+            cache=shared_llm_cache(),
+            limiter=provider_limiter('gemini')
         )
+        # The writer and critic stream tokens so the post can be shown while it is written
+        self.writing_llm = CachedLLM(
+            model="gemini/gemini-2.5-pro-preview-03-25",
+            api_key=os.getenv("GEMINI_API_KEY"),
+            stream=os.getenv("LLM_STREAMING", "true").lower() not in ("0", "false", "no", "off"),
+            cache=shared_llm_cache(),
+            limiter=provider_limiter('gemini')
+        )
+        self._writing_crew = None
+        self._research_crew = None
+        self._review_crew = None
+
+        # Research passed on to the writer and critic is compacted to per-task token budgets
+        self.context_budget = shared_context_budget()
+
+        # The writer gets the passages of knowledge/ relevant to the job, not whole files
+        self.knowledge_index = shared_knowledge_index()
+
+        # Agents and crews print their prompts and thoughts only under LOG_PROFILE=verbose
+        self.verbose = crew_verbose()
+
+        # Drafts are checked against the post rules locally; the critic only
+        # runs for drafts that still break them after auto-fixing
+        self.validate_drafts = os.getenv("POST_VALIDATION", "true").lower() not in ("0", "false", "no", "off")
+        self.validator_tool = PostValidatorTool()
+        self.draft_report: Optional[ValidationReport] = None
+        self._inputs: Dict[str, Any] = {}
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -38,23 +134,24 @@ class LinkedinPostCreator():
             config=self.agents_config['career_coach'],
             tools=[self.serper_tool],
             llm=self.llm,
-            verbose=True
+            verbose=self.verbose
         )
 
     @agent
     def linkedin_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['linkedin_writer'],
-            llm=self.llm,
-            verbose=True
+            llm=self.writing_llm,
+            verbose=self.verbose
         )
 
     @agent
     def content_critic(self) -> Agent:
         return Agent(
             config=self.agents_config['content_critic'],
-            llm=self.llm,
-            verbose=True
+            tools=[self.validator_tool],
+            llm=self.writing_llm,
+            verbose=self.verbose
         )
 
     # To learn more about structured task outputs,
@@ -70,25 +167,207 @@ class LinkedinPostCreator():
     def content_creation_task(self) -> Task:
         return Task(
             config=self.tasks_config['content_creation_task'],
+            guardrail=self._check_draft if self.validate_drafts else None,
         )
 
     @task
     def content_review_task(self) -> Task:
-        return Task(
+        if not self.validate_drafts:
+            return Task(
+                config=self.tasks_config['content_review_task'],
+            )
+        return ConditionalTask(
             config=self.tasks_config['content_review_task'],
-            output_file='linkedin_post.md'
+            condition=self._needs_review,
         )
 
+    @before_kickoff
+    def remember_inputs(self, inputs):
+        """Keep the job inputs for the draft check, which only sees the task output"""
+        self._inputs = dict(inputs or {})
+        self.draft_report = None
+        return inputs
+
+    def _check_draft(self, output: TaskOutput):
+        """Guardrail of content_creation_task: auto-fix the draft and list what is still wrong.
+
+        The draft always passes, since the critic rather than a writer retry
+        handles the remaining violations; they are appended to the draft so
+        the critic gets them as context.
+        """
+        self.draft_report = check_draft(output.raw, self._inputs)
+        if self.draft_report.ok:
+            return True, self.draft_report.text
+        return True, f"{self.draft_report.text}\n\n{FINDINGS_HEADER}\n{self.draft_report.describe()}"
+
+    def _needs_review(self, output: TaskOutput) -> bool:
+        return self.draft_report is None or not self.draft_report.ok
+
+    def _after_task(self, output: TaskOutput) -> None:
+        """Checkpoint the finished task, then stop if the job was cancelled or is past its deadline"""
+        checkpoints.record(output.name, output.raw, (output.agent or '').strip())
+        cancellation.check()
+
     @crew
     def crew(self) -> Crew:
         """Creates the LinkedinPostCreator crew"""
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
-        return Crew(
+        return BudgetedCrew(
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=self.verbose,
+            context_budget=self.context_budget,
+            knowledge_index=self.knowledge_index,
+            task_callback=self._after_task,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
+
+    def research_crew(self) -> Crew:
+        """Crew that only runs research_task, for research shared by several posts"""
+        if self._research_crew is None:
+            self._research_crew = Crew(
+                agents=[self.career_coach()],
+                tasks=[self.research_task()],
+                process=Process.sequential,
+                verbose=self.verbose,
+                task_callback=self._after_task,
+            )
+        return self._research_crew
+
+    def research(self, inputs) -> str:
+        """Run research_task alone and return the research report"""
+        return self.research_crew().kickoff(inputs=inputs).raw
+
+    def writing_crew(self) -> Crew:
+        """Crew that starts at content_creation_task, for when research is already known"""
+        if self._writing_crew is None:
+            self._writing_crew = BudgetedCrew(
+                agents=[self.linkedin_writer(), self.content_critic()],
+                tasks=[self.content_creation_task(), self.content_review_task()],
+                process=Process.sequential,
+                verbose=self.verbose,
+                context_budget=self.context_budget,
+                knowledge_index=self.knowledge_index,
+                task_callback=self._after_task,
+                before_kickoff_callbacks=[self.remember_inputs],
+            )
+        return self._writing_crew
+
+    def review_crew(self) -> Crew:
+        """Crew that only runs content_review_task, for when research and draft are already known"""
+        if self._review_crew is None:
+            # crewAI won't start a crew with a conditional task, so this is always a plain Task
+            review_task = Task(config=self.tasks_config['content_review_task'])
+            review_task.name = 'content_review_task'
+            self._review_crew = BudgetedCrew(
+                agents=[self.content_critic()],
+                tasks=[review_task],
+                process=Process.sequential,
+                verbose=self.verbose,
+                context_budget=self.context_budget,
+                task_callback=self._after_task,
+            )
+        return self._review_crew
+
+    @staticmethod
+    def _preset_output(task: Task, inputs, raw: str, agent: Agent) -> TaskOutput:
+        """Give ``task`` a finished output, so tasks using it as context can run without it"""
+        task.interpolate_inputs_and_add_conversation_history(inputs)
+        task.output = TaskOutput(
+            name=task.name,
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=raw,
+            agent=agent.role,
+        )
+        return task.output
+
+    def kickoff_with_research(self, inputs, research: str, draft: Optional[str] = None):
+        """Run the writing and review tasks using previously produced research.
+
+        With a ``draft`` as well (e.g. from a checkpoint), only the review
+        runs, and only if the draft was left with validator findings.
+        """
+        # Downstream tasks read their context from research_task.output
+        self._preset_output(self.research_task(), inputs, research, self.career_coach())
+        if draft is None:
+            return self.writing_crew().kickoff(inputs=inputs)
+
+        draft_output = self._preset_output(self.content_creation_task(), inputs, draft, self.linkedin_writer())
+        if FINDINGS_HEADER in draft:
+            return self.review_crew().kickoff(inputs=inputs)
+        # The draft passed validation, so the critic would have been skipped
+        review_task = self.content_review_task()
+        skipped = TaskOutput(name=review_task.name, description=review_task.description, raw="",
+                             agent=self.content_critic().role)
+        return CrewOutput(raw=draft, tasks_output=[draft_output, skipped], token_usage=UsageMetrics())
+
+    def kickoff_variants(
+        self, inputs, variants: Sequence[Dict[str, Any]], max_workers: int = 4, factory=None
+    ) -> Iterator[Dict[str, Any]]:
+        """Research ``inputs`` once, then write and review a post per variant concurrently.
+
+        Each variant overrides some of ``tone`` and ``audience``. Yields one
+        record per variant in completion order, after a leading research
+        record (see VariantRunner). This crew writes the first variant; up to
+        ``max_workers - 1`` more crews are built with ``factory`` (default:
+        this class) for the others.
+        """
+        from linkedin_post_creator.crew_pool import CrewPool
+        from linkedin_post_creator.metrics import MetricsRegistry
+        from linkedin_post_creator.pipeline import PostPipeline
+        from linkedin_post_creator.variants import VariantRunner
+
+        spare = [self]
+        factory = factory or type(self)
+        # A throwaway pool; its counters would otherwise add to the API pool's crew_pool_* metrics
+        pool = CrewPool(
+            factory=lambda: spare.pop() if spare else factory(),
+            max_size=max_workers,
+            name="variant_pool",
+            registry=MetricsRegistry(),
+        )
+        runner = VariantRunner(PostPipeline(pool), concurrency=max_workers)
+        yield from runner.run(inputs, variants)
+
+    def stream(
+        self, inputs, research: Optional[str] = None, tasks: Sequence[str] = STREAM_TASKS
+    ) -> Iterator[Tuple[str, str]]:
+        """Run the crew and yield (task_name, text) as the answers of ``tasks`` are generated.
+
+        The crew runs on a background thread; the CrewOutput is the
+        generator's return value (``result = yield from creator.stream(...)``).
+        """
+        chunks = queue.Queue()
+        done = object()
+        outcome = {}
+
+        def sink(type, data):
+            if type == 'token' and data['task'] in tasks:
+                chunks.put((data['task'], data['text']))
+
+        def run():
+            with capture(sink):
+                try:
+                    if research is not None:
+                        outcome['result'] = self.kickoff_with_research(inputs, research)
+                    else:
+                        outcome['result'] = self.crew().kickoff(inputs=inputs)
+                except BaseException as e:
+                    outcome['error'] = e
+                finally:
+                    chunks.put(done)
+
+        threading.Thread(target=run, name="crew-stream", daemon=True).start()
+        while True:
+            item = chunks.get()
+            if item is done:
+                break
+            yield item
+
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
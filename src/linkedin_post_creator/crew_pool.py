@@ -0,0 +1,239 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+if TYPE_CHECKING:
+    from linkedin_post_creator.crew import LinkedinPostCreator
+
+
+class CrewPoolTimeout(Exception):
+    """Raised when no pooled crew becomes available within the checkout timeout"""
+
+
+class PooledCrew:
+    """A pre-built LinkedinPostCreator crew that can be reused across jobs.
+
+    Agents and tasks keep their original (un-interpolated) templates, so every
+    ``kickoff`` re-interpolates them with the new job inputs. ``reset`` clears
+    the per-run state crewAI leaves behind on the shared objects.
+    """
+
+    def __init__(self, creator: "LinkedinPostCreator"):
+        self.creator = creator
+        self.crew = creator.crew()
+        self.uses = 0
+
+    def kickoff(self, inputs: Dict[str, Any], research: Optional[str] = None, draft: Optional[str] = None):
+        """Run the full crew, only the writing tasks when ``research`` is given, or only the review with a ``draft`` too"""
+        self.uses += 1
+        if research is not None:
+            return self.creator.kickoff_with_research(inputs, research, draft)
+        return self.crew.kickoff(inputs=inputs)
+
+    def research(self, inputs: Dict[str, Any]) -> str:
+        """Run only the research task and return its report"""
+        self.uses += 1
+        return self.creator.research(inputs)
+
+    def research_tokens(self) -> int:
+        """Tokens spent by the research agent since the last reset"""
+        return self.creator.career_coach()._token_process.get_summary().total_tokens
+
+    def reset(self) -> None:
+        """Clear per-job state so the next checkout starts from a clean crew"""
+        from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+
+        for task in self.crew.tasks + self.creator.review_crew().tasks:
+            task.output = None
+            task.prompt_context = None
+            task.used_tools = 0
+            task.tools_errors = 0
+            task.delegations = 0
+            task.retry_count = 0
+            task.start_time = None
+            task.end_time = None
+            task.processed_by_agents = set()
+
+        for agent in self.crew.agents:
+            # Token usage is accumulated on the agent, so without this the
+            # usage metrics of one job would leak into the next one
+            agent._token_process = TokenProcess()
+            agent._times_executed = 0
+            agent.tools_results = []
+
+        # Tool results are cached per crew; drop them so memory stays bounded
+        for crew in (self.crew, self.creator.writing_crew(), self.creator.research_crew(), self.creator.review_crew()):
+            crew._cache_handler._cache.clear()
+            crew.usage_metrics = None
+
+
+class CrewPool:
+    """Bounded, thread-safe pool of pre-built LinkedinPostCreator crews.
+
+    Building a crew re-parses the YAML configuration and creates the LLM
+    client, search tool, agents and tasks. The pool pays that cost at most
+    ``max_size`` times and hands out exclusive crews to concurrent jobs.
+    Crews that raised during a job are discarded instead of being reused.
+    Without a ``factory`` crews are LinkedinPostCreator instances, imported on
+    first build so creating the pool doesn't load crewAI.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[], "LinkedinPostCreator"]] = None,
+        max_size: int = 4,
+        checkout_timeout: Optional[float] = None,
+        name: str = "crew_pool",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.name = name
+
+        self._idle = deque()
+        self._created = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        self._hits = registry.counter(f"{name}_hits_total", "Checkouts served by an idle pre-built crew")
+        self._misses = registry.counter(f"{name}_misses_total", "Checkouts that had to build a new crew")
+        self._waits = registry.counter(f"{name}_waits_total", "Checkouts that waited for a crew to be returned")
+        self._discarded = registry.counter(f"{name}_discarded_total", "Crews dropped after a failed job")
+        self._checkout_wait = registry.histogram(f"{name}_checkout_wait_seconds", "Time spent waiting for a crew")
+
+    def _build(self) -> "LinkedinPostCreator":
+        if self.factory is None:
+            from linkedin_post_creator.crew import LinkedinPostCreator
+            self.factory = LinkedinPostCreator
+        return self.factory()
+
+    def prefill(self, count: Optional[int] = None) -> int:
+        """Build crews ahead of time so the first jobs don't pay setup cost"""
+        count = self.max_size if count is None else min(count, self.max_size)
+        built = 0
+        while True:
+            with self._condition:
+                if self._created >= count:
+                    break
+                self._created += 1
+            try:
+                pooled = PooledCrew(self._build())
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                raise
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+            built += 1
+        return built
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledCrew:
+        """Take a crew out of the pool, building one if there is spare capacity"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        waited = False
+
+        with self._condition:
+            while not self._idle and self._created >= self.max_size:
+                waited = True
+                remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    self._checkout_wait.observe(time.perf_counter() - start)
+                    raise CrewPoolTimeout(f"No crew available in '{self.name}' after {timeout:.1f}s")
+                self._condition.wait(remaining)
+
+            if self._idle:
+                pooled = self._idle.popleft()
+                build = False
+            else:
+                # Reserve the slot before building outside the lock
+                self._created += 1
+                pooled = None
+                build = True
+            self._in_use += 1
+
+        if waited:
+            self._waits.inc()
+
+        if build:
+            self._misses.inc()
+            try:
+                pooled = PooledCrew(self._build())
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+        else:
+            self._hits.inc()
+
+        self._checkout_wait.observe(time.perf_counter() - start)
+        return pooled
+
+    def release(self, pooled: PooledCrew, discard: bool = False) -> None:
+        """Return a crew to the pool, or drop it if it may be in a bad state"""
+        if not discard:
+            try:
+                pooled.reset()
+            except Exception as e:
+                print(f"Discarding pooled crew that failed to reset: {e}")
+                discard = True
+
+        with self._condition:
+            self._in_use -= 1
+            if discard:
+                self._created -= 1
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+        if discard:
+            self._discarded.inc()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Context manager yielding an exclusive PooledCrew for one job"""
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        except BaseException:
+            self.release(pooled, discard=True)
+            raise
+        else:
+            self.release(pooled)
+
+    def kickoff(self, inputs: Dict[str, Any], timeout: Optional[float] = None):
+        """Run one job on a pooled crew"""
+        with self.checkout(timeout) as pooled:
+            return pooled.kickoff(inputs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            size = self._created
+            idle = len(self._idle)
+            in_use = self._in_use
+        hits = self._hits.value
+        misses = self._misses.value
+        total = hits + misses
+        return {
+            'max_size': self.max_size,
+            'size': size,
+            'idle': idle,
+            'in_use': in_use,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+            'waits': self._waits.value,
+            'discarded': self._discarded.value,
+            'checkout_wait_seconds': self._checkout_wait.snapshot(),
+        }
@@ -0,0 +1,326 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Crew events are attributed to jobs through the worker thread that runs them
+_current = threading.local()
+
+# Tasks whose answers are streamed token by token by default; the critic is
+# skipped for drafts that pass validation, so the draft is streamed too
+STREAM_TASKS = ('content_creation_task', 'content_review_task')
+
+# Agents prefix their answer with their reasoning; only text after this is streamed
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+def format_sse(type: str, data: Any, id: Optional[int] = None) -> str:
+    """Server-Sent Events wire format for one event"""
+    prefix = f"id: {id}\n" if id is not None else ""
+    return f"{prefix}event: {type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class JobEvent:
+    """A progress event for one job, numbered so clients can resume a stream"""
+
+    __slots__ = ('seq', 'job_id', 'type', 'data', 'timestamp')
+
+    def __init__(self, seq: int, job_id: str, type: str, data: Dict[str, Any]):
+        self.seq = seq
+        self.job_id = job_id
+        self.type = type
+        self.data = data
+        self.timestamp = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'seq': self.seq, 'type': self.type, 'data': self.data, 'timestamp': self.timestamp}
+
+    def to_sse(self) -> str:
+        return format_sse(self.type, self.data, self.seq)
+
+
+class Subscription:
+    """Async view of the events published for one job"""
+
+    def __init__(self, broker: "EventBroker", job_id: str):
+        self.broker = broker
+        self.job_id = job_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[JobEvent]" = asyncio.Queue()
+
+    def push(self, event: JobEvent) -> None:
+        # Called from worker threads
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[JobEvent]:
+        """Next event, or None if nothing arrived within ``timeout`` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fan-out of job progress events from crew worker threads to async subscribers.
+
+    Each job keeps a short history so a reconnecting client can replay what
+    it missed via Last-Event-ID. Histories of finished jobs are dropped
+    ``retention_seconds`` after the job's last event.
+    """
+
+    def __init__(
+        self,
+        history_size: int = 500,
+        retention_seconds: float = 300.0,
+        name: str = "events",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.history_size = history_size
+        self.retention_seconds = retention_seconds
+        self._seq = 0
+        self._history: Dict[str, Deque[JobEvent]] = {}
+        self._finished: Dict[str, float] = {}
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+        self._published = registry.counter(f"{name}_published_total", "Job events published")
+        self._subscribers_gauge = registry.gauge(f"{name}_subscribers", "Open event stream subscriptions")
+
+    def publish(self, job_id: str, type: str, data: Optional[Dict[str, Any]] = None, final: bool = False) -> JobEvent:
+        """Record an event for ``job_id`` and push it to its subscribers"""
+        with self._lock:
+            self._seq += 1
+            event = JobEvent(self._seq, job_id, type, data or {})
+            history = self._history.get(job_id)
+            if history is None:
+                history = self._history[job_id] = deque(maxlen=self.history_size)
+            history.append(event)
+            if final:
+                self._finished[job_id] = event.timestamp
+            subscribers = list(self._subscribers.get(job_id, ()))
+            self._prune(event.timestamp)
+
+        for subscription in subscribers:
+            subscription.push(event)
+        self._published.inc()
+        return event
+
+    def publish_many(self, job_ids: Iterable[str], type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        for job_id in job_ids:
+            self.publish(job_id, type, data)
+
+    def _prune(self, now: float) -> None:
+        # Caller holds the lock
+        cutoff = now - self.retention_seconds
+        for job_id in [j for j, finished_at in self._finished.items() if finished_at < cutoff]:
+            del self._finished[job_id]
+            self._history.pop(job_id, None)
+
+    def history(self, job_id: str, after: int = 0) -> List[JobEvent]:
+        """Events for ``job_id`` with a sequence number above ``after``"""
+        with self._lock:
+            return [event for event in self._history.get(job_id, ()) if event.seq > after]
+
+    def last_seq(self, job_id: str) -> int:
+        with self._lock:
+            history = self._history.get(job_id)
+            return history[-1].seq if history else 0
+
+    def subscribe(self, job_id: str) -> Subscription:
+        """Subscribe the running event loop to events for ``job_id``"""
+        subscription = Subscription(self, job_id)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(subscription)
+        self._subscribers_gauge.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.job_id, [])
+            if subscription not in subscribers:
+                return
+            subscribers.remove(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.job_id]
+        self._subscribers_gauge.dec()
+
+    def bind(self, job_ids: Callable[[], List[str]]):
+        """Attribute crew events raised on this thread to the jobs returned by ``job_ids``"""
+        return capture(lambda type, data: self.publish_many(job_ids(), type, data))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = len(self._history)
+            subscribers = sum(len(s) for s in self._subscribers.values())
+        return {
+            'jobs': jobs,
+            'subscribers': subscribers,
+            'published': self._published.value,
+        }
+
+
+@contextmanager
+def capture(sink: Callable[[str, Dict[str, Any]], None]):
+    """Call ``sink(type, data)`` for every crew event raised on this thread"""
+    install_crew_listener()
+    sinks = getattr(_current, 'sinks', None)
+    if sinks is None:
+        sinks = _current.sinks = []
+    sinks.append(sink)
+    try:
+        yield
+    finally:
+        sinks.remove(sink)
+
+
+def _emit(type: str, data: Dict[str, Any]) -> None:
+    for sink in list(getattr(_current, 'sinks', ())):
+        sink(type, data)
+
+
+def emit(type: str, data: Dict[str, Any]) -> None:
+    """Send an event of our own to the sinks capturing this thread, alongside the crew events"""
+    _emit(type, data)
+
+
+def tokens_sent() -> int:
+    """Number of token events sent to the sinks capturing this thread so far"""
+    return getattr(_current, 'tokens_sent', 0)
+
+
+def _answer_text(chunk: str) -> str:
+    """Part of a streamed chunk that belongs to the agent's final answer"""
+    if getattr(_current, 'answering', False):
+        return chunk
+    _current.pending = getattr(_current, 'pending', '') + chunk
+    index = _current.pending.find(FINAL_ANSWER_MARKER)
+    if index < 0:
+        return ''
+    _current.answering = True
+    text = _current.pending[index + len(FINAL_ANSWER_MARKER):].lstrip()
+    _current.pending = ''
+    return text
+
+
+def _task_name(task: Any) -> Optional[str]:
+    if task is None:
+        return None
+    return getattr(task, 'name', None) or (task.description or '')[:80]
+
+
+def _agent_role(agent: Any) -> Optional[str]:
+    role = getattr(agent, 'role', None) if agent is not None else None
+    return role.strip() if isinstance(role, str) else role
+
+
+def _token_usage(agent: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens the agent has used so far"""
+    try:
+        summary = agent._token_process.get_summary()
+        return summary.prompt_tokens, summary.completion_tokens
+    except AttributeError:
+        return 0, 0
+
+
+_listener_installed = False
+_listener_lock = threading.Lock()
+
+
+def install_crew_listener() -> None:
+    """Forward crewAI task, agent, tool and token events to bound job streams"""
+    global _listener_installed
+    with _listener_lock:
+        if _listener_installed:
+            return
+        _listener_installed = True
+
+    # Imported here so the API can start without loading crewAI
+    from crewai.utilities.events import (
+        AgentExecutionStartedEvent,
+        LLMCallCompletedEvent,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+        TaskCompletedEvent,
+        TaskStartedEvent,
+        ToolUsageFinishedEvent,
+        ToolUsageStartedEvent,
+        crewai_event_bus,
+    )
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def on_task_started(source, event):
+        _current.task = _task_name(event.task)
+        _current.task_started_at = time.perf_counter()
+        _current.task_usage = _token_usage(getattr(event.task, 'agent', None))
+        _emit('task_started', {
+            'task': _task_name(event.task),
+            'agent': _agent_role(getattr(event.task, 'agent', None)),
+        })
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def on_task_completed(source, event):
+        prompt_tokens, completion_tokens = _token_usage(getattr(event.task, 'agent', None))
+        start_prompt, start_completion = getattr(_current, 'task_usage', (0, 0))
+        started_at = getattr(_current, 'task_started_at', None)
+        _emit('task_completed', {
+            'task': _task_name(event.task),
+            'agent': (event.output.agent or '').strip(),
+            'seconds': round(time.perf_counter() - started_at, 6) if started_at else None,
+            'prompt_tokens': max(prompt_tokens - start_prompt, 0),
+            'completion_tokens': max(completion_tokens - start_completion, 0),
+        })
+
+    @crewai_event_bus.on(AgentExecutionStartedEvent)
+    def on_agent_started(source, event):
+        _current.agent = _agent_role(event.agent)
+        _emit('agent_started', {'agent': _current.agent})
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_call_started(source, event):
+        _current.answering = False
+        _current.pending = ''
+        _current.llm_started_at = time.perf_counter()
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def on_agent_step(source, event):
+        # LLM events carry no agent, so use the agent last started on this thread
+        started_at = getattr(_current, 'llm_started_at', None)
+        _emit('agent_step', {
+            'agent': getattr(_current, 'agent', None),
+            'call_type': event.call_type.value,
+            'seconds': round(time.perf_counter() - started_at, 6) if started_at else None,
+        })
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def on_tool_started(source, event):
+        _emit('tool_started', {'tool': event.tool_name, 'agent': event.agent_role, 'args': event.tool_args})
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def on_tool_finished(source, event):
+        _emit('tool_finished', {
+            'tool': event.tool_name,
+            'agent': event.agent_role,
+            'from_cache': event.from_cache,
+            'seconds': round((event.finished_at - event.started_at).total_seconds(), 6),
+        })
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def on_token(source, event):
+        if not getattr(_current, 'sinks', None):
+            return
+        text = _answer_text(event.chunk)
+        if text:
+            _current.tokens_sent = tokens_sent() + 1
+            _emit('token', {
+                'task': getattr(_current, 'task', None),
+                'agent': getattr(_current, 'agent', None),
+                'text': text,
+            })
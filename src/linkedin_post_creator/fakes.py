@@ -0,0 +1,208 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+from crewai.llms.base_llm import BaseLLM
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    LLMStreamChunkEvent,
+    crewai_event_bus,
+)
+from crewai.utilities.events.llm_events import LLMCallType
+
+from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool
+
+_VOCABULARY = (
+    "teams ship faster when feedback loops are short and ownership is clear "
+    "hiring managers look for impact not buzzwords so measure outcomes and share "
+    "what you learned automation frees time for deeper work while curiosity "
+    "keeps skills relevant in a changing market"
+).split()
+
+# Marker crewAI puts in the system prompt of agents that have tools
+_TOOLS_PROMPT = "You ONLY have access to the following tools"
+_SEARCH_TOOL = CachedSerperDevTool.model_fields['name'].default
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def fake_text(words: int, seed: str) -> str:
+    """Deterministic filler text of ``words`` words"""
+    rng = random.Random(_seed(seed))
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(words))
+
+
+class FakeLLM(BaseLLM):
+    """LLM stand-in with configurable latency and response size.
+
+    Each call sleeps ``latency + tokens * seconds_per_token`` and answers in
+    the ReAct format crewAI expects. Agents with tools first issue
+    ``searches`` calls to the Serper tool before giving their final answer.
+    Answers start with a short headline line, so with ``tokens`` under 200
+    they pass the post validator.
+    LLM call and stream chunk events are emitted like the real LLM does, and
+    token usage (one token per word) is reported to the agent's callbacks.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens: int = 120,
+        seconds_per_token: float = 0.0,
+        searches: int = 1,
+        stream: bool = False,
+        chunk_tokens: int = 4,
+    ):
+        super().__init__(model="fake/deterministic")
+        self.latency = latency
+        self.tokens = tokens
+        self.seconds_per_token = seconds_per_token
+        self.searches = searches
+        self.stream = stream
+        self.chunk_tokens = chunk_tokens
+        self.calls = 0
+        self.tokens_generated = 0
+        self._lock = threading.Lock()
+
+    def _response(self, messages: List[Dict[str, Any]]) -> str:
+        system = messages[0].get("content", "") if messages else ""
+        prompt = json.dumps(messages[:2], sort_keys=True, default=str)
+        observations = sum(
+            str(m.get("content", "")).count("Observation:") for m in messages[1:]
+        )
+
+        if _TOOLS_PROMPT in system and _SEARCH_TOOL in system and observations < self.searches:
+            query = f"{fake_text(3, prompt)} trends {observations + 1}"
+            return (
+                "Thought: I should search for recent information\n"
+                f"Action: {_SEARCH_TOOL}\n"
+                f"Action Input: {json.dumps({'search_query': query})}"
+            )
+
+        headline = fake_text(2, prompt).capitalize()
+        body = fake_text(max(self.tokens - 10, 1), prompt[::-1])
+        return (
+            "Thought: I now can give a great answer\n"
+            f"Final Answer: {headline}\n\n{body.capitalize()} 🚀 💡\n\n#Careers #Tech #Growth"
+        )
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        crewai_event_bus.emit(self, LLMCallStartedEvent(messages=messages, tools=tools))
+
+        response = self._response(messages)
+        words = response.split(" ")
+        time.sleep(self.latency)
+        if self.stream:
+            for start in range(0, len(words), self.chunk_tokens):
+                chunk = " ".join(words[start:start + self.chunk_tokens])
+                if start:
+                    chunk = " " + chunk
+                time.sleep(self.seconds_per_token * self.chunk_tokens)
+                crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=chunk))
+        else:
+            time.sleep(self.seconds_per_token * len(words))
+
+        with self._lock:
+            self.calls += 1
+            self.tokens_generated += len(words)
+        usage = SimpleNamespace(
+            prompt_tokens=sum(len(str(m.get("content", "")).split()) for m in messages),
+            completion_tokens=len(words),
+            prompt_tokens_details=None,
+        )
+        for callback in callbacks or ():
+            if hasattr(callback, "log_success_event"):
+                callback.log_success_event({}, {"usage": usage}, None, None)
+        crewai_event_bus.emit(self, LLMCallCompletedEvent(response=response, call_type=LLMCallType.LLM_CALL))
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+class FakeSerperResponse:
+    def __init__(self, payload: Dict[str, Any], status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Client Error", response=self)
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+
+class FakeSerperSession:
+    """Replacement for CachedSerperDevTool's HTTP session returning canned results.
+
+    With ``quota_rps``, requests beyond that many in the last second are
+    answered with 429 and a one-second Retry-After, like Serper's rate limit.
+    """
+
+    def __init__(self, latency: float = 0.0, results: int = 5, quota_rps: Optional[float] = None):
+        self.latency = latency
+        self.results = results
+        self.quota_rps = quota_rps
+        self.requests = 0
+        self.throttled = 0
+        self._recent: deque = deque()
+        self._lock = threading.Lock()
+
+    def post(self, url: str, headers=None, json=None, timeout=None) -> FakeSerperResponse:
+        with self._lock:
+            self.requests += 1
+            if self.quota_rps is not None:
+                now = time.monotonic()
+                while self._recent and self._recent[0] <= now - 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.quota_rps:
+                    self.throttled += 1
+                    return FakeSerperResponse({"message": "Too many requests"}, 429, {"Retry-After": "1"})
+                self._recent.append(now)
+        time.sleep(self.latency)
+        query = (json or {}).get("q", "")
+        return FakeSerperResponse({
+            "searchParameters": {"q": query},
+            "organic": [
+                {
+                    "title": fake_text(6, f"{query}/title/{i}").title(),
+                    "link": f"https://example.com/{_seed(query) % 10000}/{i}",
+                    "snippet": fake_text(25, f"{query}/snippet/{i}"),
+                    "position": i + 1,
+                }
+                for i in range(self.results)
+            ],
+        })
+
+
+def install_fake_search(session: FakeSerperSession) -> None:
+    """Route every CachedSerperDevTool request to ``session``"""
+    CachedSerperDevTool._session = session
+
+
+def use_fake_llm(creator, llm: FakeLLM):
+    """Point every agent of a LinkedinPostCreator at ``llm``"""
+    creator.llm = llm
+    creator.writing_llm = llm
+    for agent in creator.crew().agents:
+        agent.llm = llm
+    return creator
@@ -0,0 +1,134 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from linkedin_post_creator.events import capture
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Tools whose calls count as searches
+SEARCH_TOOL_MARKER = "search"
+
+
+class StageRecorder:
+    """Per-task timings, LLM calls, tokens and tool calls of one crew run.
+
+    It is fed the crew events raised on the thread that runs the crew (see
+    ``record_stages``), keeps a per-job summary for the result, and records
+    the same numbers in the metrics registry, labelled by task and tool, for
+    ``/api/metrics``.
+    """
+
+    def __init__(self, queue_wait: Optional[float] = None, registry: MetricsRegistry = REGISTRY):
+        self.queue_wait = queue_wait
+        self.registry = registry
+        self.tasks: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        # Context is built, and compacted, just before its task starts
+        self._context: Optional[Dict[str, Any]] = None
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        if queue_wait is not None:
+            registry.histogram("job_queue_wait_seconds", "Time jobs waited for a crew worker").observe(queue_wait)
+
+    def __call__(self, type: str, data: Dict[str, Any]) -> None:
+        handler = getattr(self, f"_on_{type}", None)
+        if handler is not None:
+            handler(data)
+
+    def _on_context_compacted(self, data: Dict[str, Any]) -> None:
+        self._context = data
+
+    def _on_task_started(self, data: Dict[str, Any]) -> None:
+        context = self._context if self._context and self._context['task'] == data['task'] else None
+        self._context = None
+        self._current = {
+            'task': data['task'],
+            'agent': data.get('agent'),
+            'seconds': None,
+            'llm_calls': 0,
+            'llm_seconds': 0.0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'tool_calls': {},
+            'tool_seconds': 0.0,
+            'search_calls': 0,
+            'cached_tool_calls': 0,
+            'context_tokens': context['context_tokens'] if context else None,
+            'context_tokens_saved': context['tokens_saved'] if context else 0,
+        }
+        self.tasks.append(self._current)
+
+    def _on_agent_step(self, data: Dict[str, Any]) -> None:
+        if self._current is None or data.get('seconds') is None:
+            return
+        self._current['llm_calls'] += 1
+        self._current['llm_seconds'] += data['seconds']
+        self.registry.histogram(
+            "crew_llm_call_seconds", "Latency of LLM calls made by crew tasks", labels={'task': self._current['task']}
+        ).observe(data['seconds'])
+
+    def _on_tool_finished(self, data: Dict[str, Any]) -> None:
+        if self._current is None:
+            return
+        tool = data.get('tool') or 'unknown'
+        seconds = data.get('seconds') or 0.0
+        calls = self._current['tool_calls']
+        calls[tool] = calls.get(tool, 0) + 1
+        self._current['tool_seconds'] += seconds
+        self._current['cached_tool_calls'] += bool(data.get('from_cache'))
+        if SEARCH_TOOL_MARKER in tool.lower():
+            self._current['search_calls'] += 1
+        self.registry.histogram("crew_tool_seconds", "Duration of agent tool calls", labels={'tool': tool}).observe(seconds)
+
+    def _on_task_completed(self, data: Dict[str, Any]) -> None:
+        stage = self._current
+        if stage is None or stage['task'] != data.get('task'):
+            return
+        self._current = None
+        stage['seconds'] = data.get('seconds')
+        stage['prompt_tokens'] = data.get('prompt_tokens', 0)
+        stage['completion_tokens'] = data.get('completion_tokens', 0)
+        stage['llm_seconds'] = round(stage['llm_seconds'], 6)
+        stage['tool_seconds'] = round(stage['tool_seconds'], 6)
+
+        labels = {'task': stage['task']}
+        if stage['seconds'] is not None:
+            self.registry.histogram("crew_task_seconds", "Wall time of crew tasks", labels=labels).observe(stage['seconds'])
+        self.registry.counter("crew_task_llm_calls_total", "LLM calls made by crew tasks", labels=labels).inc(stage['llm_calls'])
+        self.registry.counter("crew_prompt_tokens_total", "Prompt tokens used by crew tasks", labels=labels).inc(stage['prompt_tokens'])
+        self.registry.counter(
+            "crew_completion_tokens_total", "Completion tokens used by crew tasks", labels=labels
+        ).inc(stage['completion_tokens'])
+        self.registry.counter("crew_search_calls_total", "Search tool calls made by crew tasks", labels=labels).inc(stage['search_calls'])
+
+    def finish(self) -> None:
+        if self._finished is None:
+            self._finished = time.perf_counter()
+            self.registry.histogram("job_run_seconds", "Wall time of crew runs").observe(self._finished - self._started)
+
+    def summary(self) -> Dict[str, Any]:
+        """Stage breakdown attached to job results"""
+        end = self._finished if self._finished is not None else time.perf_counter()
+        timed = [stage for stage in self.tasks if stage['seconds'] is not None]
+        return {
+            'queue_wait_seconds': round(self.queue_wait, 6) if self.queue_wait is not None else None,
+            'run_seconds': round(end - self._started, 6),
+            'llm_calls': sum(stage['llm_calls'] for stage in self.tasks),
+            'prompt_tokens': sum(stage['prompt_tokens'] for stage in self.tasks),
+            'completion_tokens': sum(stage['completion_tokens'] for stage in self.tasks),
+            'search_calls': sum(stage['search_calls'] for stage in self.tasks),
+            'context_tokens_saved': sum(stage['context_tokens_saved'] for stage in self.tasks),
+            'slowest_task': max(timed, key=lambda stage: stage['seconds'])['task'] if timed else None,
+            'tasks': [dict(stage, tool_calls=dict(stage['tool_calls'])) for stage in self.tasks],
+        }
+
+
+@contextmanager
+def record_stages(queue_wait: Optional[float] = None) -> Iterator[StageRecorder]:
+    """Record the stages of the crew run executed on this thread inside the ``with`` block"""
+    recorder = StageRecorder(queue_wait)
+    try:
+        with capture(recorder):
+            yield recorder
+    finally:
+        recorder.finish()
@@ -0,0 +1,576 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Jobs in these states will never change again and are safe to evict/compact
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class JobStore(ABC):
+    """Interface for storing post generation job records.
+
+    A record is a plain dict (``status``, ``progress``, ``result``, ``error``,
+    ``timestamp``, ...). Stores add ``created_at``/``updated_at`` epoch
+    seconds, which are used for age based lookups and eviction.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds
+        self._compaction_stop = threading.Event()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def create(self, job_id: str, record: Dict[str, Any]) -> None:
+        """Insert a new job record"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the job record, or None if it is unknown"""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        """Merge ``fields`` into an existing job record"""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> bool:
+        """Remove a job record, returning whether it existed"""
+
+    @abstractmethod
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        older_than: Optional[float] = None,
+        newer_than: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return records filtered by status and ``updated_at`` age, newest first"""
+
+    @abstractmethod
+    def compact(self) -> int:
+        """Drop finished jobs older than the TTL, returning how many were removed"""
+
+    def committed_status(self, job_id: str) -> Optional[str]:
+        """Status of a job as every process sharing the store sees it"""
+        record = self.get(job_id)
+        return record.get('status') if record is not None else None
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': type(self).__name__, 'ttl_seconds': self.ttl_seconds}
+
+    def start_background_compaction(self, interval: float = 300.0) -> None:
+        """Periodically call ``compact`` from a daemon thread"""
+        if self._compaction_thread is not None:
+            return
+
+        def loop():
+            while not self._compaction_stop.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Job store compaction failed: {e}")
+
+        self._compaction_thread = threading.Thread(target=loop, name="job-store-compaction", daemon=True)
+        self._compaction_thread.start()
+
+    def close(self) -> None:
+        self._compaction_stop.set()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join(timeout=5)
+            self._compaction_thread = None
+
+
+class MemoryJobStore(JobStore):
+    """In-process job store with TTL and LRU eviction.
+
+    Finished jobs expire ``ttl_seconds`` after their last update. When the
+    store holds more than ``max_entries`` records, the least recently used
+    finished jobs are evicted first so running jobs keep their status.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 24 * 3600):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_status: Dict[str, set] = {}
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def _index(self, job_id: str, old_status: Optional[str], new_status: Optional[str]) -> None:
+        if old_status == new_status:
+            return
+        if old_status is not None:
+            bucket = self._by_status.get(old_status)
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._by_status[old_status]
+        if new_status is not None:
+            self._by_status.setdefault(new_status, set()).add(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        record = self._jobs.pop(job_id)
+        self._index(job_id, record.get('status'), None)
+
+    def _expired(self, record: Dict[str, Any], now: float) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and record.get('status') in TERMINAL_STATUSES
+            and now - record['updated_at'] > self.ttl_seconds
+        )
+
+    def _evict(self) -> None:
+        if len(self._jobs) <= self.max_entries:
+            return
+        # Oldest-accessed first; prefer finished jobs over running ones
+        for terminal_only in (True, False):
+            for job_id in list(self._jobs):
+                if len(self._jobs) <= self.max_entries:
+                    return
+                if terminal_only and self._jobs[job_id].get('status') not in TERMINAL_STATUSES:
+                    continue
+                self._remove(job_id)
+                self._evictions += 1
+
+    def create(self, job_id: str, record: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            if job_id in self._jobs:
+                self._remove(job_id)
+            stored = dict(record, created_at=now, updated_at=now)
+            self._jobs[job_id] = stored
+            self._index(job_id, None, stored.get('status'))
+            self._evict()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            if self._expired(record, time.time()):
+                self._remove(job_id)
+                self._evictions += 1
+                return None
+            self._jobs.move_to_end(job_id)
+            return dict(record)
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return
+            old_status = record.get('status')
+            record.update(fields)
+            record['updated_at'] = time.time()
+            self._jobs.move_to_end(job_id)
+            self._index(job_id, old_status, record.get('status'))
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id not in self._jobs:
+                return False
+            self._remove(job_id)
+            return True
+
+    def list_jobs(self, status=None, older_than=None, newer_than=None, limit=None):
+        now = time.time()
+        with self._lock:
+            if status is not None:
+                job_ids = self._by_status.get(status, ())
+            else:
+                job_ids = self._jobs.keys()
+            records = [
+                dict(self._jobs[job_id], job_id=job_id)
+                for job_id in job_ids
+                if not self._expired(self._jobs[job_id], now)
+            ]
+
+        if older_than is not None:
+            records = [r for r in records if now - r['updated_at'] >= older_than]
+        if newer_than is not None:
+            records = [r for r in records if now - r['updated_at'] <= newer_than]
+        records.sort(key=lambda r: r['updated_at'], reverse=True)
+        return records[:limit] if limit is not None else records
+
+    def compact(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, record in self._jobs.items() if self._expired(record, now)]
+            for job_id in expired:
+                self._remove(job_id)
+            self._evictions += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_status = {status: len(ids) for status, ids in self._by_status.items()}
+            return dict(
+                super().stats(),
+                size=len(self._jobs),
+                max_entries=self.max_entries,
+                evictions=self._evictions,
+                by_status=by_status
+            )
+
+
+class SQLiteJobStore(JobStore):
+    """SQLite (WAL mode) job store that can be shared by several processes.
+
+    Writes are queued and committed by a background writer thread in batches,
+    so frequent progress updates cost one transaction per batch rather than
+    one per update. Pending writes are overlaid on reads and listings, so a
+    process always sees its own updates; other processes see them once the
+    batch commits.
+    An update writes only the fields it changed, so it never reverts fields
+    another process changed meanwhile, such as a cancellation.
+    """
+
+    _COLUMNS = ('status', 'progress', 'result', 'error', 'timestamp')
+    _ROW = ('job_id',) + _COLUMNS + ('extra', 'created_at', 'updated_at')
+    _INSERT = f"INSERT OR REPLACE INTO jobs ({', '.join(_ROW)}) VALUES ({', '.join('?' for _ in _ROW)})"
+
+    def __init__(
+        self,
+        path: str = "jobs.db",
+        ttl_seconds: Optional[float] = 24 * 3600,
+        batch_size: int = 100,
+        flush_interval: float = 0.05
+    ):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Fields each pending record changed; None for records not in the database yet
+        self._changed: Dict[str, Optional[set]] = {}
+        self._pending_lock = threading.Lock()
+        # Held from taking a batch until it is written, so a delete can't be overwritten by the batch
+        self._flush_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._batches = 0
+        self._failed_batches = 0
+        self._writes = 0
+        self._compacted = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+        self._writer_stop = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="job-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                timestamp TEXT,
+                extra TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at);
+        """)
+
+    @classmethod
+    def _to_row(cls, job_id: str, record: Dict[str, Any]) -> tuple:
+        extra = {k: v for k, v in record.items() if k not in cls._COLUMNS + ('created_at', 'updated_at')}
+        return (
+            job_id,
+            record.get('status'),
+            record.get('progress'),
+            json.dumps(record['result']) if record.get('result') is not None else None,
+            record.get('error'),
+            record.get('timestamp'),
+            json.dumps(extra) if extra else None,
+            record['created_at'],
+            record['updated_at'],
+        )
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        record = json.loads(row['extra']) if row['extra'] else {}
+        record.update(
+            status=row['status'],
+            progress=row['progress'],
+            result=json.loads(row['result']) if row['result'] is not None else None,
+            error=row['error'],
+            timestamp=row['timestamp'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+        )
+        return record
+
+    @classmethod
+    def _to_update(cls, job_id: str, record: Dict[str, Any], fields: set) -> Tuple[str, tuple]:
+        """UPDATE statement writing only ``fields`` of ``record``, merging extra fields into the stored ones"""
+        row = dict(zip(cls._ROW, cls._to_row(job_id, record)))
+        columns = [name for name in cls._COLUMNS if name in fields] + ['updated_at']
+        assignments = [f"{name} = ?" for name in columns]
+        params = [row[name] for name in columns]
+        extra = sorted(fields - set(cls._ROW))
+        if extra:
+            assignments.append(
+                "extra = json_set(COALESCE(extra, '{}'), " + ", ".join("?, json(?)" for _ in extra) + ")"
+            )
+            for name in extra:
+                params += [f'$."{name}"', json.dumps(record.get(name))]
+        return f"UPDATE jobs SET {', '.join(assignments)} WHERE job_id = ?", (*params, job_id)
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def _enqueue(self, job_id: str, record: Dict[str, Any]) -> None:
+        with self._pending_lock:
+            self._pending[job_id] = record
+            self._changed[job_id] = None
+        self._queue.put(job_id)
+
+    def _write_loop(self) -> None:
+        while not self._writer_stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            # Gather whatever else arrives within the flush window
+            job_ids = {first}
+            deadline = time.monotonic() + self.flush_interval
+            while len(job_ids) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job_ids.add(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._flush(job_ids)
+
+    def _write(self, statements: List[Tuple[str, List[tuple]]]) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.executemany(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT may already have ended the transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _flush(self, job_ids) -> None:
+        with self._flush_lock:
+            written = self._flush_batch(job_ids)
+        if written is False and not self._writer_stop.is_set():
+            # The records stay in the overlay; write them with the next batch
+            for job_id in job_ids:
+                self._queue.put(job_id)
+            self._writer_stop.wait(self.flush_interval)
+
+    def _flush_batch(self, job_ids) -> Optional[bool]:
+        """Write the pending records of ``job_ids``; False if the write failed, None if nothing was pending"""
+        with self._pending_lock:
+            batch = {
+                job_id: (self._pending[job_id], self._changed[job_id])
+                for job_id in job_ids if job_id in self._pending
+            }
+        if not batch:
+            return None
+
+        inserts, updates = [], {}
+        for job_id, (record, fields) in batch.items():
+            if fields is None:
+                inserts.append(self._to_row(job_id, record))
+            else:
+                sql, params = self._to_update(job_id, record, fields)
+                updates.setdefault(sql, []).append(params)
+        statements = ([(self._INSERT, inserts)] if inserts else []) + list(updates.items())
+        try:
+            self._write(statements)
+        except Exception as e:
+            self._failed_batches += 1
+            print(f"Job store batch write failed: {e}")
+            return False
+
+        self._batches += 1
+        self._writes += len(batch)
+        with self._pending_lock:
+            for job_id, (record, _) in batch.items():
+                # Only drop the overlay if nothing newer was queued meanwhile
+                if self._pending.get(job_id) is record:
+                    del self._pending[job_id]
+                    del self._changed[job_id]
+        return True
+
+    def create(self, job_id: str, record: Dict[str, Any]) -> None:
+        now = time.time()
+        self._enqueue(job_id, dict(record, created_at=now, updated_at=now))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._pending_lock:
+            pending = self._pending.get(job_id)
+            if pending is not None:
+                return dict(pending)
+        return self._load(job_id)
+
+    def update(self, job_id: str, **fields) -> None:
+        # Read-modify-write under the lock so concurrent updates don't drop fields
+        with self._pending_lock:
+            current = self._pending.get(job_id) or self._load(job_id)
+            if current is None:
+                return
+            self._pending[job_id] = dict(current, **fields, updated_at=time.time())
+            changed = self._changed.get(job_id, set())
+            self._changed[job_id] = None if changed is None else changed | set(fields)
+        self._queue.put(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        # Waits for a batch being written, which may hold the job's record
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = self._pending.pop(job_id, None)
+                self._changed.pop(job_id, None)
+            cursor = self._connect().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        return pending is not None or cursor.rowcount > 0
+
+    def committed_status(self, job_id: str) -> Optional[str]:
+        row = self._connect().execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row['status'] if row is not None else None
+
+    def list_jobs(self, status=None, older_than=None, newer_than=None, limit=None):
+        now = time.time()
+        with self._pending_lock:
+            pending = {job_id: dict(record, job_id=job_id) for job_id, record in self._pending.items()}
+
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if older_than is not None:
+            clauses.append("updated_at <= ?")
+            params.append(now - older_than)
+        if newer_than is not None:
+            clauses.append("updated_at >= ?")
+            params.append(now - newer_than)
+
+        sql = "SELECT * FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY updated_at DESC"
+        if limit is not None:
+            # Rows superseded by a pending record are replaced below
+            sql += " LIMIT ?"
+            params.append(int(limit) + len(pending))
+
+        records = []
+        for row in self._connect().execute(sql, params):
+            if row['job_id'] in pending:
+                continue
+            record = self._from_row(row)
+            record['job_id'] = row['job_id']
+            records.append(record)
+
+        # Records not written yet, filtered like the rows
+        for record in pending.values():
+            if status is not None and record.get('status') != status:
+                continue
+            if older_than is not None and now - record['updated_at'] < older_than:
+                continue
+            if newer_than is not None and now - record['updated_at'] > newer_than:
+                continue
+            records.append(record)
+        records.sort(key=lambda r: r['updated_at'], reverse=True)
+        return records[:limit] if limit is not None else records
+
+    def compact(self) -> int:
+        if self.ttl_seconds is None:
+            return 0
+        conn = self._connect()
+        cutoff = time.time() - self.ttl_seconds
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        cursor = conn.execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+            (*TERMINAL_STATUSES, cutoff)
+        )
+        removed = cursor.rowcount
+        if removed:
+            # Keep the WAL file from growing without bound
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._compacted += removed
+        return removed
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until queued writes have been committed"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+            time.sleep(self.flush_interval / 2)
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        with self._pending_lock:
+            pending = len(self._pending)
+        return dict(
+            super().stats(),
+            path=self.path,
+            size=sum(row['n'] for row in rows),
+            by_status={row['status']: row['n'] for row in rows},
+            pending_writes=pending,
+            batches=self._batches,
+            failed_batches=self._failed_batches,
+            writes=self._writes,
+            compacted=self._compacted
+        )
+
+    def close(self) -> None:
+        super().close()
+        self._writer_stop.set()
+        self._writer.join(timeout=10)
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_job_store() -> JobStore:
+    """Build the job store selected by the JOB_STORE environment variable"""
+    backend = os.environ.get('JOB_STORE', 'memory').lower()
+    ttl = float(os.environ.get('JOB_TTL_SECONDS', 24 * 3600))
+
+    if backend == 'sqlite':
+        return SQLiteJobStore(path=os.environ.get('JOB_STORE_PATH', 'jobs.db'), ttl_seconds=ttl)
+    if backend == 'memory':
+        return MemoryJobStore(max_entries=int(os.environ.get('JOB_STORE_MAX_ENTRIES', 10000)), ttl_seconds=ttl)
+    raise ValueError(f"Unknown JOB_STORE backend: {backend}")
@@ -0,0 +1,501 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Tasks whose context gets the knowledge snippets relevant to the job
+KNOWLEDGE_TASKS = ('content_creation_task',)
+
+# Files of the knowledge directory that are indexed
+SUFFIXES = ('.txt', '.md')
+
+# Longest chunk, in words; longer paragraphs are split at line and sentence ends
+CHUNK_WORDS = 80
+
+# BM25 parameters (the usual Okapi defaults)
+K1 = 1.5
+B = 0.75
+
+# Ranks are fused as 1 / (RRF_K + rank) in vector mode
+RRF_K = 60
+
+INDEX_VERSION = 1
+
+# Files of an index generation, by suffix
+GENERATION_SUFFIXES = ('postings', 'docs', 'text', 'vectors')
+# Age after which a generation no manifest references is deleted. A rebuild
+# writes its files just before swapping the manifest, so only the loser of
+# two concurrent rebuilds (or a crashed one) leaves one this old
+STALE_GENERATION_SECONDS = 60.0
+
+_TOKEN = re.compile(r"[^\W_]+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*(?:[-=*_]{3,}\s*)?\n|\n\s*[-=*_]{3,}\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Words that say nothing about relevance
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "you your we our they their about into than then them these those what when which who".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in (t.lower() for t in _TOKEN.findall(text or "")) if token not in _STOPWORDS]
+
+
+def split_chunks(text: str, max_words: int = CHUNK_WORDS) -> List[str]:
+    """Split a document into passages: paragraphs (or ``---`` separated posts) of at most ``max_words``.
+
+    A longer paragraph is packed line by line, and a longer line sentence by
+    sentence, so each fact or past post stays in one piece where it fits.
+    """
+    chunks: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph.split()) <= max_words:
+            chunks.append(paragraph)
+            continue
+        pieces = []
+        for line in paragraph.splitlines():
+            pieces.extend(_SENTENCE_END.split(line.strip()) if len(line.split()) > max_words else [line.strip()])
+        current: List[str] = []
+        words = 0
+        for piece in filter(None, pieces):
+            count = len(piece.split())
+            if current and words + count > max_words:
+                chunks.append("\n".join(current))
+                current, words = [], 0
+            current.append(piece)
+            words += count
+        if current:
+            chunks.append("\n".join(current))
+    return chunks
+
+
+def _view(path: str, typecode: str):
+    """Read-only memoryview of an array file, memory-mapped so pages load only when searched"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+class _Snapshot:
+    """One generation of the index on disk, memory-mapped.
+
+    ``postings`` holds (doc, term frequency) pairs, grouped by term; ``docs``
+    holds (text start, text end, length in tokens) triples; ``vectors`` holds
+    one unit-length embedding per doc in vector mode.
+    """
+
+    def __init__(self, directory: str, manifest: Dict[str, Any]):
+        self.manifest = manifest
+        self.generation = manifest['generation']
+        self.files: Dict[str, Dict[str, Any]] = manifest['files']
+        self.terms: Dict[str, List[int]] = manifest['terms']
+        self.doc_count: int = manifest['doc_count']
+        self.avg_length: float = manifest['avg_length'] or 1.0
+        self.dimensions: int = manifest.get('dimensions') or 0
+
+        base = os.path.join(directory, self.generation)
+        self.postings = _view(f"{base}.postings", 'I')
+        self.docs = _view(f"{base}.docs", 'Q')
+        self.text = _view(f"{base}.text", 'B')
+        self.vectors = _view(f"{base}.vectors", 'f') if self.dimensions else None
+
+        # Sources of doc ids, for attributing snippets
+        ranges = sorted((meta['docs'][0], meta['docs'][1], path) for path, meta in self.files.items())
+        self._starts = [start for start, _, _ in ranges]
+        self._ranges = ranges
+
+    @classmethod
+    def empty(cls) -> '_Snapshot':
+        snapshot = cls.__new__(cls)
+        snapshot.manifest = None
+        snapshot.generation = None
+        snapshot.files, snapshot.terms = {}, {}
+        snapshot.doc_count, snapshot.avg_length, snapshot.dimensions = 0, 1.0, 0
+        snapshot.postings = snapshot.docs = snapshot.text = memoryview(b"")
+        snapshot.vectors = None
+        snapshot._starts, snapshot._ranges = [], []
+        return snapshot
+
+    def doc_text(self, doc: int) -> str:
+        start, end = self.docs[3 * doc], self.docs[3 * doc + 1]
+        return bytes(self.text[start:end]).decode('utf-8')
+
+    def doc_length(self, doc: int) -> int:
+        return self.docs[3 * doc + 2]
+
+    def doc_vector(self, doc: int) -> Sequence[float]:
+        return self.vectors[doc * self.dimensions:(doc + 1) * self.dimensions]
+
+    def source(self, doc: int) -> Optional[str]:
+        i = bisect_right(self._starts, doc) - 1
+        if i >= 0:
+            start, count, path = self._ranges[i]
+            if doc < start + count:
+                return path
+        return None
+
+    def term_postings(self, term: str) -> List[Tuple[int, int]]:
+        entry = self.terms.get(term)
+        if entry is None:
+            return []
+        offset, df = entry
+        pairs = self.postings[2 * offset:2 * (offset + df)]
+        return list(zip(pairs[0::2], pairs[1::2]))
+
+    def bm25(self, query_terms: Sequence[str]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for term in set(query_terms):
+            postings = self.term_postings(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (self.doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                norm = K1 * (1 - B + B * self.doc_length(doc) / self.avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        return scores
+
+    def cosine(self, query: Sequence[float]) -> Dict[int, float]:
+        scores = {}
+        for doc in range(self.doc_count):
+            scores[doc] = sum(q * d for q, d in zip(query, self.doc_vector(doc)))
+        return scores
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def local_embedder() -> Callable[[List[str]], List[Sequence[float]]]:
+    """Embedding function of the local MiniLM model that ships with chromadb (installed with crewAI).
+
+    The model runs on CPU through onnxruntime; it is downloaded once, on
+    first use, to chromadb's cache directory.
+    """
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    function = DefaultEmbeddingFunction()
+    return lambda texts: list(function(texts))
+
+
+class KnowledgeIndex:
+    """Retrieval index over the text files of a knowledge directory.
+
+    Files (user preferences, past posts, ...) are split into passages and
+    indexed for BM25, so the writer gets the few passages relevant to a job
+    instead of whole files. In ``vector`` mode passages are also embedded
+    with ``embedder`` and ranked by BM25 and cosine similarity combined.
+
+    The index is written to ``index_dir`` as flat array files that are
+    memory-mapped on load, so every crew and worker process shares one copy
+    through the page cache. It is rebuilt, at most every
+    ``refresh_interval`` seconds, when files are added, changed or removed;
+    only those files are read again (and embedded), the postings and
+    vectors of the others are carried over from the previous build.
+    """
+
+    def __init__(
+        self,
+        directory: str = "knowledge",
+        index_dir: str = ".cache/knowledge",
+        mode: str = "bm25",
+        top_k: int = 3,
+        refresh_interval: float = 5.0,
+        embedder: Optional[Callable[[List[str]], List[Sequence[float]]]] = None,
+        name: str = "knowledge",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        if mode not in ('bm25', 'vector'):
+            raise ValueError(f"Knowledge mode must be bm25 or vector, got {mode!r}")
+        self.directory = directory
+        self.index_dir = index_dir
+        self.mode = mode
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self._embedder = embedder
+        self._snapshot = _Snapshot.empty()
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self._queries = registry.counter(f"{name}_queries_total", "Knowledge index searches")
+        self._snippets = registry.counter(f"{name}_snippets_total", "Knowledge snippets added to task context")
+        self._rebuilds = registry.counter(f"{name}_rebuilds_total", "Knowledge index rebuilds")
+        self._reindexed = registry.counter(f"{name}_files_indexed_total", "Knowledge files read and indexed")
+        self._build_seconds = registry.histogram(f"{name}_build_seconds", "Time taken to rebuild the knowledge index")
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.index_dir, "index.json")
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) of the indexable files, by path relative to the knowledge directory"""
+        found = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for filename in files:
+                if filename.endswith(SUFFIXES) and not filename.startswith('.'):
+                    path = os.path.join(root, filename)
+                    stat = os.stat(path)
+                    found[os.path.relpath(path, self.directory)] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != INDEX_VERSION or manifest.get('mode') != self.mode:
+            return None
+        return manifest
+
+    def _current(self, found: Dict[str, Tuple[int, int]], snapshot: _Snapshot) -> bool:
+        return snapshot.manifest is not None and {
+            path: (meta['mtime_ns'], meta['size']) for path, meta in snapshot.files.items()
+        } == found
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date with the knowledge directory; returns whether it was rebuilt"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            found = self._scan() if os.path.isdir(self.directory) else {}
+            if not force and self._current(found, self._snapshot):
+                return False
+
+            # Another process may already have rebuilt it
+            manifest = self._read_manifest()
+            if manifest is not None and manifest['generation'] != self._snapshot.generation:
+                try:
+                    self._snapshot = _Snapshot(self.index_dir, manifest)
+                except OSError:
+                    pass
+                if not force and self._current(found, self._snapshot):
+                    return False
+
+            start = time.perf_counter()
+            self._snapshot = self._build(found, self._snapshot)
+            self._build_seconds.observe(time.perf_counter() - start)
+            self._rebuilds.inc()
+            return True
+
+    def _build(self, found: Dict[str, Tuple[int, int]], previous: _Snapshot) -> _Snapshot:
+        docs: List[Tuple[str, int]] = []
+        remap: Dict[int, int] = {}
+        added: List[Tuple[int, Counter]] = []
+        files: Dict[str, Dict[str, Any]] = {}
+        vectors: List[Optional[Sequence[float]]] = []
+
+        for path in sorted(found):
+            mtime_ns, size = found[path]
+            old = previous.files.get(path)
+            first = len(docs)
+            if old is not None and (old['mtime_ns'], old['size']) == (mtime_ns, size):
+                start, count = old['docs']
+                for doc in range(start, start + count):
+                    remap[doc] = len(docs)
+                    docs.append((previous.doc_text(doc), previous.doc_length(doc)))
+                    vectors.append(previous.doc_vector(doc) if previous.dimensions else None)
+            else:
+                with open(os.path.join(self.directory, path), encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+                self._reindexed.inc()
+                for chunk in split_chunks(text):
+                    tokens = tokenize(chunk)
+                    added.append((len(docs), Counter(tokens)))
+                    docs.append((chunk, len(tokens)))
+                    vectors.append(None)
+            files[path] = {'mtime_ns': mtime_ns, 'size': size, 'docs': [first, len(docs) - first]}
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for term in previous.terms:
+            kept = [(remap[doc], tf) for doc, tf in previous.term_postings(term) if doc in remap]
+            if kept:
+                postings[term] = kept
+        for doc, counts in added:
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        dimensions = 0
+        if self.mode == 'vector' and docs:
+            missing = [doc for doc, vector in enumerate(vectors) if vector is None]
+            if missing:
+                for doc, vector in zip(missing, self._embed([docs[doc][0] for doc in missing])):
+                    vectors[doc] = _unit(vector)
+            dimensions = len(vectors[0])
+
+        return self._write(files, docs, postings, vectors if dimensions else [], dimensions, previous)
+
+    def _write(self, files, docs, postings, vectors, dimensions, previous: _Snapshot) -> _Snapshot:
+        os.makedirs(self.index_dir, exist_ok=True)
+        generation = uuid.uuid4().hex[:16]
+        base = os.path.join(self.index_dir, generation)
+
+        terms: Dict[str, List[int]] = {}
+        flat = array('I')
+        for term in sorted(postings):
+            pairs = sorted(postings[term])
+            terms[term] = [len(flat) // 2, len(pairs)]
+            for doc, tf in pairs:
+                flat.extend((doc, tf))
+
+        text = bytearray()
+        spans = array('Q')
+        for chunk, length in docs:
+            encoded = chunk.encode('utf-8')
+            spans.extend((len(text), len(text) + len(encoded), length))
+            text.extend(encoded)
+
+        with open(f"{base}.postings", 'wb') as f:
+            flat.tofile(f)
+        with open(f"{base}.docs", 'wb') as f:
+            spans.tofile(f)
+        with open(f"{base}.text", 'wb') as f:
+            f.write(text)
+        if dimensions:
+            with open(f"{base}.vectors", 'wb') as f:
+                array('f', (value for vector in vectors for value in vector)).tofile(f)
+
+        manifest = {
+            'version': INDEX_VERSION,
+            'mode': self.mode,
+            'generation': generation,
+            'directory': os.path.abspath(self.directory),
+            'files': files,
+            'terms': terms,
+            'doc_count': len(docs),
+            'avg_length': sum(length for _, length in docs) / len(docs) if docs else 1.0,
+            'dimensions': dimensions,
+        }
+        temporary = f"{self._manifest_path}.{generation}"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temporary, self._manifest_path)
+
+        # Searches still using the previous generation keep its mappings; unlinking only frees the files
+        if previous.generation is not None:
+            for suffix in GENERATION_SUFFIXES:
+                try:
+                    os.remove(os.path.join(self.index_dir, f"{previous.generation}.{suffix}"))
+                except FileNotFoundError:
+                    pass
+        self._remove_stale(generation)
+        return _Snapshot(self.index_dir, manifest)
+
+    def _remove_stale(self, current: str) -> None:
+        """Delete generations other processes wrote but never published (or replaced) long ago"""
+        cutoff = time.time() - STALE_GENERATION_SECONDS
+        for entry in os.scandir(self.index_dir):
+            generation, _, suffix = entry.name.partition('.')
+            if generation == current or suffix not in GENERATION_SUFFIXES:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _embed(self, texts: List[str]) -> List[Sequence[float]]:
+        if self._embedder is None:
+            self._embedder = local_embedder()
+        return self._embedder(texts)
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The ``k`` passages most relevant to ``query``, best first"""
+        if self._checked_at is None or time.monotonic() - self._checked_at >= self.refresh_interval:
+            self.refresh()
+        snapshot = self._snapshot
+        k = self.top_k if k is None else k
+        self._queries.inc()
+        if not snapshot.doc_count or k <= 0:
+            return []
+
+        scores = snapshot.bm25(tokenize(query))
+        if snapshot.dimensions:
+            similarity = snapshot.cosine(_unit(self._embed([query])[0]))
+            fused: Dict[int, float] = {}
+            for ranking in (scores, similarity):
+                for rank, doc in enumerate(sorted(ranking, key=ranking.get, reverse=True)):
+                    if ranking[doc] > 0:
+                        fused[doc] = fused.get(doc, 0.0) + 1 / (RRF_K + rank + 1)
+            scores = fused
+
+        best = heapq.nlargest(k, ((score, doc) for doc, score in scores.items() if score > 0))
+        return [
+            {'source': snapshot.source(doc), 'text': snapshot.doc_text(doc), 'score': round(score, 4)}
+            for score, doc in best
+        ]
+
+    def context_for(self, query: str, k: Optional[int] = None) -> str:
+        """Knowledge section for a task's context, or "" when nothing is relevant"""
+        try:
+            snippets = self.search(query, k)
+        except (OSError, ValueError) as e:
+            # The post can still be written without personalization
+            print(f"Knowledge search failed: {e}")
+            return ""
+        if not snippets:
+            return ""
+        self._snippets.inc(len(snippets))
+        lines = ["Relevant knowledge about the author (use what fits the post, ignore the rest):"]
+        lines.extend(f"- [{snippet['source']}] {' '.join(snippet['text'].split())}" for snippet in snippets)
+        return "\n".join(lines)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'directory': self.directory,
+            'mode': self.mode,
+            'top_k': self.top_k,
+            'files': len(snapshot.files),
+            'passages': snapshot.doc_count,
+            'terms': len(snapshot.terms),
+            'queries': self._queries.value,
+            'snippets': self._snippets.value,
+            'rebuilds': self._rebuilds.value,
+            'files_indexed': self._reindexed.value,
+        }
+
+
+_shared: Optional[KnowledgeIndex] = None
+
+
+def create_knowledge_index() -> Optional[KnowledgeIndex]:
+    """Build the knowledge index from environment settings (None when disabled)"""
+    if os.environ.get('KNOWLEDGE', 'true').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return KnowledgeIndex(
+        directory=os.environ.get('KNOWLEDGE_DIR', 'knowledge'),
+        index_dir=os.environ.get('KNOWLEDGE_INDEX_DIR', '.cache/knowledge'),
+        mode=os.environ.get('KNOWLEDGE_MODE', 'bm25').lower(),
+        top_k=int(os.environ.get('KNOWLEDGE_TOP_K', 3)),
+        refresh_interval=float(os.environ.get('KNOWLEDGE_REFRESH_INTERVAL', 5)),
+    )
+
+
+def shared_knowledge_index() -> Optional[KnowledgeIndex]:
+    """Process-wide knowledge index shared by every crew"""
+    global _shared
+    if _shared is None:
+        _shared = create_knowledge_index()
+    return _shared
+
+
+def knowledge_stats() -> Optional[Dict[str, Any]]:
+    return _shared.stats() if _shared is not None else None
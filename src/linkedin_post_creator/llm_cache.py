@@ -0,0 +1,388 @@
+import hashlib
+import heapq
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# crewAI starts every agent's system prompt with "You are {role}."
+_ROLE = re.compile(r"^\s*You are (.{1,120}?)\.\s")
+# Shingle width and sketch size used to estimate similarity in near-duplicate mode
+SHINGLE_WORDS = 5
+SKETCH_SIZE = 128
+
+
+def normalize_messages(messages: Sequence[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """(role, content) pairs with whitespace collapsed, so formatting-only differences share a key"""
+    return [
+        (str(message.get("role", "user")), re.sub(r"\s+", " ", str(message.get("content") or "")).strip())
+        for message in messages
+    ]
+
+
+def agent_role(messages: Sequence[Dict[str, Any]]) -> str:
+    """Role of the agent that sent ``messages``, used to break down cache statistics"""
+    for message in messages:
+        if message.get("role") == "system":
+            match = _ROLE.match(str(message.get("content") or ""))
+            return match.group(1).strip() if match else "unknown"
+    return "unknown"
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def response_key(model: str, messages: Sequence[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Content address of an LLM call: model, normalized messages and sampling parameters"""
+    return _digest({'model': model, 'messages': normalize_messages(messages), 'params': params})
+
+
+def _bucket(model: str, messages: Sequence[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    # Near matches are only considered between calls of the same shape
+    return _digest({'model': model, 'roles': [m.get("role") for m in messages], 'params': params})
+
+
+def sketch(messages: Sequence[Dict[str, Any]]) -> List[int]:
+    """Bottom-k MinHash sketch of the word shingles of ``messages``"""
+    words = " ".join(content for _, content in normalize_messages(messages)).lower().split()
+    shingles = {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+    }
+    return sorted(heapq.nsmallest(SKETCH_SIZE, shingles))
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two sketches"""
+    if not a or not b:
+        return 0.0
+    union = heapq.nsmallest(SKETCH_SIZE, set(a) | set(b))
+    both = set(a) & set(b)
+    return sum(1 for value in union if value in both) / len(union)
+
+
+class LLMCacheEntry:
+    """A cached LLM response"""
+
+    __slots__ = ('key', 'bucket', 'response', 'sketch', 'role', 'created_at')
+
+    def __init__(self, key: str, bucket: str, response: str, sketch: Optional[List[int]] = None,
+                 role: str = "unknown", created_at: Optional[float] = None):
+        self.key = key
+        self.bucket = bucket
+        self.response = response
+        self.sketch = sketch or []
+        self.role = role
+        self.created_at = time.time() if created_at is None else created_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'bucket': self.bucket,
+            'response': self.response,
+            'sketch': self.sketch,
+            'role': self.role,
+            'created_at': self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LLMCacheEntry":
+        return cls(data['key'], data['bucket'], data['response'], data.get('sketch'),
+                   data.get('role', 'unknown'), data['created_at'])
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + disk) cache of LLM responses.
+
+    Calls are keyed on the model, the whitespace-normalized messages and the
+    sampling parameters, so replays, retries and train/test loops that send
+    the same prompt get the stored answer instead of a new Gemini call.
+    Entries are served while younger than ``ttl_seconds``; the disk tier is
+    kept to ``max_disk_entries`` by evicting the least recently used files.
+
+    With ``near_duplicates`` a miss may be served by an entry whose messages
+    are at least ``similarity_threshold`` similar (estimated Jaccard over
+    word shingles) and that has the same model, parameters and message
+    roles. Only entries in the memory tier are considered.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = ".cache/llm",
+        max_entries: int = 1000,
+        max_disk_entries: int = 10000,
+        ttl_seconds: float = 6 * 3600,
+        near_duplicates: bool = False,
+        similarity_threshold: float = 0.95,
+        name: str = "llm_cache",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        self._memory: "OrderedDict[str, LLMCacheEntry]" = OrderedDict()
+        self._by_agent: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self._memory_hits = registry.counter(f"{name}_memory_hits_total", "LLM responses served from memory")
+        self._disk_hits = registry.counter(f"{name}_disk_hits_total", "LLM responses served from disk")
+        self._near_hits = registry.counter(f"{name}_near_hits_total", "LLM responses served by a near-duplicate prompt")
+        self._misses = registry.counter(f"{name}_misses_total", "LLM calls that went to the model")
+        self._stores = registry.counter(f"{name}_stores_total", "LLM responses written to the cache")
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            if near_duplicates:
+                self._load_recent()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _fresh(self, entry: LLMCacheEntry, now: float) -> bool:
+        return now - entry.created_at <= self.ttl_seconds
+
+    def _remember(self, entry: LLMCacheEntry) -> None:
+        with self._lock:
+            self._memory[entry.key] = entry
+            self._memory.move_to_end(entry.key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _files(self) -> List[Tuple[float, str]]:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for filename in names:
+                path = os.path.join(root, filename)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        return files
+
+    def _load_recent(self) -> None:
+        """Fill the memory tier from the most recently used disk entries, for near-duplicate lookups"""
+        now = time.time()
+        for _, path in sorted(self._files())[-self.max_entries:]:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = LLMCacheEntry.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError):
+                continue
+            if self._fresh(entry, now):
+                self._remember(entry)
+
+    def _read_disk(self, key: str) -> Optional[LLMCacheEntry]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = LLMCacheEntry.from_dict(json.load(f))
+            # The modification time orders files for LRU eviction
+            os.utime(path)
+            return entry
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, entry: LLMCacheEntry) -> None:
+        if not self.directory:
+            return
+        path = self._path(entry.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _count(self, role: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._by_agent.setdefault(role, {'hits': 0, 'near_hits': 0, 'misses': 0})
+            counts[outcome] += 1
+
+    def _nearest(self, bucket: str, messages: Sequence[Dict[str, Any]], now: float) -> Optional[LLMCacheEntry]:
+        target = sketch(messages)
+        best, best_score = None, self.similarity_threshold
+        with self._lock:
+            candidates = [entry for entry in self._memory.values() if entry.bucket == bucket]
+        for entry in candidates:
+            if not self._fresh(entry, now):
+                continue
+            score = similarity(target, entry.sketch)
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def get(self, model: str, messages: Sequence[Dict[str, Any]], params: Dict[str, Any]) -> Optional[str]:
+        """Return a fresh cached response for this call, or None"""
+        key = response_key(model, messages, params)
+        role = agent_role(messages)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry, now):
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+
+        if entry is not None:
+            self._memory_hits.inc()
+            self._count(role, 'hits')
+            return entry.response
+
+        entry = self._read_disk(key)
+        if entry is not None and self._fresh(entry, now):
+            self._disk_hits.inc()
+            self._count(role, 'hits')
+            self._remember(entry)
+            return entry.response
+        if entry is not None:
+            # Reading refreshed its mtime, which would keep prune from ever expiring it
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+        if self.near_duplicates:
+            entry = self._nearest(_bucket(model, messages, params), messages, now)
+            if entry is not None:
+                self._near_hits.inc()
+                self._count(role, 'near_hits')
+                return entry.response
+
+        self._misses.inc()
+        self._count(role, 'misses')
+        return None
+
+    def put(self, model: str, messages: Sequence[Dict[str, Any]], params: Dict[str, Any], response: str) -> LLMCacheEntry:
+        """Store the response of this call"""
+        entry = LLMCacheEntry(
+            response_key(model, messages, params),
+            _bucket(model, messages, params),
+            response,
+            sketch(messages) if self.near_duplicates else None,
+            agent_role(messages),
+        )
+        self._remember(entry)
+        try:
+            self._write_disk(entry)
+        except OSError as e:
+            print(f"Failed to persist LLM cache entry: {e}")
+        self._stores.inc()
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= 100:
+            self._writes_since_prune = 0
+            self.prune()
+        return entry
+
+    def prune(self) -> int:
+        """Delete expired entries and the least recently used ones beyond ``max_disk_entries``"""
+        if not self.directory:
+            return 0
+        files = sorted(self._files())
+        cutoff = time.time() - self.ttl_seconds
+        excess = len(files) - self.max_disk_entries
+        removed = 0
+        for index, (mtime, path) in enumerate(files):
+            if index >= excess and mtime >= cutoff:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for _, path in self._files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+
+    def stats(self) -> Dict[str, Any]:
+        memory_hits = self._memory_hits.value
+        disk_hits = self._disk_hits.value
+        near_hits = self._near_hits.value
+        misses = self._misses.value
+        lookups = memory_hits + disk_hits + near_hits + misses
+        with self._lock:
+            size = len(self._memory)
+            by_agent = {
+                role: dict(counts, hit_rate=round(
+                    (counts['hits'] + counts['near_hits']) / max(sum(counts.values()), 1), 4
+                ))
+                for role, counts in self._by_agent.items()
+            }
+        return {
+            'memory_entries': size,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'near_duplicates': self.near_duplicates,
+            'memory_hits': memory_hits,
+            'disk_hits': disk_hits,
+            'near_hits': near_hits,
+            'misses': misses,
+            'hit_rate': round((memory_hits + disk_hits + near_hits) / lookups, 4) if lookups else 0.0,
+            'stores': self._stores.value,
+            'by_agent': by_agent,
+        }
+
+
+def create_llm_cache() -> Optional[LLMResponseCache]:
+    """Build the LLM response cache from environment settings, or None unless LLM_CACHE turns it on.
+
+    It is off by default, so every API request gets a freshly written post;
+    the CLI turns it on for its replay, train and test loops.
+    """
+    if os.environ.get('LLM_CACHE', 'false').lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    return LLMResponseCache(
+        directory=os.environ.get('LLM_CACHE_DIR', '.cache/llm'),
+        max_entries=int(os.environ.get('LLM_CACHE_SIZE', 1000)),
+        max_disk_entries=int(os.environ.get('LLM_CACHE_DISK_SIZE', 10000)),
+        ttl_seconds=float(os.environ.get('LLM_CACHE_TTL', 6 * 3600)),
+        near_duplicates=os.environ.get('LLM_CACHE_MATCH', 'exact').lower() == 'near',
+        similarity_threshold=float(os.environ.get('LLM_CACHE_SIMILARITY', 0.95)),
+    )
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_llm_cache() -> Optional[LLMResponseCache]:
+    """The process-wide cache used by every crew's LLMs, created on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = create_llm_cache() or False
+    return _shared or None
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the shared cache; None until a crew has created it or when disabled"""
+    return _shared.stats() if _shared else None
@@ -0,0 +1,225 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from linkedin_post_creator.events import capture
+from linkedin_post_creator.metrics import REGISTRY
+
+# verbose: crewAI prints every prompt, thought and answer to stdout (the crewAI default)
+# structured: crew output is off; a sample of jobs is traced as JSON lines on a background thread
+# quiet: crew output is off and only jobs that ask for debug tracing are traced
+LOG_PROFILES = ('verbose', 'structured', 'quiet')
+
+# Job traces and other package logs go through this logger
+logger = logging.getLogger('linkedin_post_creator')
+trace_logger = logger.getChild('trace')
+
+_dropped = REGISTRY.counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+_traced = REGISTRY.counter("log_jobs_traced_total", "Jobs whose crew events were logged")
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_profile: Optional[str] = None
+_sample_rate = 0.0
+
+
+def log_profile() -> str:
+    """The configured logging profile, from LOG_PROFILE until configure_logging sets it"""
+    if _profile is not None:
+        return _profile
+    profile = os.environ.get('LOG_PROFILE', 'verbose').lower()
+    if profile not in LOG_PROFILES:
+        raise ValueError(f"LOG_PROFILE must be one of {list(LOG_PROFILES)}, got {profile!r}")
+    return profile
+
+
+def crew_verbose() -> bool:
+    """Whether agents and crews print their prompts and thoughts (crewAI ``verbose``)"""
+    return log_profile() == 'verbose'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the record's ``fields`` merged in"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped.inc()
+
+
+def configure_logging(
+    profile: Optional[str] = None,
+    sample_rate: Optional[float] = None,
+    stream=None,
+) -> str:
+    """Route package logs through a bounded queue to a background writer; returns the profile.
+
+    Arguments default to LOG_PROFILE, LOG_SAMPLE_RATE (fraction of jobs
+    traced under the structured profile), LOG_QUEUE_SIZE and LOG_LEVEL.
+    Formatting and writing happen on the listener thread, so logging a
+    record costs a worker thread one queue put. Calling it again changes the
+    profile and sample rate but keeps the running listener.
+    """
+    global _listener, _profile, _sample_rate
+    profile = (profile or os.environ.get('LOG_PROFILE', 'verbose')).lower()
+    if profile not in LOG_PROFILES:
+        raise ValueError(f"LOG_PROFILE must be one of {list(LOG_PROFILES)}, got {profile!r}")
+    if sample_rate is None:
+        sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', 0.1))
+
+    with _lock:
+        _profile = profile
+        _sample_rate = min(max(sample_rate, 0.0), 1.0) if profile == 'structured' else 0.0
+        if _listener is not None:
+            return profile
+
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(JsonFormatter())
+        records = queue.Queue(maxsize=int(os.environ.get('LOG_QUEUE_SIZE', 10000)))
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        logger.addHandler(DroppingQueueHandler(records))
+        logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+        logger.propagate = False
+        # Debug traces are requested per job, so the trace logger always lets them through
+        trace_logger.setLevel(logging.DEBUG)
+    return profile
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background writer"""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in list(logger.handlers):
+            if isinstance(handler, DroppingQueueHandler):
+                logger.removeHandler(handler)
+
+
+class JobTrace:
+    """Structured log of the crew events of one job.
+
+    Sampled jobs log task completions, tool calls and the job outcome at
+    INFO. Debug jobs also log task and agent starts, every LLM call, tool
+    arguments, the streamed answer of each task and every task output at
+    DEBUG. ``debug`` may be a callable, for runs that a debug request can
+    join while they are running. ``fields`` are added to every record.
+    """
+
+    def __init__(self, job_ids: Union[List[str], Callable[[], List[str]]],
+                 debug: Union[bool, Callable[[], bool]] = False, sampled: Optional[bool] = None,
+                 fields: Optional[Dict[str, Any]] = None):
+        self._job_ids = job_ids
+        self._debug = debug
+        self.fields = fields or {}
+        self.sampled = random.random() < _sample_rate if sampled is None else sampled
+        self._answers: Dict[Optional[str], List[str]] = {}
+        self._started = time.perf_counter()
+        self._counted = False
+
+    @property
+    def job_ids(self) -> List[str]:
+        return self._job_ids() if callable(self._job_ids) else list(self._job_ids)
+
+    @property
+    def debug(self) -> bool:
+        return bool(self._debug() if callable(self._debug) else self._debug)
+
+    @property
+    def active(self) -> bool:
+        return self.sampled or self.debug
+
+    def log(self, level: int, message: str, **fields: Any) -> None:
+        if not self._counted:
+            self._counted = True
+            _traced.inc()
+        trace_logger.log(level, message, extra={'fields': {'job_ids': self.job_ids, **self.fields, **fields}})
+
+    def __call__(self, type: str, data: Dict[str, Any]) -> None:
+        debug = self.debug
+        if not (self.sampled or debug):
+            return
+        if type == 'token':
+            if debug:
+                self._answers.setdefault(data.get('task'), []).append(data['text'])
+        elif type in ('task_completed', 'tool_finished'):
+            fields = dict(data)
+            if type == 'task_completed' and debug and data.get('task') in self._answers:
+                fields['answer'] = "".join(self._answers.pop(data['task']))
+            self.log(logging.INFO, type, **fields)
+        elif debug:
+            self.log(logging.DEBUG, type, **data)
+
+    def finish(self, output: Any = None, error: Optional[BaseException] = None) -> None:
+        """Log the job outcome, and every task output of debug jobs"""
+        if error is not None:
+            # Failures are always logged
+            self.log(logging.ERROR, 'job_failed', error=str(error),
+                     seconds=round(time.perf_counter() - self._started, 6))
+            return
+        if not self.active:
+            return
+        if self.debug:
+            for task_output in getattr(output, 'tasks_output', None) or ():
+                if not task_output.raw:
+                    # Skipped conditional task
+                    continue
+                self.log(logging.DEBUG, 'task_output', task=task_output.name, agent=(task_output.agent or '').strip(),
+                         output=task_output.raw)
+        self.log(logging.INFO, 'job_completed', seconds=round(time.perf_counter() - self._started, 6))
+
+
+@contextmanager
+def trace_job(job_ids: Union[List[str], Callable[[], List[str]]],
+              debug: Union[bool, Callable[[], bool]] = False, **fields: Any) -> Iterator[JobTrace]:
+    """Trace the crew run executed on this thread inside the ``with`` block.
+
+    The caller reports the outcome with ``trace.finish(output)``; an
+    exception leaving the block is logged as a failure.
+    """
+    trace = JobTrace(job_ids, debug, fields=fields)
+    try:
+        with capture(trace):
+            yield trace
+    except Exception as e:
+        trace.finish(error=e)
+        raise
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        'profile': log_profile(),
+        'sample_rate': _sample_rate,
+        'jobs_traced': _traced.value,
+        'records_dropped': _dropped.value,
+    }
@@ -6,13 +6,24 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 
-from linkedin_post_creator.crew import LinkedinPostCreator
+from linkedin_post_creator.artifacts import atomic_write
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # Load environment variables
 load_dotenv()
 
+# Replays and the train/test loops resend the same prompts; answer them from the LLM cache
+os.environ.setdefault('LLM_CACHE', 'true')
+
+# Local runs save the final post here
+POST_OUTPUT_FILE = 'linkedin_post.md'
+
+def build_crew():
+    """Build the crew; crewAI is imported here so commands start without loading it"""
+    from linkedin_post_creator.crew import LinkedinPostCreator
+    return LinkedinPostCreator().crew()
+
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
@@ -31,7 +42,8 @@ def run():
     }
     
     try:
-        result = LinkedinPostCreator().crew().kickoff(inputs=inputs)
+        result = build_crew().kickoff(inputs=inputs)
+        atomic_write(POST_OUTPUT_FILE, str(result))
         print("\n" + "="*50)
         print("LINKEDIN POST GENERATED SUCCESSFULLY!")
         print("="*50)
@@ -55,12 +67,22 @@ def run_with_params(topic, industry="Technology", tone="professional", audience=
     }
     
     try:
-        result = LinkedinPostCreator().crew().kickoff(inputs=inputs)
+        result = build_crew().kickoff(inputs=inputs)
+        atomic_write(POST_OUTPUT_FILE, str(result))
         return result
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
+def run_batch():
+    """
+    Generate posts for every request in a JSONL file with bounded concurrency.
+    Usage: run_batch requests.jsonl [-o results.jsonl] [--checkpoint FILE] [-c N]
+    """
+    from linkedin_post_creator.batch import run_batch_cli
+    sys.exit(run_batch_cli(sys.argv[1:]))
+
+
 def train():
     """
     Train the crew for a given number of iterations.
@@ -73,7 +95,7 @@ def train():
         'current_year': str(datetime.now().year)
     }
     try:
-        LinkedinPostCreator().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        build_crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -83,7 +105,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        LinkedinPostCreator().crew().replay(task_id=sys.argv[1])
+        build_crew().replay(task_id=sys.argv[1])
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
@@ -101,7 +123,7 @@ def test():
     }
     
     try:
-        result = LinkedinPostCreator().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        result = build_crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
         return result
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
@@ -0,0 +1,220 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+# Small in-process metrics primitives shared by the crew helpers and the API.
+# They are intentionally dependency-free so they can be used from worker
+# threads without pulling in a metrics client library.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class Counter:
+    """Monotonic, thread-safe counter"""
+
+    def __init__(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Thread-safe value that can go up and down"""
+
+    def __init__(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """Thread-safe histogram with fixed upper-bound buckets"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time spent inside the ``with`` block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def _quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation
+        if not self._count:
+            return 0.0
+        rank = q * self._count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self._max)
+        return self._max
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self._count
+            return {
+                'count': self._count,
+                'sum': round(self._sum, 6),
+                'avg': round(self._sum / self._count, 6) if self._count else 0.0,
+                'max': round(self._max, 6),
+                'p50': round(self._quantile(0.5), 6),
+                'p95': round(self._quantile(0.95), 6),
+                'p99': round(self._quantile(0.99), 6),
+                'buckets': buckets,
+            }
+
+
+def _label_text(labels: Dict[str, str]) -> str:
+    """Prometheus label set, e.g. ``{task="research_task"}``"""
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in sorted(labels.items())
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """Named collection of metrics; ``counter``/``gauge``/``histogram`` are get-or-create.
+
+    Metrics with ``labels`` are separate series of the same name, registered
+    as ``name{label="value"}``.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, labels: Optional[Dict[str, str]] = None, **kwargs):
+        key = name + _label_text(labels or {})
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, *args, labels=labels, **kwargs)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{key}' is already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+        return self._get_or_create(Counter, name, description, labels=labels)
+
+    def gauge(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labels=labels)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets, labels=labels)
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            return dict(self._metrics)
+
+    def snapshot(self) -> Dict:
+        return {name: metric.snapshot() for name, metric in self.metrics().items()}
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(registry: "MetricsRegistry") -> str:
+    """All metrics of ``registry`` in the Prometheus text exposition format"""
+    families: Dict[str, List[object]] = {}
+    for metric in registry.metrics().values():
+        families.setdefault(re.sub(r"[^a-zA-Z0-9_:]", "_", metric.name), []).append(metric)
+
+    lines = []
+    for name, metrics in sorted(families.items()):
+        kind = {Counter: 'counter', Gauge: 'gauge', Histogram: 'histogram'}[type(metrics[0])]
+        if metrics[0].description:
+            lines.append(f"# HELP {name} {metrics[0].description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for metric in metrics:
+            if kind != 'histogram':
+                lines.append(f"{name}{_label_text(metric.labels)} {_number(metric.value)}")
+                continue
+            snapshot = metric.snapshot()
+            for bound, count in snapshot['buckets'].items():
+                lines.append(f"{name}_bucket{_label_text(dict(metric.labels, le=bound))} {count}")
+            lines.append(f"{name}_sum{_label_text(metric.labels)} {_number(snapshot['sum'])}")
+            lines.append(f"{name}_count{_label_text(metric.labels)} {snapshot['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.crew_pool import CrewPool
+from linkedin_post_creator.research_cache import ResearchCache
+from linkedin_post_creator.validator import validate_post
+
+
+def post_result(output, inputs: Dict[str, Any], stages: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Client-facing result for a finished crew run, with the stage breakdown if one was recorded"""
+    validation = validate_post(str(output)).to_dict()
+    # A skipped critic leaves an empty last task output
+    tasks_output = getattr(output, 'tasks_output', None)
+    validation['reviewed'] = bool(tasks_output and tasks_output[-1].raw)
+    result = {
+        'post': str(output),
+        'topic': inputs['topic'],
+        'industry': inputs['industry'],
+        'tone': inputs['tone'],
+        'audience': inputs['audience'],
+        'word_count': len(str(output).split()),
+        'validation': validation,
+        'generated_at': datetime.now().isoformat()
+    }
+    if stages is not None:
+        result['stages'] = stages
+    return result
+
+
+class PostPipeline:
+    """Runs post generation jobs on pooled crews.
+
+    When a research cache is configured, research for a topic/industry/year
+    that was done recently is reused and the crew starts directly at
+    content_creation_task.
+    """
+
+    def __init__(self, pool: CrewPool, research_cache: Optional[ResearchCache] = None):
+        self.pool = pool
+        self.research_cache = research_cache
+
+    def run(self, inputs: Dict[str, Any], research: Optional[str] = None,
+            checkpoint: Optional[Dict[str, str]] = None):
+        """Generate a post for ``inputs`` and return the crew output.
+
+        ``research`` skips the research step, e.g. when it is shared by
+        variants. ``checkpoint`` maps tasks finished by an earlier attempt to
+        their outputs; the run starts at the first task without one.
+        """
+        # A job may have been cancelled or run out of time while it was queued
+        cancellation.check()
+        checkpoint = checkpoint or {}
+        if research is None:
+            research = checkpoint.get('research_task')
+        if research is None:
+            cached = self.research_cache.get(inputs) if self.research_cache else None
+            research = cached.output if cached is not None else None
+
+        with self.pool.checkout() as pooled:
+            if research is not None:
+                return pooled.kickoff(inputs, research=research, draft=checkpoint.get('content_creation_task'))
+
+            result = pooled.kickoff(inputs)
+            if self.research_cache is not None and result.tasks_output:
+                self.research_cache.put(inputs, result.tasks_output[0].raw, pooled.research_tokens())
+            return result
+
+    def research(self, inputs: Dict[str, Any], refresh: bool = False) -> Tuple[str, bool]:
+        """Research for ``inputs`` on its own, as ``(report, cached)``.
+
+        ``refresh`` runs research_task even if cached research is still fresh.
+        """
+        cancellation.check()
+        cached = self.research_cache.get(inputs) if self.research_cache and not refresh else None
+        if cached is not None:
+            return cached.output, True
+
+        with self.pool.checkout() as pooled:
+            research = pooled.research(inputs)
+            if self.research_cache is not None:
+                self.research_cache.put(inputs, research, pooled.research_tokens())
+        return research, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'research_cache': self.research_cache.stats() if self.research_cache else None,
+        }
@@ -0,0 +1,263 @@
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import CancelledError
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.cancellation import CancelToken, DeadlineExceededError, JobCancelledError
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+from linkedin_post_creator.research_cache import normalize_text
+from linkedin_post_creator.scheduler import QueueFullError, SchedulerShutdownError
+
+# Industry of topics that don't name one, as for requests
+DEFAULT_INDUSTRY = 'Technology'
+
+# Scheduler lanes of live jobs; a prefetch gives way when one of them has a job waiting and workers run short
+LIVE_LANES = ('high', 'normal')
+
+# Most recent completed jobs looked at when learning hot pairs
+LEARN_SCAN_LIMIT = 1000
+
+
+def parse_pairs(value: str) -> List[Tuple[str, str]]:
+    """``topic|industry`` pairs separated by semicolons; the industry defaults to DEFAULT_INDUSTRY"""
+    pairs = []
+    for entry in filter(None, (part.strip() for part in value.split(";"))):
+        topic, _, industry = entry.partition("|")
+        if not topic.strip():
+            raise ValueError(f"PREFETCH_TOPICS entries must look like topic|industry, got {entry!r}")
+        pairs.append((topic.strip(), industry.strip() or DEFAULT_INDUSTRY))
+    return pairs
+
+
+class ResearchPrefetcher:
+    """Background worker that keeps research for hot topic/industry pairs in the research cache.
+
+    Every ``interval`` seconds it collects the configured ``pairs`` and, with
+    ``learn_top``, the pairs completed jobs asked for most often over the last
+    ``learn_window`` seconds. It runs research_task for each pair without
+    cached research, or whose research expires before the round after next.
+    Live jobs for those pairs then start at content_creation_task.
+
+    Prefetches run one at a time on the scheduler's low lane. One is only
+    submitted while ``reserve_workers`` workers would stay free for live
+    jobs. It is cancelled when live jobs are waiting and no more than
+    ``reserve_workers`` workers are spare, so prefetching never delays a
+    request but isn't dropped while there is room for both.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        scheduler,
+        pairs: Iterable[Tuple[str, str]] = (),
+        interval: float = 900.0,
+        job_store=None,
+        learn_top: int = 0,
+        learn_window: float = 24 * 3600,
+        learn_min_jobs: int = 2,
+        reserve_workers: int = 1,
+        idle_poll: float = 5.0,
+        name: str = "prefetch",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.pipeline = pipeline
+        self.scheduler = scheduler
+        self.pairs = list(pairs)
+        self.interval = interval
+        self.job_store = job_store
+        self.learn_top = learn_top
+        self.learn_window = learn_window
+        self.learn_min_jobs = learn_min_jobs
+        self.reserve_workers = reserve_workers
+        self.idle_poll = idle_poll
+        self._learned: List[Tuple[str, str]] = []
+        self._last_run: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._token: Optional[CancelToken] = None
+        self._future = None
+
+        self._runs = registry.counter(f"{name}_runs_total", "research_task runs prefetched in the background")
+        self._fresh = registry.counter(f"{name}_fresh_total", "Prefetch checks that found research still fresh")
+        self._preempted = registry.counter(f"{name}_preempted_total", "Prefetches cancelled to make way for live jobs")
+        self._failed = registry.counter(f"{name}_failed_total", "Prefetches that raised an exception")
+
+    def learned_pairs(self) -> List[Tuple[str, str]]:
+        """The ``learn_top`` topic/industry pairs of the most recent completed jobs, most requested first"""
+        if not self.learn_top or self.job_store is None:
+            return []
+        counts: Counter = Counter()
+        names: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for job in self.job_store.list_jobs(status='completed', newer_than=self.learn_window, limit=LEARN_SCAN_LIMIT):
+            result = job.get('result') or {}
+            if not result.get('topic'):
+                continue
+            pair = (result['topic'], result.get('industry') or DEFAULT_INDUSTRY)
+            key = (normalize_text(pair[0]), normalize_text(pair[1]))
+            counts[key] += 1
+            # Jobs are listed newest first, so each pair is spelled as it was last asked for
+            names.setdefault(key, pair)
+        return [names[key] for key, count in counts.most_common(self.learn_top) if count >= self.learn_min_jobs]
+
+    def hot_pairs(self) -> List[Tuple[str, str]]:
+        """Configured pairs followed by learned ones, without duplicates"""
+        self._learned = self.learned_pairs()
+        pairs, seen = [], set()
+        for topic, industry in self.pairs + self._learned:
+            key = (normalize_text(topic), normalize_text(industry))
+            if key not in seen:
+                seen.add(key)
+                pairs.append((topic, industry))
+        return pairs
+
+    def _due(self, inputs: Dict[str, Any]) -> bool:
+        cache = self.pipeline.research_cache
+        entry = cache.peek(inputs)
+        margin = min(2 * self.interval, cache.ttl_seconds / 2)
+        return entry is None or time.time() - entry.created_at > cache.ttl_seconds - margin
+
+    def _idle(self) -> bool:
+        return (
+            self.scheduler.spare_workers() > self.reserve_workers
+            and not self.scheduler.pending(LIVE_LANES)
+        )
+
+    def _preempt(self) -> bool:
+        """Whether a running prefetch should give its worker to a live job"""
+        return (
+            self.scheduler.pending(LIVE_LANES) > 0
+            and self.scheduler.spare_workers() <= self.reserve_workers
+        )
+
+    def _wait_until_idle(self) -> bool:
+        """Wait until a prefetch wouldn't compete with live jobs; False if stopped first"""
+        while not self._stop.is_set():
+            if self._idle():
+                return True
+            self._stop.wait(self.idle_poll)
+        return False
+
+    def _run(self, inputs: Dict[str, Any], token: CancelToken) -> bool:
+        with cancellation.bind(token):
+            # Another worker process may have refreshed it while this one was queued
+            if not self._due(inputs):
+                self._fresh.inc()
+                return False
+            self.pipeline.research(inputs, refresh=True)
+            self._runs.inc()
+            return True
+
+    def _prefetch(self, inputs: Dict[str, Any]) -> bool:
+        seconds = cancellation.default_deadline_seconds()
+        token = CancelToken(
+            deadline=time.monotonic() + seconds if seconds is not None else None,
+            poll=self._preempt,
+        )
+        with self._lock:
+            self._token = token
+        try:
+            future = self.scheduler.submit(self._run, inputs, token, priority='low')
+            with self._lock:
+                self._future = future
+            return future.result()
+        except SchedulerShutdownError:
+            self._stop.set()
+        except (QueueFullError, CancelledError):
+            pass
+        except DeadlineExceededError as e:
+            self._failed.inc()
+            print(f"Research prefetch for {inputs['topic']!r} failed: {e}")
+        except JobCancelledError:
+            if not self._stop.is_set():
+                self._preempted.inc()
+        except Exception as e:
+            self._failed.inc()
+            print(f"Research prefetch for {inputs['topic']!r} failed: {e}")
+        finally:
+            with self._lock:
+                self._token = self._future = None
+        return False
+
+    def run_once(self) -> int:
+        """Prefetch research that is missing or about to expire, returning how many research_task runs it took"""
+        self._last_run = time.time()
+        ran = 0
+        for topic, industry in self.hot_pairs():
+            inputs = {'topic': topic, 'industry': industry, 'current_year': str(datetime.now().year)}
+            if not self._due(inputs):
+                self._fresh.inc()
+                continue
+            if not self._wait_until_idle():
+                break
+            ran += self._prefetch(inputs)
+        return ran
+
+    def _loop(self) -> None:
+        # Worker processes start together; spread their first rounds out
+        delay = random.uniform(0, min(self.interval, 30.0))
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Research prefetch round failed: {e}")
+            delay = self.interval
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="research-prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop prefetching, cancelling a prefetch that is queued or running"""
+        self._stop.set()
+        with self._lock:
+            token, future = self._token, self._future
+        if future is not None:
+            self.scheduler.cancel(future)
+        if token is not None:
+            token.cancel("Server shutting down")
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pairs': [list(pair) for pair in self.pairs],
+            'learned': [list(pair) for pair in self._learned],
+            'interval': self.interval,
+            'reserve_workers': self.reserve_workers,
+            'last_run': self._last_run,
+            'runs': self._runs.value,
+            'fresh': self._fresh.value,
+            'preempted': self._preempted.value,
+            'failed': self._failed.value,
+        }
+
+
+def create_research_prefetcher(pipeline, scheduler, job_store=None) -> Optional[ResearchPrefetcher]:
+    """Build the research prefetcher from environment settings.
+
+    None unless PREFETCH_TOPICS or PREFETCH_LEARN_TOP gives it pairs to
+    prefetch, or when there is no research cache to fill.
+    """
+    pairs = parse_pairs(os.environ.get('PREFETCH_TOPICS', ''))
+    learn_top = int(os.environ.get('PREFETCH_LEARN_TOP', 0))
+    if (not pairs and learn_top <= 0) or pipeline.research_cache is None:
+        return None
+    return ResearchPrefetcher(
+        pipeline,
+        scheduler,
+        pairs=pairs,
+        interval=float(os.environ.get('PREFETCH_INTERVAL', 900)),
+        job_store=job_store,
+        learn_top=learn_top,
+        learn_window=float(os.environ.get('PREFETCH_LEARN_WINDOW', 24 * 3600)),
+        learn_min_jobs=int(os.environ.get('PREFETCH_LEARN_MIN_JOBS', 2)),
+        reserve_workers=int(os.environ.get('PREFETCH_RESERVE_WORKERS', 1)),
+    )
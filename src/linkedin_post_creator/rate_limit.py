@@ -0,0 +1,345 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+T = TypeVar('T')
+
+# Pause applied to a provider's bucket after a 429 without a Retry-After header
+DEFAULT_THROTTLE_BACKOFF = 2.0
+# Longest Retry-After honoured; providers occasionally send minutes
+MAX_THROTTLE_BACKOFF = 60.0
+# Seconds between cancellation checks of a call waiting for a concurrency slot
+ACQUIRE_POLL_INTERVAL = 0.5
+
+
+def throttle_delay(error: BaseException) -> Optional[float]:
+    """Seconds to back off if ``error`` means the provider throttled us (HTTP 429), else None.
+
+    Understands requests and httpx HTTP errors and litellm's RateLimitError,
+    using the Retry-After header when there is one.
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if status != 429 and 'RateLimit' not in type(error).__name__:
+        return None
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        retry_after = float(headers.get('Retry-After') or headers.get('retry-after') or 0)
+    except (TypeError, ValueError):
+        retry_after = 0
+    return min(retry_after, MAX_THROTTLE_BACKOFF) if retry_after > 0 else DEFAULT_THROTTLE_BACKOFF
+
+
+def _refill(tokens: float, at: float, now: float, rate: float, burst: float) -> Tuple[float, float]:
+    # ``at`` is when ``tokens`` was last brought up to date; it is in the future while the bucket is paused
+    if now > at:
+        tokens = min(burst, tokens + (now - at) * rate)
+        at = now
+    return tokens, at
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations: callers take a token and sleep for the returned wait.
+
+    Tokens may go negative, so concurrent callers queue up behind each other
+    at ``rate`` per second instead of all retrying at once. ``pause`` stops
+    the refill for a while, e.g. after the provider answered 429.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._at = time.time()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        return False
+
+    def _update(self, change: Callable[[float, float, float], Tuple[float, float, float]]) -> float:
+        """Apply ``change(tokens, at, now) -> (tokens, at, result)`` atomically and return result"""
+        with self._lock:
+            self._tokens, self._at, result = change(self._tokens, self._at, time.time())
+        return result
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take ``tokens`` and return the seconds to wait before using them"""
+        def change(current, at, now):
+            current, at = _refill(current, at, now, self.rate, self.burst)
+            current -= tokens
+            return current, at, max(at - now, 0.0) + max(-current, 0.0) / self.rate
+        return self._update(change)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no new tokens for ``seconds`` (calls already waiting keep their turn)"""
+        def change(current, at, now):
+            current, at = _refill(current, at, now, self.rate, self.burst)
+            return min(current, 0.0), max(at, now + seconds), None
+        self._update(change)
+
+
+class SharedTokenBucket(TokenBucket):
+    """TokenBucket kept in a SQLite file so every process on the host shares one budget"""
+
+    def __init__(self, rate: float, burst: float, path: str, name: str):
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, at REAL NOT NULL)"
+        )
+
+    @property
+    def shared(self) -> bool:
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, change):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, at FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            now = time.time()
+            tokens, at = row if row is not None else (float(self.burst), now)
+            tokens, at, result = change(tokens, at, now)
+            conn.execute(
+                "INSERT INTO buckets (name, tokens, at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, at = excluded.at",
+                (self.name, tokens, at),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent calls: +1 per limit's worth of successes, halved on throttling.
+
+    Only one decrease happens per round of calls: a throttled call that
+    started before the last decrease doesn't cut the limit again.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: Optional[int] = None,
+                 increase: float = 1.0, decrease: float = 0.5):
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(max_limit if initial is None else min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, math.floor(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Wait for a free slot; returns a token for ``release``, or None on timeout"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < self.limit, timeout):
+                return None
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, token: int, throttled: bool = False) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                if token == self._epoch:
+                    self._epoch += 1
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease)
+            else:
+                self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+            self._condition.notify_all()
+
+
+class ProviderLimiter:
+    """Rate and concurrency limits for the calls to one provider.
+
+    Each call waits for an AIMD concurrency slot and a token from the
+    provider's bucket. A throttled call (HTTP 429) pauses the bucket for the
+    Retry-After time, lowers the concurrency limit and is retried up to
+    ``max_retries`` times, so bursts of 429s turn into paced retries instead
+    of an error storm.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bucket: Optional[TokenBucket],
+        concurrency: AdaptiveConcurrency,
+        max_retries: int = 2,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.name = name
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        labels = {'provider': name}
+        self._wait = registry.histogram(
+            "rate_limit_wait_seconds", "Time calls waited for a rate or concurrency slot", labels=labels
+        )
+        self._delayed = registry.counter("rate_limit_delayed_total", "Calls that had to wait for a slot", labels=labels)
+        self._calls = registry.counter("rate_limit_calls_total", "Calls made through the rate limiter", labels=labels)
+        self._throttled = registry.counter("rate_limit_throttled_total", "Calls the provider throttled (HTTP 429)", labels=labels)
+        self._retries = registry.counter("rate_limit_retries_total", "Throttled calls retried", labels=labels)
+        self._limit_gauge = registry.gauge("rate_limit_concurrency", "Current adaptive concurrency limit", labels=labels)
+        self._limit_gauge.set(concurrency.limit)
+
+    def _waited(self, start: float) -> None:
+        waited = time.perf_counter() - start
+        self._wait.observe(waited)
+        if waited >= 0.001:
+            self._delayed.inc()
+
+    def _finish(self, token: int, error: Optional[BaseException]) -> Optional[float]:
+        """Release the slot; returns the back-off if the call was throttled"""
+        delay = throttle_delay(error) if error is not None else None
+        if delay is not None:
+            self._throttled.inc()
+            if self.bucket is not None:
+                self.bucket.pause(delay)
+        self.concurrency.release(token, throttled=delay is not None)
+        self._limit_gauge.set(self.concurrency.limit)
+        return delay
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a rate and concurrency slot for one call"""
+        start = time.perf_counter()
+        token = None
+        while token is None:
+            # Give up waiting as soon as the job is cancelled
+            cancellation.check()
+            token = self.concurrency.acquire(timeout=ACQUIRE_POLL_INTERVAL)
+        try:
+            wait = self.bucket.reserve() if self.bucket is not None else 0.0
+            if wait > 0:
+                cancellation.wait(wait)
+            self._waited(start)
+            self._calls.inc()
+            # The job may have been cancelled while the call waited for its slot
+            cancellation.check()
+            yield
+        except BaseException as e:
+            self._finish(token, e)
+            raise
+        self._finish(token, None)
+
+    def call(self, fn: Callable[..., T], *args,
+             retry: Optional[Callable[[], bool]] = None, **kwargs) -> T:
+        """Run ``fn`` in a slot, retrying it when the provider throttles it.
+
+        ``retry`` is asked before each retry and can veto it, e.g. once a
+        streamed call has already sent part of its output.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot():
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or throttle_delay(e) is None:
+                    raise
+                if retry is not None and not retry():
+                    raise
+                self._retries.inc()
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rate_per_minute': round(self.bucket.rate * 60, 3) if self.bucket is not None else None,
+            'burst': self.bucket.burst if self.bucket is not None else None,
+            'shared': self.bucket.shared if self.bucket is not None else False,
+            'concurrency_limit': self.concurrency.limit,
+            'max_concurrency': self.concurrency.max_limit,
+            'in_flight': self.concurrency.in_flight,
+            'calls': self._calls.value,
+            'delayed': self._delayed.value,
+            'throttled': self._throttled.value,
+            'retries': self._retries.value,
+            'wait_seconds': self._wait.snapshot(),
+        }
+
+
+# Defaults per provider: (requests per minute, burst, max concurrency)
+PROVIDER_DEFAULTS = {
+    'gemini': (150, 10, 16),
+    'serper': (300, 20, 16),
+}
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def create_limiter(provider: str) -> Optional[ProviderLimiter]:
+    """Build a provider's limiter from environment settings (None when rate limiting is off).
+
+    ``<PROVIDER>_RPM``, ``<PROVIDER>_BURST`` and ``<PROVIDER>_MAX_CONCURRENCY``
+    override the defaults; an RPM of 0 leaves only the concurrency limit.
+    Buckets live in RATE_LIMIT_DB, shared by every process on the host, or
+    in memory when it is empty.
+    """
+    if os.environ.get('RATE_LIMIT', 'true').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    prefix = provider.upper()
+    rpm, burst, max_concurrency = PROVIDER_DEFAULTS.get(provider, (0, 1, 16))
+    rpm = float(os.environ.get(f'{prefix}_RPM', rpm))
+    burst = float(os.environ.get(f'{prefix}_BURST', burst))
+    max_concurrency = int(os.environ.get(f'{prefix}_MAX_CONCURRENCY', max_concurrency))
+
+    bucket = None
+    if rpm > 0:
+        path = os.environ.get('RATE_LIMIT_DB', '.cache/rate_limits.db')
+        bucket = SharedTokenBucket(rpm / 60, burst, path, provider) if path else TokenBucket(rpm / 60, burst)
+    return ProviderLimiter(
+        provider,
+        bucket,
+        AdaptiveConcurrency(max_concurrency),
+        max_retries=int(os.environ.get('RATE_LIMIT_RETRIES', 2)),
+    )
+
+
+def provider_limiter(provider: str) -> Optional[ProviderLimiter]:
+    """Process-wide limiter for ``provider``, shared by every crew and tool"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = create_limiter(provider)
+        return _limiters[provider]
+
+
+def rate_limit_stats() -> Dict[str, Any]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items() if limiter is not None}
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Only these inputs influence research_task; tone and audience do not
+RESEARCH_KEY_FIELDS = ('topic', 'industry', 'current_year')
+
+
+def normalize_text(value: Any) -> str:
+    """Case-fold and collapse whitespace so trivially different inputs share a key"""
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+
+def research_key(inputs: Dict[str, Any]) -> str:
+    """Content address for the research of a topic/industry/year"""
+    normalized = {field: normalize_text(inputs.get(field)) for field in RESEARCH_KEY_FIELDS}
+    payload = json.dumps(normalized, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResearchEntry:
+    """A cached research_task output"""
+
+    __slots__ = ('key', 'output', 'tokens', 'created_at', 'inputs')
+
+    def __init__(self, key: str, output: str, tokens: int = 0, created_at: Optional[float] = None, inputs=None):
+        self.key = key
+        self.output = output
+        self.tokens = tokens
+        self.created_at = time.time() if created_at is None else created_at
+        self.inputs = inputs or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'output': self.output,
+            'tokens': self.tokens,
+            'created_at': self.created_at,
+            'inputs': self.inputs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResearchEntry":
+        return cls(data['key'], data['output'], data.get('tokens', 0), data['created_at'], data.get('inputs'))
+
+
+class ResearchCache:
+    """Two-tier (memory LRU + disk) cache for research_task output.
+
+    Entries are keyed on the normalized topic, industry and year and are
+    served while younger than ``ttl_seconds``. The disk tier lets results
+    survive restarts and be shared by processes on the same host.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = ".cache/research",
+        max_entries: int = 256,
+        ttl_seconds: float = 6 * 3600,
+        name: str = "research_cache",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, ResearchEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self._memory_hits = registry.counter(f"{name}_memory_hits_total", "Research served from memory")
+        self._disk_hits = registry.counter(f"{name}_disk_hits_total", "Research served from disk")
+        self._misses = registry.counter(f"{name}_misses_total", "Research lookups that ran research_task")
+        self._stores = registry.counter(f"{name}_stores_total", "Research results written to the cache")
+        self._tokens_saved = registry.counter(f"{name}_tokens_saved_total", "LLM tokens not spent thanks to hits")
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _fresh(self, entry: ResearchEntry, now: float) -> bool:
+        return now - entry.created_at <= self.ttl_seconds
+
+    def _remember(self, entry: ResearchEntry) -> None:
+        with self._lock:
+            self._memory[entry.key] = entry
+            self._memory.move_to_end(entry.key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[ResearchEntry]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return ResearchEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, entry: ResearchEntry) -> None:
+        if not self.directory:
+            return
+        path = self._path(entry.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, inputs: Dict[str, Any]) -> Optional[ResearchEntry]:
+        """Return fresh cached research for these inputs, or None"""
+        key = research_key(inputs)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry, now):
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+
+        if entry is not None:
+            self._memory_hits.inc()
+        else:
+            entry = self._read_disk(key)
+            if entry is None or not self._fresh(entry, now):
+                self._misses.inc()
+                return None
+            self._disk_hits.inc()
+            self._remember(entry)
+
+        self._tokens_saved.inc(entry.tokens)
+        return entry
+
+    def peek(self, inputs: Dict[str, Any]) -> Optional[ResearchEntry]:
+        """Fresh cached research for these inputs without counting a hit or miss, for prefetching"""
+        key = research_key(inputs)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            entry = self._read_disk(key)
+        return entry if entry is not None and self._fresh(entry, time.time()) else None
+
+    def put(self, inputs: Dict[str, Any], output: str, tokens: int = 0) -> ResearchEntry:
+        """Store research_task output for these inputs"""
+        key = research_key(inputs)
+        entry = ResearchEntry(
+            key,
+            output,
+            tokens,
+            inputs={field: inputs.get(field) for field in RESEARCH_KEY_FIELDS}
+        )
+        self._remember(entry)
+        try:
+            self._write_disk(entry)
+        except OSError as e:
+            print(f"Failed to persist research cache entry: {e}")
+        self._stores.inc()
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= 100:
+            self._writes_since_prune = 0
+            self.prune()
+        return entry
+
+    def prune(self) -> int:
+        """Delete expired entries from the disk tier"""
+        if not self.directory:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for root, _, files in os.walk(self.directory):
+                for filename in files:
+                    try:
+                        os.remove(os.path.join(root, filename))
+                    except OSError:
+                        continue
+
+    def stats(self) -> Dict[str, Any]:
+        memory_hits = self._memory_hits.value
+        disk_hits = self._disk_hits.value
+        misses = self._misses.value
+        lookups = memory_hits + disk_hits + misses
+        with self._lock:
+            size = len(self._memory)
+        return {
+            'memory_entries': size,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'memory_hits': memory_hits,
+            'disk_hits': disk_hits,
+            'misses': misses,
+            'hit_rate': round((memory_hits + disk_hits) / lookups, 4) if lookups else 0.0,
+            'stores': self._stores.value,
+            'tokens_saved': self._tokens_saved.value,
+        }
+
+
+def create_research_cache() -> Optional[ResearchCache]:
+    """Build the research cache from environment settings, or None if disabled"""
+    if os.environ.get('RESEARCH_CACHE', 'true').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return ResearchCache(
+        directory=os.environ.get('RESEARCH_CACHE_DIR', '.cache/research'),
+        max_entries=int(os.environ.get('RESEARCH_CACHE_SIZE', 256)),
+        ttl_seconds=float(os.environ.get('RESEARCH_CACHE_TTL', 6 * 3600)),
+    )
@@ -0,0 +1,248 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from linkedin_post_creator.metrics import REGISTRY, MetricsRegistry
+
+# Lanes are served strictly in this order; FIFO within a lane
+PRIORITIES = ('high', 'normal', 'low')
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler cannot admit more work"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SchedulerShutdownError(Exception):
+    """Raised when submitting to a scheduler that is shutting down"""
+
+
+class _WorkItem:
+    __slots__ = ('fn', 'args', 'kwargs', 'future', 'priority', 'enqueued_at')
+
+    def __init__(self, fn, args, kwargs, priority):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.priority = priority
+        self.enqueued_at = time.perf_counter()
+
+
+class JobScheduler:
+    """Fixed-size worker pool with a bounded, prioritised queue.
+
+    Crew runs are long and make many outbound Gemini/Serper calls, so the
+    number running at once is capped at ``workers``. Up to ``max_queue``
+    more may wait; beyond that ``submit`` raises QueueFullError with a
+    Retry-After estimate instead of accepting unbounded work. The ``low``
+    lane may only use ``low_priority_share`` of the queue so background work
+    cannot crowd out live requests.
+
+    Worker threads are started on demand, so queued jobs and an idle
+    scheduler hold no threads beyond those that have been needed so far.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 100,
+        low_priority_share: float = 0.5,
+        name: str = "scheduler",
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.workers = workers
+        self.max_queue = max_queue
+        self.low_priority_limit = max(1, int(max_queue * low_priority_share))
+        self.name = name
+
+        self._lanes = {priority: deque() for priority in PRIORITIES}
+        self._depth = 0
+        self._running = 0
+        self._idle = 0
+        self._condition = threading.Condition()
+        self._threads = []
+        self._shutdown = False
+
+        self._queue_depth = registry.gauge(f"{name}_queue_depth", "Jobs waiting for a worker")
+        self._active = registry.gauge(f"{name}_running", "Jobs currently executing")
+        self._submitted = registry.counter(f"{name}_submitted_total", "Jobs admitted to the queue")
+        self._rejected = registry.counter(f"{name}_rejected_total", "Jobs rejected because the queue was full")
+        self._failed = registry.counter(f"{name}_failed_total", "Jobs that raised an exception")
+        self._cancelled = registry.counter(f"{name}_cancelled_total", "Queued jobs removed before they ran")
+        self._wait_time = registry.histogram(f"{name}_wait_seconds", "Time jobs spent queued")
+        self._run_time = registry.histogram(f"{name}_run_seconds", "Time jobs spent executing")
+
+    def _spawn_worker(self) -> None:
+        # Caller holds the condition
+        thread = threading.Thread(target=self._worker, name=f"{self.name}-worker-{len(self._threads)}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def start(self) -> None:
+        """Start every worker now instead of on demand"""
+        with self._condition:
+            while len(self._threads) < self.workers and not self._shutdown:
+                self._spawn_worker()
+
+    def _lane_is_full(self, priority: str) -> bool:
+        if self._depth >= self.max_queue:
+            return True
+        return priority == 'low' and len(self._lanes['low']) >= self.low_priority_limit
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying"""
+        avg_run = self._run_time.snapshot()['avg'] or 30.0
+        return max(1, math.ceil((self._depth / self.workers) * avg_run))
+
+    def submit(self, fn: Callable, *args, priority: str = 'normal', **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` and return a Future for its result"""
+        if priority not in self._lanes:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {PRIORITIES}")
+
+        item = _WorkItem(fn, args, kwargs, priority)
+        with self._condition:
+            if self._shutdown:
+                raise SchedulerShutdownError("Scheduler is shutting down")
+            if self._lane_is_full(priority):
+                self._rejected.inc()
+                raise QueueFullError(f"{priority} queue is full", self.retry_after())
+            self._lanes[priority].append(item)
+            self._depth += 1
+            self._queue_depth.set(self._depth)
+            if self._depth > self._idle and len(self._threads) < self.workers:
+                self._spawn_worker()
+            self._condition.notify()
+
+        self._submitted.inc()
+        return item.future
+
+    def cancel(self, future: Future) -> bool:
+        """Remove a job that is still queued, freeing its queue slot; returns whether it was removed"""
+        with self._condition:
+            for lane in self._lanes.values():
+                for item in lane:
+                    if item.future is future:
+                        lane.remove(item)
+                        self._depth -= 1
+                        self._queue_depth.set(self._depth)
+                        self._cancelled.inc()
+                        return future.cancel()
+        return False
+
+    def pending(self, priorities: Iterable[str] = PRIORITIES) -> int:
+        """Jobs waiting in the given lanes"""
+        with self._condition:
+            return sum(len(self._lanes[priority]) for priority in priorities)
+
+    def spare_workers(self) -> int:
+        """Workers neither running a job nor about to pick up a queued one"""
+        with self._condition:
+            return max(self.workers - self._running - self._depth, 0)
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        with self._condition:
+            while not self._depth and not self._shutdown:
+                self._idle += 1
+                self._condition.wait()
+                self._idle -= 1
+            if not self._depth:
+                return None
+            for priority in PRIORITIES:
+                if self._lanes[priority]:
+                    item = self._lanes[priority].popleft()
+                    break
+            self._depth -= 1
+            self._running += 1
+            self._queue_depth.set(self._depth)
+            self._active.set(self._running)
+            return item
+
+    def _worker(self) -> None:
+        while True:
+            item = self._next_item()
+            if item is None:
+                return
+            try:
+                # Skip work whose future was cancelled while it was queued
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+                self._wait_time.observe(time.perf_counter() - item.enqueued_at)
+                start = time.perf_counter()
+                try:
+                    result = item.fn(*item.args, **item.kwargs)
+                except BaseException as e:
+                    self._failed.inc()
+                    item.future.set_exception(e)
+                else:
+                    item.future.set_result(result)
+                finally:
+                    self._run_time.observe(time.perf_counter() - start)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._active.set(self._running)
+                    self._condition.notify_all()
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop accepting work; optionally cancel queued jobs and wait for workers"""
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                for lane in self._lanes.values():
+                    while lane:
+                        lane.popleft().future.cancel()
+                self._depth = 0
+                self._queue_depth.set(0)
+            self._condition.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting work and wait up to ``timeout`` seconds for queued and running jobs.
+
+        Returns whether everything finished; jobs still queued afterwards are
+        left for ``shutdown(cancel_pending=True)``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            while self._depth or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            lanes = {priority: len(lane) for priority, lane in self._lanes.items()}
+            depth = self._depth
+            running = self._running
+        return {
+            'workers': self.workers,
+            'threads': len(self._threads),
+            'max_queue': self.max_queue,
+            'queue_depth': depth,
+            'lanes': lanes,
+            'running': running,
+            'submitted': self._submitted.value,
+            'rejected': self._rejected.value,
+            'failed': self._failed.value,
+            'cancelled': self._cancelled.value,
+            'wait_seconds': self._wait_time.snapshot(),
+            'run_seconds': self._run_time.snapshot(),
+        }
@@ -0,0 +1,159 @@
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# The agent stack, in import order; loading it is most of a cold start
+HEAVY_MODULES = (
+    'crewai',
+    'crewai_tools',
+    'linkedin_post_creator.tools.custom_tool',
+    'linkedin_post_creator.crew',
+)
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class StartupProfile:
+    """Timings of the phases of a process start (app import, warm-up steps).
+
+    ``warm_up`` imports the heavy modules and runs the given steps once, off
+    the request path, and records how long each took so ``/api/stats`` can
+    show where a cold start goes.
+    """
+
+    def __init__(self):
+        self._phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._warm = threading.Event()
+        self._warming = False
+        self._error: Optional[str] = None
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self._phases[phase] = round(seconds, 4)
+
+    def timed(self, phase: str, fn: Callable, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    @property
+    def warm(self) -> bool:
+        return self._warm.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up has finished"""
+        return self._warm.wait(timeout)
+
+    def warm_up(self, modules: Iterable[str] = HEAVY_MODULES, steps: Iterable[tuple] = ()) -> bool:
+        """Import ``modules`` and run ``(name, fn)`` steps, timing each; only the first call does work.
+
+        Returns whether this call performed the warm-up. A failing step is
+        reported in ``stats`` and leaves the rest to happen lazily on first use.
+        """
+        with self._lock:
+            if self._warming:
+                return False
+            self._warming = True
+
+        start = time.perf_counter()
+        try:
+            for module in modules:
+                if module not in sys.modules:
+                    self.timed(f"import {module}", importlib.import_module, module)
+            for name, fn in steps:
+                self.timed(name, fn)
+        except Exception as e:
+            self._error = f"{type(e).__name__}: {e}"
+            print(f"Warm-up failed: {self._error}")
+        finally:
+            self.record('warm_up', time.perf_counter() - start)
+            self._warm.set()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = dict(self._phases)
+        return {'warm': self.warm, 'error': self._error, 'seconds': phases}
+
+
+# Process-wide profile used by the API and CLI
+PROFILE = StartupProfile()
+
+
+def loaded(module: str) -> bool:
+    """Whether ``module`` has been imported, i.e. using it costs no import time"""
+    return module in sys.modules
+
+
+def import_breakdown(module: str, top: int = 15) -> Dict[str, Any]:
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and summarise where the time went"""
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.getcwd(), os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    by_package: Dict[str, int] = {}
+    modules: List[tuple] = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        package = name.split('.')[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+        modules.append((name, cumulative_us, len(indent) // 2))
+
+    total_us = sum(by_package.values())
+    return {
+        'module': module,
+        'wall_seconds': round(wall, 3),
+        'import_seconds': round(total_us / 1e6, 3),
+        'modules_imported': len(modules),
+        'by_package': [
+            {'package': package, 'seconds': round(us / 1e6, 3), 'share': round(us / total_us, 3) if total_us else 0.0}
+            for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        ],
+        'slowest': [
+            {'module': name, 'cumulative_seconds': round(us / 1e6, 3), 'depth': depth}
+            for name, us, depth in sorted(modules, key=lambda item: -item[1])[:top]
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print an import-time breakdown for each module given on the command line"""
+    parser = argparse.ArgumentParser(prog="startup_profile", description="Show where import time goes on a cold start.")
+    parser.add_argument('modules', nargs='*', default=['api.app', 'linkedin_post_creator.crew'])
+    parser.add_argument('--top', type=int, default=15, help='Packages and modules to list')
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        report = import_breakdown(module, args.top)
+        print(f"\n{module}: {report['import_seconds']:.3f}s importing {report['modules_imported']} modules "
+              f"({report['wall_seconds']:.3f}s wall)")
+        print("  By package (self time):")
+        for row in report['by_package']:
+            print(f"    {row['seconds']:8.3f}s  {row['share']:6.1%}  {row['package']}")
+        print("  Slowest imports (cumulative):")
+        for row in report['slowest']:
+            print(f"    {row['cumulative_seconds']:8.3f}s  {'  ' * row['depth']}{row['module']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
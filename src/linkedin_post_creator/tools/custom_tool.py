@@ -1,6 +1,25 @@
 from crewai.tools import BaseTool
-from typing import Type
+from crewai_tools import SerperDevTool
+from typing import Any, ClassVar, Dict, Type
 from pydantic import BaseModel, Field
+from collections import deque
+from concurrent.futures import Future, wait as wait_futures
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.cancellation import JobCancelledError
+from linkedin_post_creator.metrics import REGISTRY
+from linkedin_post_creator.rate_limit import provider_limiter
+from linkedin_post_creator.validator import fix_post, validate_post
 
 
 class MyCustomToolInput(BaseModel):
@@ -17,3 +36,249 @@ class MyCustomTool(BaseTool):
     def _run(self, argument: str) -> str:
         # Implementation goes here
         return "this is an example of a tool output, ignore it and move along."
+
+
+class PostValidatorInput(BaseModel):
+    """Input schema for PostValidatorTool."""
+    post: str = Field(..., description="The full text of the LinkedIn post to check.")
+
+
+class PostValidatorTool(BaseTool):
+    name: str = "LinkedIn Post Validator"
+    description: str = (
+        "Checks a LinkedIn post against the hard rules (under 200 words, headline under 30 characters, "
+        "3-5 hashtags, 2-4 emojis), applies the safe automatic fixes and returns the fixed post with "
+        "any violations that are left. Use it on your edited post before giving the final answer."
+    )
+    args_schema: Type[BaseModel] = PostValidatorInput
+
+    def _run(self, post: str) -> str:
+        report = validate_post(post)
+        if not report.ok:
+            report = fix_post(post)
+        lines = [f"Words: {report.words}, headline characters: {len(report.headline)}, "
+                 f"hashtags: {len(report.hashtags)}, emojis: {report.emojis}"]
+        if report.fixes:
+            lines.append("Fixes applied:\n" + "\n".join(f"- {fix}" for fix in report.fixes))
+        lines.append("Violations:\n" + report.describe() if not report.ok else report.describe())
+        lines.append(f"Post:\n{report.text}")
+        return "\n\n".join(lines)
+
+
+# Seconds between cancellation checks of a search waiting on the same search of another job
+FOLLOWER_POLL_INTERVAL = 0.5
+
+# Words that don't change what a search engine returns for our queries
+_QUERY_STOPWORDS = {'a', 'an', 'the', 'of', 'in', 'on', 'for', 'and', 'to', 'about', 'with'}
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query used for caching and de-duplication.
+
+    Case, punctuation, filler words and word order are ignored, so
+    "Latest AI trends 2025" and "ai trends, latest 2025" share a cache entry.
+    """
+    tokens = re.findall(r"[\w#+.]+", (query or "").lower())
+    tokens = {token.strip('.') for token in tokens} - _QUERY_STOPWORDS
+    return " ".join(sorted(token for token in tokens if token))
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool with a TTL disk cache, in-flight de-duplication and a pooled HTTP session.
+
+    Cache, in-flight calls and the HTTP session are shared by every instance in
+    the process, so pooled crews running in parallel benefit from each other's
+    searches.
+    """
+
+    cache_dir: str = Field(default_factory=lambda: os.environ.get('SEARCH_CACHE_DIR', '.cache/search'))
+    cache_ttl: float = Field(default_factory=lambda: float(os.environ.get('SEARCH_CACHE_TTL', 6 * 3600)))
+
+    _session: ClassVar[requests.Session] = None
+    _session_lock: ClassVar[threading.Lock] = threading.Lock()
+    _inflight: ClassVar[Dict[str, Future]] = {}
+    _inflight_lock: ClassVar[threading.Lock] = threading.Lock()
+    _recent: ClassVar[deque] = deque(maxlen=50)
+
+    _hits: ClassVar = REGISTRY.counter("search_cache_hits_total", "Searches served from the disk cache")
+    _misses: ClassVar = REGISTRY.counter("search_cache_misses_total", "Searches sent to Serper")
+    _coalesced: ClassVar = REGISTRY.counter("search_coalesced_total", "Searches that joined an identical in-flight call")
+    _errors: ClassVar = REGISTRY.counter("search_errors_total", "Serper requests that failed")
+    _request_latency: ClassVar = REGISTRY.histogram("search_request_seconds", "Serper HTTP request latency")
+    _query_latency: ClassVar = REGISTRY.histogram("search_query_seconds", "Search latency including cache hits")
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Process-wide keep-alive session so searches reuse TLS connections"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    cls._session = session
+        return cls._session
+
+    def _cache_key(self, search_query: str, search_type: str) -> str:
+        payload = json.dumps({
+            'q': normalize_query(search_query),
+            'type': search_type.lower(),
+            'num': self.n_results,
+            'gl': self.country,
+            'location': self.location,
+            'hl': self.locale,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_cache(self, key: str):
+        try:
+            path = self._cache_path(key)
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, key: str, results: dict) -> None:
+        path = self._cache_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(results, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write search cache entry: {e}")
+
+    def _payload(self, search_query: str) -> dict:
+        payload = {"q": search_query, "num": self.n_results}
+        if self.country != "":
+            payload["gl"] = self.country
+        if self.location != "":
+            payload["location"] = self.location
+        if self.locale != "":
+            payload["hl"] = self.locale
+        return payload
+
+    @staticmethod
+    def _headers() -> dict:
+        return {
+            "X-API-KEY": os.environ["SERPER_API_KEY"],
+            "content-type": "application/json",
+        }
+
+    def _request(self, search_query: str, search_type: str) -> dict:
+        """Serper request paced by the shared Serper rate limiter"""
+        cancellation.check()
+        limiter = provider_limiter('serper')
+        if limiter is None:
+            return self._send(search_query, search_type)
+        return limiter.call(self._send, search_query, search_type)
+
+    def _send(self, search_query: str, search_type: str) -> dict:
+        """Same request as SerperDevTool._make_api_request, over the shared session"""
+        payload = self._payload(search_query)
+        headers = self._headers()
+        start = time.perf_counter()
+        try:
+            response = self.session().post(
+                self._get_search_url(search_type), headers=headers, json=payload,
+                timeout=cancellation.timeout(10),
+            )
+            response.raise_for_status()
+            results = response.json()
+        except Exception:
+            self._errors.inc()
+            raise
+        finally:
+            self._request_latency.observe(time.perf_counter() - start)
+
+        if not results:
+            self._errors.inc()
+            raise ValueError("Empty response from Serper API")
+        return results
+
+    def _record(self, search_query: str, search_type: str, source: str, elapsed: float) -> None:
+        self._query_latency.observe(elapsed)
+        self._recent.append({
+            'query': search_query,
+            'type': search_type,
+            'source': source,
+            'seconds': round(elapsed, 4),
+        })
+
+    def _finish(self, key: str, future: Future, results: Any = None, exception: BaseException = None) -> None:
+        # Unregistered first, so followers retrying after a cancelled leader start a new request
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if exception is None:
+            future.set_result(results)
+        else:
+            future.set_exception(exception)
+
+    @staticmethod
+    def _wait(future: Future) -> None:
+        """Wait for the leader's request, giving up as soon as this job is cancelled"""
+        while not future.done():
+            cancellation.check()
+            wait_futures([future], timeout=FOLLOWER_POLL_INTERVAL)
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        start = time.perf_counter()
+        key = self._cache_key(search_query, search_type)
+        source = "cache"
+
+        results = self._read_cache(key)
+        if results is not None:
+            self._hits.inc()
+        while results is None:
+            with self._inflight_lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._inflight[key] = future
+
+            if leader:
+                source = "serper"
+                self._misses.inc()
+                try:
+                    results = self._request(search_query, search_type)
+                    self._write_cache(key, results)
+                except BaseException as e:
+                    self._finish(key, future, exception=e)
+                    raise
+                self._finish(key, future, results=results)
+            else:
+                source = "coalesced"
+                self._coalesced.inc()
+                self._wait(future)
+                try:
+                    results = future.result()
+                except JobCancelledError:
+                    # The leader's job was stopped, not the search; the first
+                    # follower to get here asks Serper itself
+                    continue
+
+        self._record(search_query, search_type, source, time.perf_counter() - start)
+        return results
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        hits = cls._hits.value
+        lookups = hits + cls._misses.value + cls._coalesced.value
+        return {
+            'cache_hits': hits,
+            'cache_misses': cls._misses.value,
+            'coalesced': cls._coalesced.value,
+            'errors': cls._errors.value,
+            'hit_rate': round((hits + cls._coalesced.value) / lookups, 4) if lookups else 0.0,
+            'request_seconds': cls._request_latency.snapshot(),
+            'query_seconds': cls._query_latency.snapshot(),
+            'recent_queries': list(cls._recent),
+        }
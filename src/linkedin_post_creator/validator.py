@@ -0,0 +1,276 @@
+import itertools
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from linkedin_post_creator.metrics import REGISTRY
+
+# Limits from content_creation_task; the headline and word limits are exclusive ("under")
+MAX_WORDS = 200
+MAX_HEADLINE_CHARS = 30
+HASHTAG_RANGE = (3, 5)
+EMOJI_RANGE = (2, 4)
+
+# Added, in this order, to the ends of paragraphs when a post has too few emojis
+FILLER_EMOJIS = ('💡', '🚀', '👉', '✅')
+
+_EMOJI_CHARS = (
+    "\U0001F300-\U0001F5FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\U0001F900-\U0001F9FF"
+    "\U0001FA70-\U0001FAFF☀-➿⭐⭕⤴⤵⬅-⬇"
+)
+# One emoji as displayed: flags, or a base character with skin tone/variation selector and ZWJ joins
+EMOJI = re.compile(
+    "(?:[\U0001F1E6-\U0001F1FF]{2}"
+    f"|[{_EMOJI_CHARS}][\U0001F3FB-\U0001F3FF]?️?"
+    f"(?:‍[{_EMOJI_CHARS}][\U0001F3FB-\U0001F3FF]?️?)*)"
+)
+HASHTAG = re.compile(r"(?<![\w&#/])#(\w*[^\W\d_]\w*)")
+_WORD = re.compile(r"[^\W_][\w'’-]*")
+_HEADLINE_MARKUP = re.compile(r"^(?:#{1,6}\s+|[>*_\s-]+|(?:headline|hook)\s*:\s*)+", re.IGNORECASE)
+# Where a long first line can be split into a headline and the start of the body
+_CLAUSE_BREAK = re.compile(r"[:!?.;]\s|\s[-–—]\s")
+
+_checked = REGISTRY.counter("post_validation_checked_total", "Drafts checked by the post validator")
+_passed = REGISTRY.counter("post_validation_passed_total", "Drafts that met every rule as written")
+_fixed = REGISTRY.counter("post_validation_fixed_total", "Drafts that met every rule after auto-fixing")
+_failed = REGISTRY.counter("post_validation_failed_total", "Drafts left with violations for the critic")
+
+
+class ValidationReport:
+    """Rule check of one post: measurements, remaining violations and fixes applied"""
+
+    def __init__(self, text: str, words: int, headline: str, hashtags: List[str], emojis: int,
+                 violations: List[str], fixes: Optional[List[str]] = None):
+        self.text = text
+        self.words = words
+        self.headline = headline
+        self.hashtags = hashtags
+        self.emojis = emojis
+        self.violations = violations
+        self.fixes = fixes or []
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def describe(self) -> str:
+        """Violation list in the form given to the critic"""
+        if self.ok:
+            return "The post meets every length, headline, hashtag and emoji rule."
+        return "\n".join(f"- {violation}" for violation in self.violations)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ok': self.ok,
+            'words': self.words,
+            'headline_chars': len(self.headline),
+            'hashtags': len(self.hashtags),
+            'emojis': self.emojis,
+            'violations': self.violations,
+            'fixes': self.fixes,
+        }
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```") and text.endswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text[:-3]
+    return text.strip()
+
+
+def _headline(line: str) -> str:
+    return _HEADLINE_MARKUP.sub("", line.replace("**", "").replace("__", "")).strip()
+
+
+def _split_lines(text: str) -> Tuple[List[str], List[str]]:
+    """(body lines, trailing hashtag-only lines)"""
+    lines = text.split("\n")
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    start = end
+    while start and (not lines[start - 1].strip() or all(
+        HASHTAG.fullmatch(token) for token in lines[start - 1].split()
+    )):
+        start -= 1
+    while start < end and not lines[start].strip():
+        start += 1
+    return lines[:start], [line for line in lines[start:end] if line.strip()]
+
+
+def _unique_hashtags(text: str) -> List[str]:
+    seen, tags = set(), []
+    for match in HASHTAG.finditer(text):
+        key = match.group(1).lower()
+        if key not in seen:
+            seen.add(key)
+            tags.append(match.group(0))
+    return tags
+
+
+def validate_post(text: str, fixes: Optional[List[str]] = None) -> ValidationReport:
+    """Measure ``text`` against the post rules"""
+    text = _strip_fences(text or "")
+    first_line = next((line for line in text.split("\n") if line.strip()), "")
+    headline = _headline(first_line)
+    hashtags = _unique_hashtags(text)
+    emojis = len(EMOJI.findall(text))
+    words = len(_WORD.findall(HASHTAG.sub("", text)))
+
+    violations = []
+    if words >= MAX_WORDS:
+        violations.append(f"Word count is {words}; it must be under {MAX_WORDS} (cut at least {words - MAX_WORDS + 1} words).")
+    if not headline:
+        violations.append("The post has no headline; start with a hook line under 30 characters.")
+    elif len(headline) >= MAX_HEADLINE_CHARS:
+        violations.append(
+            f"Headline \"{headline}\" is {len(headline)} characters; it must be under {MAX_HEADLINE_CHARS}."
+        )
+    low, high = HASHTAG_RANGE
+    if not low <= len(hashtags) <= high:
+        found = f" ({' '.join(hashtags)})" if hashtags else ""
+        violations.append(f"Found {len(hashtags)} hashtags{found}; use {low}-{high}.")
+    low, high = EMOJI_RANGE
+    if not low <= emojis <= high:
+        violations.append(f"Found {emojis} emojis; use {low}-{high}.")
+    return ValidationReport(text, words, headline, hashtags, emojis, violations, fixes)
+
+
+def _camel_tag(phrase: str) -> Optional[str]:
+    words = re.findall(r"[^\W_]+", phrase or "")
+    tag = "".join(word if word.isupper() else word.capitalize() for word in words)
+    return f"#{tag}" if tag and len(tag) <= 30 and not tag.isdigit() else None
+
+
+def _fix_headline(body: List[str], fixes: List[str]) -> None:
+    index = next((i for i, line in enumerate(body) if line.strip()), None)
+    if index is None:
+        return
+    headline = _headline(body[index])
+    if len(headline) < MAX_HEADLINE_CHARS:
+        return
+    # Split at the last clause break that leaves a headline of a useful length
+    cut = None
+    for match in _CLAUSE_BREAK.finditer(headline):
+        # Keep closing ! ? . on the headline, drop : ; and dashes
+        end = match.start() + (match.group(0)[0] in "!?.")
+        if 8 <= len(headline[:end].strip()) < MAX_HEADLINE_CHARS:
+            cut = (end, match.end())
+    if cut is None:
+        return
+    first, rest = headline[:cut[0]].strip(), headline[cut[1]:].strip()
+    body[index:index + 1] = [first, "", rest[:1].upper() + rest[1:]]
+    fixes.append(f"Split the first line after \"{first}\" to shorten the headline to {len(first)} characters.")
+
+
+def _fix_hashtags(body: List[str], tag_lines: List[str], inputs: Optional[Dict[str, Any]], fixes: List[str]) -> List[str]:
+    inline = _unique_hashtags("\n".join(body))
+    seen = {tag[1:].lower() for tag in inline}
+    trailing = []
+    for tag in _unique_hashtags("\n".join(tag_lines)):
+        if tag[1:].lower() not in seen:
+            seen.add(tag[1:].lower())
+            trailing.append(tag)
+
+    low, high = HASHTAG_RANGE
+    total = len(inline) + len(trailing)
+    if total > high and trailing:
+        dropped = trailing[max(0, high - len(inline)):]
+        trailing = trailing[:max(0, high - len(inline))]
+        fixes.append(f"Removed extra hashtags {' '.join(dropped)}.")
+    elif total < low and inputs:
+        added = []
+        for field in ('topic', 'industry', 'audience'):
+            tag = _camel_tag(str(inputs.get(field, "")))
+            if tag and tag[1:].lower() not in seen and total + len(added) < low:
+                seen.add(tag[1:].lower())
+                added.append(tag)
+        if added:
+            trailing.extend(added)
+            fixes.append(f"Added hashtags {' '.join(added)}.")
+    return [" ".join(trailing)] if trailing else []
+
+
+def _fix_emojis(body: List[str], fixes: List[str]) -> None:
+    count = len(EMOJI.findall("\n".join(body)))
+    low, high = EMOJI_RANGE
+    if count > high:
+        # Keep the first emojis and drop the rest
+        keep = high
+        for i, line in enumerate(body):
+            def drop(match):
+                nonlocal keep
+                if keep > 0:
+                    keep -= 1
+                    return match.group(0)
+                return ""
+            trimmed = EMOJI.sub(drop, line)
+            if trimmed != line:
+                body[i] = re.sub(r" +([.,!?])", r"\1", re.sub(r" {2,}", " ", trimmed)).rstrip()
+        fixes.append(f"Removed {count - high} emojis beyond the limit of {high}.")
+    elif count < low:
+        lines = [i for i, line in enumerate(body) if line.strip()]
+        ends = lines[:0:-1]
+        # Then after the hook, as long as it stays under the headline limit
+        hook = lines[:1] if lines and len(_headline(body[lines[0]])) + 2 < MAX_HEADLINE_CHARS else []
+        spots = ends + hook or lines[:1]
+        present = set(EMOJI.findall("\n".join(body)))
+        fillers = [emoji for emoji in FILLER_EMOJIS if emoji not in present]
+        added = []
+        # Short posts have fewer line ends than emojis to add; go round them again
+        for i in itertools.chain(spots, itertools.cycle(ends or spots)):
+            if count + len(added) >= low or not fillers:
+                break
+            emoji = fillers.pop(0)
+            body[i] = f"{body[i].rstrip()} {emoji}"
+            added.append(emoji)
+        if added:
+            fixes.append(f"Added emojis {' '.join(added)} at line ends.")
+
+
+def fix_post(text: str, inputs: Optional[Dict[str, Any]] = None) -> ValidationReport:
+    """Apply the deterministic fixes and re-validate.
+
+    Headlines are shortened only at a clause break, hashtags are
+    de-duplicated, trimmed or derived from the topic, industry and audience
+    in ``inputs``, and emojis are trimmed or added at line ends. Word
+    count is never changed, since cutting content needs judgement.
+    """
+    fixes: List[str] = []
+    body, tag_lines = _split_lines(_strip_fences(text or ""))
+    while body and not body[-1].strip():
+        body.pop()
+
+    _fix_headline(body, fixes)
+    _fix_emojis(body, fixes)
+    tags = _fix_hashtags(body, tag_lines, inputs, fixes)
+
+    fixed = "\n".join(body).rstrip()
+    if tags:
+        fixed = f"{fixed}\n\n{tags[0]}" if fixed else tags[0]
+    if not fixes:
+        fixed = _strip_fences(text or "")
+    return validate_post(fixed, fixes)
+
+
+def check_draft(text: str, inputs: Optional[Dict[str, Any]] = None) -> ValidationReport:
+    """Validate a writer draft, auto-fixing it if needed, and count the outcome"""
+    _checked.inc()
+    report = validate_post(text)
+    if report.ok:
+        _passed.inc()
+        return report
+    report = fix_post(text, inputs)
+    (_fixed if report.ok else _failed).inc()
+    return report
+
+
+def stats() -> Dict[str, Any]:
+    checked = _checked.value
+    return {
+        'checked': checked,
+        'passed': _passed.value,
+        'fixed': _fixed.value,
+        'sent_to_critic': _failed.value,
+        'critic_skip_rate': round((_passed.value + _fixed.value) / checked, 4) if checked else 0.0,
+    }
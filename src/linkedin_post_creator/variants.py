@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from linkedin_post_creator.instrumentation import record_stages
+from linkedin_post_creator.pipeline import PostPipeline, post_result
+from linkedin_post_creator.scheduler import QueueFullError
+
+# Inputs a variant may change; topic, industry and year determine the research, which is shared
+VARIANT_FIELDS = ('tone', 'audience')
+
+
+class VariantError(ValueError):
+    """Raised for malformed variant requests"""
+
+
+def parse_variants(data: Dict[str, Any], max_variants: int) -> List[Dict[str, str]]:
+    """Variant overrides from a request body.
+
+    Either an explicit ``variants`` list of ``{"tone": ..., "audience": ...}``
+    objects, or every combination of ``tones`` and ``audiences`` (each
+    defaulting to the request's single ``tone``/``audience``). Duplicates are
+    dropped.
+    """
+    if 'variants' in data:
+        variants = data['variants']
+        if not isinstance(variants, list) or not variants:
+            raise VariantError("variants must be a non-empty list")
+        for variant in variants:
+            if not isinstance(variant, dict) or not variant or not set(variant) <= set(VARIANT_FIELDS):
+                raise VariantError(f"Each variant must be an object with some of {list(VARIANT_FIELDS)}")
+    elif 'tones' in data or 'audiences' in data:
+        options = []
+        for field in VARIANT_FIELDS:
+            values = data.get(f'{field}s', [data[field]] if field in data else None)
+            if values is not None and (not isinstance(values, list) or not values):
+                raise VariantError(f"{field}s must be a non-empty list")
+            options.append([(field, value) for value in values] if values else [()])
+        variants = [dict(pair for pair in combination if pair) for combination in itertools.product(*options)]
+    else:
+        raise VariantError("variants, tones or audiences is required")
+
+    unique = []
+    for variant in variants:
+        if not all(isinstance(value, str) and value.strip() for value in variant.values()):
+            raise VariantError("Variant values must be non-empty strings")
+        if variant not in unique:
+            unique.append(variant)
+    if len(unique) > max_variants:
+        raise VariantError(f"At most {max_variants} variants can be generated at once")
+    return unique
+
+
+class VariantRunner:
+    """Generates several posts for one topic, sharing a single research pass.
+
+    Research runs first (or comes from the research cache); then the writing
+    and review tasks of every variant run concurrently on pooled crews, up to
+    ``concurrency`` at once. Records are yielded as they finish: one
+    ``research`` record, then one ``variant`` record per variant.
+    """
+
+    def __init__(self, pipeline: PostPipeline, concurrency: int = 4, submit: Optional[Callable[..., Future]] = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.submit = submit
+
+    def _research(self, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        start = time.perf_counter()
+        record = {'stage': 'research', 'status': 'completed', 'cached': False, 'error': None}
+        research = None
+        try:
+            research, record['cached'] = self.pipeline.research(inputs)
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        return record, research
+
+    def _run_variant(self, index: int, variant: Dict[str, str], inputs: Dict[str, Any], research: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        record = {'stage': 'variant', 'variant': index, 'overrides': variant, 'status': 'completed',
+                  'result': None, 'error': None}
+        try:
+            with record_stages() as stages:
+                output = self.pipeline.run(inputs, research=research)
+            record['result'] = post_result(output, inputs, stages.summary())
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        return record
+
+    @staticmethod
+    def _record(index: int, variant: Dict[str, str], future: Future) -> Dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            return {'stage': 'variant', 'variant': index, 'overrides': variant, 'status': 'failed',
+                    'result': None, 'error': str(e)}
+
+    def _fill(self, pending: Deque, in_flight: Dict[Future, Tuple[int, Dict[str, str]]],
+              inputs: Dict[str, Any], research: str, submit: Callable[..., Future]) -> float:
+        """Submit pending variants up to the concurrency limit; returns a back-off when the queue is full"""
+        while pending and len(in_flight) < self.concurrency:
+            index, variant = pending[0]
+            try:
+                future = submit(self._run_variant, index, variant, {**inputs, **variant}, research)
+            except QueueFullError as e:
+                return e.retry_after
+            pending.popleft()
+            in_flight[future] = (index, variant)
+        return 0
+
+    def run(self, inputs: Dict[str, Any], variants: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """Yield the research record, then a record per variant in completion order"""
+        executor = None
+        submit = self.submit
+        if submit is None:
+            executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="variant")
+            submit = executor.submit
+
+        in_flight: Dict[Future, Tuple[int, Dict[str, str]]] = {}
+        try:
+            while True:
+                try:
+                    research_future = submit(self._research, inputs)
+                    break
+                except QueueFullError as e:
+                    time.sleep(e.retry_after)
+            record, research = research_future.result()
+            yield record
+            if research is None:
+                return
+
+            pending = deque(enumerate(variants))
+            while pending or in_flight:
+                retry_after = self._fill(pending, in_flight, inputs, research, submit)
+                if not in_flight:
+                    time.sleep(retry_after)
+                    continue
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, variant = in_flight.pop(future)
+                    yield self._record(index, variant, future)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run_async(self, inputs: Dict[str, Any], variants: List[Dict[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of ``run`` that waits on the event loop; ``submit`` must be set.
+
+        Variants still queued are cancelled if the consumer stops iterating.
+        """
+        if self.submit is None:
+            raise ValueError("run_async needs a submit function")
+
+        in_flight: Dict[Future, Tuple[int, Dict[str, str]]] = {}
+        try:
+            while True:
+                try:
+                    research_future = self.submit(self._research, inputs)
+                    break
+                except QueueFullError as e:
+                    await asyncio.sleep(e.retry_after)
+            record, research = await asyncio.wrap_future(research_future)
+            yield record
+            if research is None:
+                return
+
+            pending = deque(enumerate(variants))
+            while pending or in_flight:
+                retry_after = self._fill(pending, in_flight, inputs, research, self.submit)
+                if not in_flight:
+                    await asyncio.sleep(retry_after)
+                    continue
+                waiting = {asyncio.wrap_future(future): future for future in in_flight}
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    future = waiting[task]
+                    index, variant = in_flight.pop(future)
+                    yield self._record(index, variant, future)
+        finally:
+            for future in in_flight:
+                future.cancel()
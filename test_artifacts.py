@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Artifact Store Tests
+
+Unit tests for the content-addressed post store: de-duplication, job
+manifests, deletion and pruning.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import artifacts as artifacts_module
+from linkedin_post_creator.artifacts import ArtifactStore, AsyncArtifactWriter
+from linkedin_post_creator.metrics import MetricsRegistry
+
+
+def store(tmp_path, **kwargs):
+    return ArtifactStore(str(tmp_path), registry=MetricsRegistry(), **kwargs)
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_identical_posts_are_stored_once(tmp_path):
+    artifacts = store(tmp_path)
+    first = artifacts.put("A post", ['job-1'])
+    second = artifacts.put("A post", ['job-2'])
+    assert first == second
+    assert artifacts.get(first) == "A post"
+    assert artifacts.job_artifacts('job-2') == {'linkedin_post.md': first}
+    assert artifacts.stats()['deduplicated'] == 1
+
+
+def test_delete_job_keeps_posts_other_jobs_share(tmp_path):
+    artifacts = store(tmp_path)
+    shared = artifacts.put("Shared post", ['job-1', 'job-2'])
+    own = artifacts.put("Own post", ['job-1'], name="variant.md")
+    assert artifacts.delete_job('job-1') == 2
+    assert artifacts.job_artifacts('job-1') == {}
+    assert artifacts.get(own) is None
+    assert artifacts.get(shared) == "Shared post"
+
+
+def test_prune_drops_expired_manifests_and_their_posts(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts_module, 'ORPHAN_GRACE_SECONDS', 0)
+    artifacts = store(tmp_path, ttl_seconds=60)
+    old = artifacts.put("Old post", ['old'])
+    new = artifacts.put("New post", ['new'])
+    age(artifacts._manifest_path('old'), 120)
+    age(artifacts.path(old), 120)
+    assert artifacts.prune() == 2
+    assert artifacts.get(old) is None
+    assert artifacts.get(new) == "New post"
+    assert artifacts.job_artifacts('new')
+
+
+def test_prune_keeps_recent_unreferenced_posts(tmp_path):
+    artifacts = store(tmp_path)
+    # Written by another process that has not saved the manifest yet
+    key = artifacts.put("Fresh post")
+    assert artifacts.prune() == 0
+    assert artifacts.get(key) == "Fresh post"
+
+
+def test_prune_keeps_the_most_recent_posts(tmp_path):
+    artifacts = store(tmp_path, max_objects=2)
+    keys = [artifacts.put(f"Post {i}", [f'job-{i}']) for i in range(3)]
+    for i, key in enumerate(keys):
+        age(artifacts.path(key), 30 - i)
+    assert artifacts.prune() == 1
+    assert artifacts.get(keys[0]) is None
+    assert artifacts.get(keys[2]) == "Post 2"
+
+
+def test_async_writer_deletes_after_queued_writes(tmp_path):
+    writer = AsyncArtifactWriter(store(tmp_path), flush_interval=0.05)
+    try:
+        key = writer.put("A post", ['job-1'])
+        writer.delete_job('job-1')
+        assert writer.get(key) is None
+        assert writer.job_artifacts('job-1') == {}
+    finally:
+        writer.close()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Batch Tests
+
+Unit tests for parsing JSONL batches, the resume checkpoint and running
+batches on pooled crews with the fake LLM.
+"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.batch import ROW_DEFAULTS, BatchCheckpoint, BatchError, BatchRunner, _BatchPlan, parse_rows
+from linkedin_post_creator.crew_pool import CrewPool
+from linkedin_post_creator.fakes import FakeLLM
+from linkedin_post_creator.metrics import MetricsRegistry
+from linkedin_post_creator.research_cache import ResearchCache
+
+BATCH = [
+    '# Posts for next week',
+    '{"id": "a", "topic": "Remote Work", "tone": "casual", "current_year": "2026"}',
+    '',
+    '{"id": "b", "topic": "remote work", "audience": "founders", "current_year": "2026"}',
+    '{"topic": "Cloud Costs", "industry": "Finance", "current_year": "2026"}',
+]
+
+
+def test_rows_get_defaults_and_line_numbers():
+    rows = parse_rows(BATCH)
+    assert [row.id for row in rows] == ['a', 'b', '5']
+    assert rows[0].inputs == {'topic': 'Remote Work', 'current_year': '2026', 'industry': ROW_DEFAULTS['industry'],
+                              'tone': 'casual', 'audience': ROW_DEFAULTS['audience']}
+    assert rows[2].inputs['industry'] == 'Finance'
+
+
+@pytest.mark.parametrize('lines, message', [
+    (['{"topic": "A"', ], "Line 1: invalid JSON"),
+    (['{"tone": "casual"}'], "Line 1: topic is required"),
+    (['{"id": 1, "topic": "A"}', '{"id": "1", "topic": "B"}'], "Line 2: duplicate id '1'"),
+])
+def test_malformed_rows_name_their_line(lines, message):
+    with pytest.raises(BatchError, match=message):
+        parse_rows(lines)
+
+
+def test_rows_sharing_research_wait_for_the_first():
+    rows = parse_rows(BATCH + ['{"id": "c", "topic": "Remote Work", "tone": "bold", "current_year": "2026"}'])
+    plan = _BatchPlan(rows, None)
+    assert [row.id for row in plan.ready] == ['a', '5']
+    plan.ready.clear()
+    # A failed first row hands the research to the next row of its group only
+    plan.complete(rows[0], {'status': 'failed'})
+    assert [row.id for row in plan.ready] == ['b']
+    plan.complete(rows[1], {'status': 'completed'})
+    assert [row.id for row in plan.ready] == ['b', 'c']
+
+
+def test_checkpoint_only_resumes_completed_rows_with_the_same_inputs(tmp_path):
+    rows = parse_rows(BATCH)
+    path = str(tmp_path / "batch.checkpoint.jsonl")
+    checkpoint = BatchCheckpoint(path)
+    checkpoint.append({'id': 'a', 'key': rows[0].key, 'status': 'completed', 'result': {'post': 'A'}})
+    checkpoint.append({'id': 'b', 'key': rows[1].key, 'status': 'failed', 'error': 'boom'})
+    checkpoint.append({'id': '5', 'key': 'stale', 'status': 'completed'})
+    with open(path, 'a') as f:
+        f.write('{"id": "torn"')
+
+    reloaded = BatchCheckpoint(path)
+    assert reloaded.completed(rows[0])['result'] == {'post': 'A'}
+    assert reloaded.completed(rows[1]) is None
+    assert reloaded.completed(rows[2]) is None
+
+
+def test_batch_runs_research_once_per_group_and_resumes(tmp_path, fake_creator):
+    llm = FakeLLM()
+    registry = MetricsRegistry()
+    pool = CrewPool(factory=lambda: fake_creator(llm), max_size=2, registry=registry)
+    cache = ResearchCache(directory=None, registry=registry)
+    checkpoint = BatchCheckpoint(str(tmp_path / "batch.checkpoint.jsonl"))
+    rows = parse_rows(BATCH)
+
+    records = list(BatchRunner(pool, research_cache=cache, concurrency=2).run(rows, checkpoint))
+    assert sorted(record['id'] for record in records) == ['5', 'a', 'b']
+    assert all(record['status'] == 'completed' for record in records)
+    assert cache.stats()['stores'] == 2
+    assert cache.stats()['memory_hits'] == 1
+
+    calls = llm.calls
+    resumed = list(BatchRunner(pool, research_cache=cache).run(rows, BatchCheckpoint(checkpoint.path)))
+    assert all(record['resumed'] for record in resumed)
+    assert llm.calls == calls
+
+
+def test_run_async_waits_on_the_event_loop():
+    class FakePipeline:
+        def run(self, inputs):
+            return f"A post about {inputs['topic']}"
+
+    async def collect(runner):
+        return [record async for record in runner.run_async(parse_rows(BATCH))]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        runner = BatchRunner(CrewPool(registry=MetricsRegistry()), submit=executor.submit)
+        runner.pipeline = FakePipeline()
+        records = asyncio.run(collect(runner))
+    assert sorted(record['id'] for record in records) == ['5', 'a', 'b']
+    assert all(record['status'] == 'completed' for record in records)
+    with pytest.raises(ValueError):
+        asyncio.run(collect(BatchRunner(CrewPool(registry=MetricsRegistry()))))
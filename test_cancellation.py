@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Cancellation Tests
+
+Unit tests for CancelToken deadlines, polling and interrupts, and for the
+thread-bound helpers used by provider calls.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.cancellation import CancelToken, DeadlineExceededError, JobCancelledError
+
+
+def test_cancel_raises_on_the_next_check():
+    token = CancelToken()
+    token.check()
+    assert token.cancel("Stopped by user")
+    assert not token.cancel()
+    with pytest.raises(JobCancelledError, match="Stopped by user"):
+        token.check()
+
+
+def test_deadline_bounds_call_timeouts():
+    token = CancelToken(deadline=time.monotonic() + 5)
+    assert token.timeout(30) == pytest.approx(5, abs=0.1)
+    assert token.timeout(1) == 1
+    assert CancelToken().timeout(30) == 30
+
+
+def test_passed_deadline_raises_deadline_exceeded():
+    token = CancelToken(deadline=time.monotonic() - 1)
+    with pytest.raises(DeadlineExceededError):
+        token.check()
+    assert isinstance(DeadlineExceededError(), TimeoutError)
+
+
+def test_extend_only_moves_the_deadline_later():
+    now = time.monotonic()
+    token = CancelToken(deadline=now + 10)
+    token.extend(now + 5)
+    assert token.deadline == now + 10
+    token.extend(now + 20)
+    assert token.deadline == now + 20
+    token.extend(None)
+    assert token.deadline is None
+
+
+def test_wait_wakes_up_when_cancelled():
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(JobCancelledError):
+        token.wait(5)
+    assert time.monotonic() - start < 1
+
+
+def test_poll_cancels_a_bound_token_and_interrupts_its_call():
+    cancelled_elsewhere = threading.Event()
+    token = CancelToken(poll=cancelled_elsewhere.is_set, poll_interval=0.05)
+    closed = threading.Event()
+    with cancellation.bind(token), cancellation.interrupt(closed.set):
+        threading.Timer(0.1, cancelled_elsewhere.set).start()
+        # Stands in for a blocking provider call that only the interrupt ends
+        assert closed.wait(5)
+        with pytest.raises(JobCancelledError):
+            cancellation.check()
+    assert cancellation.stats()['calls_interrupted'] >= 1
+
+
+def test_interrupt_is_unregistered_after_the_block():
+    token = CancelToken()
+    closed = []
+    with token.interrupt(lambda: closed.append(1)):
+        pass
+    token.cancel()
+    assert closed == []
+
+
+def test_helpers_without_a_bound_token():
+    assert cancellation.current() is None
+    cancellation.check()
+    assert cancellation.timeout(10) == 10
+    with cancellation.interrupt(lambda: None):
+        pass
+
+
+def test_bind_restores_the_previous_token():
+    outer, inner = CancelToken(), CancelToken()
+    with cancellation.bind(outer):
+        with cancellation.bind(inner):
+            assert cancellation.current() is inner
+        assert cancellation.current() is outer
+    assert cancellation.current() is None
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Checkpoint Tests
+
+Unit tests for the SQLite checkpoint store and for resuming a crew run
+from the tasks an earlier attempt finished, run on the fake LLM.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.checkpoints import CheckpointRecorder, CheckpointStore, next_task, record, recording
+from linkedin_post_creator.fakes import FakeLLM
+from linkedin_post_creator.metrics import MetricsRegistry
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'professional', 'audience': 'engineers',
+          'current_year': '2026'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(path=str(tmp_path / "checkpoints.db"), registry=MetricsRegistry())
+
+
+def test_next_task_is_the_first_without_output():
+    assert next_task({}) == 'research_task'
+    assert next_task({'research_task': 'report'}) == 'content_creation_task'
+    assert next_task({'research_task': 'report', 'content_creation_task': 'draft',
+                      'content_review_task': 'post'}) == 'content_review_task'
+
+
+def test_saved_outputs_are_shared_by_every_job_of_the_run(store):
+    store.begin(['job-1', 'job-2'], INPUTS)
+    store.save(['job-1', 'job-2'], INPUTS, 'research_task', "Report", agent="Career Coach")
+
+    other = CheckpointStore(path=store.path, registry=MetricsRegistry())
+    checkpoint = other.load('job-2')
+    assert checkpoint.inputs == INPUTS
+    assert checkpoint.outputs == {'research_task': "Report"}
+    assert checkpoint.next_task() == 'content_creation_task'
+    assert other.load('job-3') is None
+
+    other.delete(['job-1'])
+    assert other.load('job-1') is None
+    assert other.stats()['jobs'] == 1
+
+
+def test_begin_keeps_outputs_of_earlier_attempts(store):
+    store.save(['job'], INPUTS, 'research_task', "Report")
+    store.begin(['job'], INPUTS)
+    assert store.load('job').outputs == {'research_task': "Report"}
+
+
+def test_compact_drops_stale_jobs(tmp_path):
+    store = CheckpointStore(path=str(tmp_path / "checkpoints.db"), ttl_seconds=0.05, registry=MetricsRegistry())
+    store.save(['old'], INPUTS, 'research_task', "Report")
+    time.sleep(0.1)
+    store.save(['new'], INPUTS, 'research_task', "Report")
+    assert store.compact() == 1
+    assert store.load('old') is None
+    assert store.stats()['task_outputs'] == 1
+
+
+def test_record_only_checkpoints_inside_a_recording(store):
+    record('research_task', "Lost")
+    recorder = CheckpointRecorder(store, lambda: ['job'], INPUTS)
+    with recording(recorder):
+        record('research_task', "Report")
+        record('unknown_task', "Ignored")
+        record('content_creation_task', "")
+    assert recorder.outputs == {'research_task': "Report"}
+    assert store.load('job').outputs == {'research_task': "Report"}
+
+
+def test_failed_checkpoint_does_not_fail_the_run(store, monkeypatch):
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, 'save', locked)
+    recorder = CheckpointRecorder(store, lambda: ['job'], INPUTS)
+    recorder('research_task', "Report")
+    assert recorder.next_task() == 'content_creation_task'
+
+
+def test_run_resumes_from_its_checkpoint(store, fake_creator):
+    llm = FakeLLM()
+    recorder = CheckpointRecorder(store, lambda: ['job'], INPUTS)
+    with recording(recorder):
+        fake_creator(llm).crew().kickoff(inputs=INPUTS)
+    outputs = store.load('job').outputs
+    assert {'research_task', 'content_creation_task'} <= set(outputs)
+    full_run = llm.calls
+
+    # A retry with the research and the draft checkpointed only runs the review, if anything
+    llm.calls = 0
+    creator = fake_creator(llm)
+    output = creator.kickoff_with_research(INPUTS, outputs['research_task'], outputs['content_creation_task'])
+    assert output.raw
+    assert llm.calls < full_run
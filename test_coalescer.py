@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Request Coalescer Tests
+
+Unit tests for request keys, single-flight coalescing of identical
+requests, detaching cancelled jobs and the short-lived result cache.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.coalescer import RequestCoalescer, request_key
+from linkedin_post_creator.metrics import MetricsRegistry
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'casual',
+          'audience': 'Engineering Managers', 'current_year': '2025'}
+
+
+def coalescer(**kwargs):
+    return RequestCoalescer(registry=MetricsRegistry(), **kwargs)
+
+
+def test_request_key_ignores_case_whitespace_and_other_fields():
+    variant = dict(INPUTS, topic='  remote   WORK ', debug=True)
+    assert request_key(variant) == request_key(INPUTS)
+    assert request_key(dict(INPUTS, tone='formal')) != request_key(INPUTS)
+
+
+def test_identical_requests_share_one_run():
+    requests = coalescer()
+    key = request_key(INPUTS)
+    leader, is_leader = requests.join(key, 'job-1')
+    follower, follower_leads = requests.join(key, 'job-2')
+    assert is_leader and not follower_leads
+    assert follower is leader
+    assert requests.finish(leader, result='post') == ['job-1', 'job-2']
+    assert follower.future.result(timeout=1) == 'post'
+    assert requests.stats()['coalesced'] == 1
+
+
+def test_disabled_coalescer_runs_every_request():
+    requests = coalescer(enabled=False)
+    key = request_key(INPUTS)
+    first, _ = requests.join(key, 'job-1')
+    second, second_leads = requests.join(key, 'job-2')
+    assert second_leads and second is not first
+    assert len(requests.unfinished()) == 2
+
+
+def test_join_keeps_the_latest_deadline():
+    requests = coalescer()
+    key = request_key(INPUTS)
+    now = time.monotonic()
+    execution, _ = requests.join(key, 'job-1', deadline=now + 10)
+    requests.join(key, 'job-2', deadline=now + 60)
+    requests.join(key, 'job-3', deadline=now + 30)
+    assert execution.token.deadline == pytest.approx(now + 60)
+    requests.join(key, 'job-4')
+    assert execution.token.deadline is None
+
+
+def test_detaching_the_last_job_orphans_the_run():
+    requests = coalescer()
+    key = request_key(INPUTS)
+    execution, _ = requests.join(key, 'job-1')
+    requests.join(key, 'job-2')
+    assert requests.detach('job-1') == (execution, False)
+    assert requests.detach('job-2') == (execution, True)
+    assert requests.detach('job-3') == (None, False)
+    fresh, is_leader = requests.join(key, 'job-4')
+    assert is_leader and fresh is not execution
+
+
+def test_waiters_without_a_job_id_keep_the_run_alive():
+    requests = coalescer()
+    key = request_key(INPUTS)
+    execution, _ = requests.join(key, 'job-1')
+    requests.join(key)
+    assert requests.detach('job-1') == (execution, False)
+
+
+def test_only_successful_results_are_cached():
+    requests = coalescer(result_ttl=0.05)
+    key = request_key(INPUTS)
+    failed, _ = requests.join(key, 'job-1')
+    requests.finish(failed, error=RuntimeError("boom"))
+    assert requests.cached_result(key) is None
+
+    execution, _ = requests.join(key, 'job-2')
+    requests.finish(execution, result='post')
+    assert requests.finish(execution, result='again') == []
+    assert requests.cached_result(key) == 'post'
+    time.sleep(0.1)
+    assert requests.cached_result(key) is None
+
+
+def test_result_cache_keeps_the_most_recent_keys():
+    requests = coalescer(max_results=2)
+    keys = [request_key(dict(INPUTS, topic=f"Topic {i}")) for i in range(3)]
+    for key in keys:
+        execution, _ = requests.join(key, key)
+        requests.finish(execution, result=key)
+    assert requests.cached_result(keys[0]) is None
+    assert requests.cached_result(keys[2]) == keys[2]
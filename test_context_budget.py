@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Context Budget Tests
+
+Unit tests for splitting research reports into findings, compacting them
+to a token budget and applying per-task budgets.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.context_budget import (
+    ContextBudget,
+    compact,
+    estimate_tokens,
+    parse_budgets,
+    split_findings,
+)
+from linkedin_post_creator.fakes import fake_text
+from linkedin_post_creator.metrics import MetricsRegistry
+
+REPORT = """## Adoption
+- 62% of engineering teams now work remotely at least three days a week.
+- Hybrid schedules are the most common
+  arrangement in larger companies.
+
+## Productivity
+Async updates cut meeting time by 30%. Teams that write decisions down ship faster.
+
+Risks: Onboarding junior engineers is harder. Isolation affects retention.
+"""
+
+
+def test_split_findings_keeps_headings_and_wrapped_lines():
+    findings = split_findings(REPORT)
+    assert findings[0] == "Adoption: 62% of engineering teams now work remotely at least three days a week."
+    assert findings[1] == "Adoption: Hybrid schedules are the most common arrangement in larger companies."
+    assert "Productivity: Teams that write decisions down ship faster." in findings
+    assert "Risks: Isolation affects retention." in findings
+
+
+def test_text_within_budget_is_unchanged():
+    assert compact(REPORT, estimate_tokens(REPORT)) == REPORT
+    assert compact(REPORT, 0) == ""
+
+
+def test_compact_fits_the_budget_and_prefers_the_focus():
+    report = REPORT + "\n" + "\n".join(f"- {fake_text(30, f'filler{i}')}." for i in range(20))
+    compacted = compact(report, 80, focus="onboarding junior engineers")
+    assert estimate_tokens(compacted) <= 80
+    assert compacted.startswith("Key research findings (compacted):")
+    assert "Onboarding junior engineers is harder." in compacted
+
+
+def test_repeated_findings_are_dropped():
+    report = "\n".join(["- Remote work cuts office costs by 20%."] * 5 + [f"- {fake_text(60, 'pad')}."])
+    compacted = compact(report, 40)
+    assert compacted.count("office costs") == 1
+
+
+def test_budget_only_compacts_research_for_budgeted_tasks():
+    budget = ContextBudget({'content_review_task': 40}, registry=MetricsRegistry())
+    research = REPORT * 4
+    draft = "Remote teams win\n\nOnboarding needs more care."
+    parts, report = budget.fit('content_review_task', [('research_task', research), ('content_creation_task', draft)])
+    assert parts[1] == draft
+    assert estimate_tokens(parts[0]) <= 40
+    assert report['tokens_saved'] == report['original_tokens'] - report['context_tokens'] > 0
+    assert budget.stats()['compactions'] == 1
+
+    parts, report = budget.fit('content_creation_task', [('research_task', research)])
+    assert parts == [research]
+    assert report['tokens_saved'] == 0
+
+
+def test_parse_budgets():
+    assert parse_budgets("content_creation_task=800, content_review_task=200") == {
+        'content_creation_task': 800,
+        'content_review_task': 200,
+    }
+    with pytest.raises(ValueError):
+        parse_budgets("content_review_task=lots")
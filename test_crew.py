@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Crew Tests
+
+Unit tests for LinkedinPostCreator run offline on the fake LLM and the
+fake Serper session.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.fakes import FakeLLM
+from linkedin_post_creator.metrics import REGISTRY
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'professional', 'audience': 'engineers',
+          'current_year': '2026'}
+
+
+@pytest.fixture
+def creator(fake_creator):
+    llm = FakeLLM()
+    return lambda: fake_creator(llm)
+
+
+def pool_metrics():
+    return {name: value for name, value in REGISTRY.snapshot().items() if name.startswith("crew_pool_")}
+
+
+def test_kickoff_runs_every_task(creator):
+    output = creator().crew().kickoff(inputs=INPUTS)
+    assert output.raw
+    assert [task.name for task in output.tasks_output][:2] == ['research_task', 'content_creation_task']
+
+
+def test_kickoff_variants_keeps_its_pool_out_of_the_shared_metrics(creator):
+    before = pool_metrics()
+    variants = [{'tone': 'inspirational'}, {'tone': 'casual', 'audience': 'founders'}]
+    records = list(creator().kickoff_variants(INPUTS, variants, max_workers=2, factory=creator))
+    posts = [record for record in records if record['stage'] == 'variant']
+    assert len(posts) == 2
+    assert all(record['status'] == 'completed' for record in posts)
+    assert pool_metrics() == before
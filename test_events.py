@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Event Stream Tests
+
+Unit tests for the job event broker, for the crew progress events
+captured from a run on the fake LLM and for streaming answers token by
+token.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import events
+from linkedin_post_creator.events import EventBroker, format_sse
+from linkedin_post_creator.fakes import FakeLLM
+from linkedin_post_creator.metrics import MetricsRegistry
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'professional', 'audience': 'engineers',
+          'current_year': '2026'}
+
+
+def broker(**kwargs):
+    return EventBroker(registry=MetricsRegistry(), **kwargs)
+
+
+def test_format_sse():
+    assert format_sse('progress', {'step': 1}, id=7) == 'id: 7\nevent: progress\ndata: {"step": 1}\n\n'
+
+
+def test_history_replays_events_after_a_sequence_number():
+    jobs = broker()
+    first = jobs.publish('job-1', 'queued')
+    jobs.publish('job-2', 'queued')
+    last = jobs.publish('job-1', 'running')
+    assert [event.type for event in jobs.history('job-1')] == ['queued', 'running']
+    assert [event.type for event in jobs.history('job-1', after=first.seq)] == ['running']
+    assert jobs.last_seq('job-1') == last.seq
+
+
+def test_finished_histories_are_dropped_after_the_retention():
+    jobs = broker(retention_seconds=0.05)
+    jobs.publish('done', 'completed', final=True)
+    time.sleep(0.1)
+    jobs.publish('other', 'queued')
+    assert jobs.history('done') == []
+    assert jobs.stats()['jobs'] == 1
+
+
+def test_subscribers_get_events_published_from_other_threads():
+    jobs = broker()
+
+    async def listen():
+        subscription = jobs.subscribe('job')
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, jobs.publish, 'job', 'running', {'step': 1})
+            event = await subscription.get(timeout=1)
+            assert await subscription.get(timeout=0.01) is None
+            return event
+        finally:
+            subscription.close()
+
+    event = asyncio.run(listen())
+    assert (event.type, event.data) == ('running', {'step': 1})
+    assert jobs.stats()['subscribers'] == 0
+
+
+def test_crew_progress_is_published_for_every_bound_job(fake_creator):
+    jobs = broker()
+    with jobs.bind(lambda: ['job-1', 'job-2']):
+        fake_creator(FakeLLM()).crew().kickoff(inputs=INPUTS)
+    types = [event.type for event in jobs.history('job-1')]
+    assert types[0] == 'task_started'
+    assert {'agent_started', 'agent_step', 'tool_started', 'tool_finished', 'task_completed'} <= set(types)
+    assert types == [event.type for event in jobs.history('job-2')]
+    completed = [event.data for event in jobs.history('job-1') if event.type == 'task_completed']
+    assert completed[0]['task'] == 'research_task'
+    assert completed[0]['completion_tokens'] > 0
+
+
+def test_crews_on_other_threads_are_not_attributed(fake_creator):
+    jobs = broker()
+    with jobs.bind(lambda: ['job']):
+        events.emit('custom', {'note': 'ours'})
+        thread = threading.Thread(target=lambda: fake_creator(FakeLLM()).crew().kickoff(inputs=INPUTS))
+        thread.start()
+        thread.join()
+    assert [event.type for event in jobs.history('job')] == ['custom']
+
+
+def test_stream_yields_only_the_final_answers_of_streamed_tasks(fake_creator):
+    stream = fake_creator(FakeLLM(stream=True)).stream(INPUTS)
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(stream))
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    assert {task for task, _ in chunks} <= {'content_creation_task', 'content_review_task'}
+    draft = "".join(text for task, text in chunks if task == 'content_creation_task')
+    assert draft
+    assert "Thought:" not in draft and "Final Answer:" not in draft
+    assert draft.strip() == result.tasks_output[1].raw.strip()
+
+
+def test_a_call_throttled_mid_stream_is_not_retried(monkeypatch):
+    from crewai import LLM
+    from crewai.utilities.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+
+    from linkedin_post_creator.cached_llm import CachedLLM
+    from linkedin_post_creator.fakes import FakeSerperResponse
+    from linkedin_post_creator.rate_limit import AdaptiveConcurrency, ProviderLimiter, TokenBucket
+
+    calls = []
+
+    def throttled_stream(self, messages, *args):
+        calls.append(1)
+        crewai_event_bus.emit(self, LLMCallStartedEvent(messages=messages))
+        crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk="Final Answer: Hello"))
+        raise requests.HTTPError("429 Client Error", response=FakeSerperResponse({}, 429, {'Retry-After': '0.01'}))
+
+    monkeypatch.setattr(LLM, 'call', throttled_stream)
+    limiter = ProviderLimiter('test', TokenBucket(rate=100, burst=5), AdaptiveConcurrency(4),
+                              registry=MetricsRegistry())
+    llm = CachedLLM(model='gemini/gemini-2.0-flash', stream=True, limiter=limiter)
+    tokens = []
+    with events.capture(lambda type, data: tokens.append(data['text']) if type == 'token' else None):
+        with pytest.raises(requests.HTTPError):
+            llm.call("Say hello")
+    assert tokens == ['Hello']
+    assert len(calls) == 1
+    assert limiter.stats()['retries'] == 0
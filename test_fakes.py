@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Fakes Tests
+
+Unit tests for the deterministic LLM and search fakes the offline tests and
+benchmark run on.
+"""
+
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.fakes import _SEARCH_TOOL, _TOOLS_PROMPT, FakeLLM, FakeSerperSession, fake_text
+from linkedin_post_creator.validator import validate_post
+
+TOOL_SYSTEM = f"You are Career Coach.\n{_TOOLS_PROMPT}:\n\nTool Name: {_SEARCH_TOOL}"
+
+
+def messages(system, prompt="Research remote work"):
+    return [{'role': 'system', 'content': system}, {'role': 'user', 'content': prompt}]
+
+
+def test_fake_text_is_deterministic():
+    assert fake_text(12, "seed") == fake_text(12, "seed")
+    assert fake_text(12, "seed") != fake_text(12, "other")
+    assert len(fake_text(12, "seed").split()) == 12
+
+
+def test_agents_with_tools_search_before_answering():
+    llm = FakeLLM(searches=1)
+    first = llm.call(messages(TOOL_SYSTEM))
+    assert f"Action: {_SEARCH_TOOL}" in first
+    history = messages(TOOL_SYSTEM) + [{'role': 'assistant', 'content': first + "\nObservation: results"}]
+    assert "Final Answer:" in llm.call(history)
+    assert llm.calls == 2
+
+
+def test_answers_are_deterministic_and_pass_the_validator():
+    llm = FakeLLM(tokens=120)
+    answer = llm.call(messages("You are Content Creator."))
+    assert answer == FakeLLM(tokens=120).call(messages("You are Content Creator."))
+    post = answer.split("Final Answer:", 1)[1].strip()
+    assert validate_post(post).ok, validate_post(post).violations
+
+
+def test_search_session_returns_results_for_the_query():
+    session = FakeSerperSession(results=3)
+    payload = session.post("https://google.serper.dev/search", json={'q': "ai trends"}).json()
+    assert payload['searchParameters']['q'] == "ai trends"
+    assert len(payload['organic']) == 3
+    assert payload == session.post("https://google.serper.dev/search", json={'q': "ai trends"}).json()
+
+
+def test_search_session_enforces_its_quota():
+    session = FakeSerperSession(quota_rps=2)
+    responses = [session.post("https://google.serper.dev/search", json={'q': str(i)}) for i in range(3)]
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[2].headers['Retry-After'] == "1"
+    with pytest.raises(requests.HTTPError):
+        responses[2].raise_for_status()
+    assert session.throttled == 1
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Job Store Tests
+
+Unit tests for the in-memory and SQLite job stores: eviction, TTL
+compaction and the SQLite store's batched writer.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.job_store import MemoryJobStore, SQLiteJobStore
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_memory_store_evicts_finished_jobs_first():
+    store = MemoryJobStore(max_entries=2)
+    store.create('running', {'status': 'running'})
+    store.create('done', {'status': 'completed'})
+    store.create('new', {'status': 'queued'})
+    assert store.get('running') is not None
+    assert store.get('done') is None
+    assert store.stats()['evictions'] == 1
+
+
+def test_memory_store_compacts_expired_finished_jobs():
+    store = MemoryJobStore(ttl_seconds=0.05)
+    store.create('done', {'status': 'completed'})
+    store.create('running', {'status': 'running'})
+    time.sleep(0.1)
+    assert store.compact() == 1
+    assert store.get('running') is not None
+
+
+def test_memory_store_lists_by_status_newest_first():
+    store = MemoryJobStore()
+    for job_id in ('a', 'b', 'c'):
+        store.create(job_id, {'status': 'queued'})
+        time.sleep(0.01)
+    store.update('b', status='completed')
+    assert [job['job_id'] for job in store.list_jobs(status='queued')] == ['c', 'a']
+    assert [job['job_id'] for job in store.list_jobs()] == ['b', 'c', 'a']
+
+
+def test_sqlite_store_overlays_pending_writes(sqlite_store):
+    sqlite_store.create('job', {'status': 'queued', 'progress': 'Queued', 'batch_id': 'b1'})
+    sqlite_store.update('job', progress='Researching')
+    assert sqlite_store.get('job')['progress'] == 'Researching'
+    sqlite_store.flush()
+    record = sqlite_store._load('job')
+    assert record['progress'] == 'Researching'
+    assert record['batch_id'] == 'b1'
+
+
+def test_sqlite_store_is_shared_between_instances(sqlite_store):
+    sqlite_store.create('job', {'status': 'completed', 'result': {'post': 'Hello'}})
+    sqlite_store.flush()
+    other = SQLiteJobStore(path=sqlite_store.path)
+    try:
+        assert other.get('job')['result'] == {'post': 'Hello'}
+        assert other.stats()['by_status'] == {'completed': 1}
+    finally:
+        other.close()
+
+
+def test_sqlite_store_retries_a_failed_batch(sqlite_store, monkeypatch):
+    write = sqlite_store._write
+    failures = []
+
+    def locked_once(statements):
+        if not failures:
+            failures.append(statements)
+            raise sqlite3.OperationalError("database is locked")
+        write(statements)
+
+    monkeypatch.setattr(sqlite_store, '_write', locked_once)
+    sqlite_store.create('job', {'status': 'queued'})
+    sqlite_store.flush()
+    assert failures
+    assert sqlite_store._writer.is_alive()
+    assert sqlite_store._load('job')['status'] == 'queued'
+    assert sqlite_store.stats()['failed_batches'] == 1
+
+
+def test_sqlite_store_update_keeps_fields_changed_by_another_process(tmp_path):
+    # The slow writer commits this process's update after the other process cancelled the job
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.db"), flush_interval=0.5)
+    other = SQLiteJobStore(path=store.path, flush_interval=0.01)
+    try:
+        store.create('job', {'status': 'running', 'progress': 'Researching', 'batch_id': 'b1'})
+        store.flush()
+        store.update('job', progress='Writing')
+        other.update('job', status='cancelled', attempt=2)
+        other.flush()
+        assert store.committed_status('job') == 'cancelled'
+        store.flush()
+        record = other.get('job')
+        assert record['status'] == 'cancelled'
+        assert record['progress'] == 'Writing'
+        assert record['attempt'] == 2
+        assert record['batch_id'] == 'b1'
+    finally:
+        other.close()
+        store.close()
+
+
+def test_sqlite_store_compacts_expired_finished_jobs(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.db"), ttl_seconds=0.05, flush_interval=0.01)
+    try:
+        store.create('done', {'status': 'failed'})
+        store.create('running', {'status': 'running'})
+        store.flush()
+        time.sleep(0.1)
+        assert store.compact() == 1
+        assert store.get('done') is None
+        assert store.get('running') is not None
+    finally:
+        store.close()
+
+
+def test_sqlite_store_delete_wins_over_a_batch_being_written(sqlite_store, monkeypatch):
+    # Rejected jobs are created and deleted right away, possibly while the writer holds their record
+    write = sqlite_store._write
+    writing, release, written = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_write(statements):
+        writing.set()
+        release.wait(5)
+        write(statements)
+        written.set()
+
+    monkeypatch.setattr(sqlite_store, '_write', slow_write)
+    sqlite_store.create('job', {'status': 'queued'})
+    assert writing.wait(5)
+    deleter = threading.Thread(target=sqlite_store.delete, args=('job',))
+    deleter.start()
+    time.sleep(0.05)
+    release.set()
+    deleter.join(5)
+    assert written.wait(5)
+    assert sqlite_store.get('job') is None
+    assert sqlite_store._load('job') is None
+
+
+def test_sqlite_store_lists_pending_writes(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.db"), flush_interval=0.01)
+    try:
+        store.create('old', {'status': 'queued'})
+        store.flush()
+        store._flush_lock.acquire()
+        try:
+            store.update('old', status='completed')
+            store.create('new', {'status': 'queued'})
+            assert [job['job_id'] for job in store.list_jobs(status='queued')] == ['new']
+            assert [job['job_id'] for job in store.list_jobs(status='completed')] == ['old']
+            assert [job['job_id'] for job in store.list_jobs(limit=1)] == ['new']
+            assert store.list_jobs(older_than=60) == []
+        finally:
+            store._flush_lock.release()
+    finally:
+        store.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Knowledge Index Tests
+
+Unit tests for chunking knowledge files, BM25 and vector search, and
+incremental rebuilds of the memory-mapped index.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.knowledge import STALE_GENERATION_SECONDS, KnowledgeIndex, split_chunks, tokenize
+from linkedin_post_creator.metrics import MetricsRegistry
+
+PREFERENCES = """I write for engineering managers and keep posts short.
+
+Never use more than three hashtags.
+"""
+
+PAST_POSTS = """Remote onboarding worked once we paired every new hire with a buddy.
+---
+Kubernetes costs dropped 40% after we right-sized our clusters.
+"""
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path):
+    directory = tmp_path / "knowledge"
+    directory.mkdir()
+    (directory / "preferences.md").write_text(PREFERENCES)
+    (directory / "past_posts.txt").write_text(PAST_POSTS)
+    (directory / "notes.json").write_text('{"ignored": true}')
+    return directory
+
+
+def index(knowledge_dir, **kwargs):
+    return KnowledgeIndex(directory=str(knowledge_dir), index_dir=str(knowledge_dir.parent / "index"),
+                          refresh_interval=0, registry=MetricsRegistry(), **kwargs)
+
+
+def test_split_chunks_at_paragraphs_and_separators():
+    assert split_chunks(PAST_POSTS) == [
+        "Remote onboarding worked once we paired every new hire with a buddy.",
+        "Kubernetes costs dropped 40% after we right-sized our clusters.",
+    ]
+
+
+def test_long_paragraphs_are_split_at_sentences():
+    paragraph = " ".join(f"Sentence {i} has five words." for i in range(10))
+    chunks = split_chunks(paragraph, max_words=12)
+    assert all(len(chunk.split()) <= 12 for chunk in chunks)
+    assert " ".join(chunks).split() == paragraph.split()
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The cost of the Clusters") == ['cost', 'clusters']
+
+
+def test_bm25_search_finds_the_relevant_passage(knowledge_dir):
+    knowledge = index(knowledge_dir)
+    results = knowledge.search("kubernetes clusters cost", k=1)
+    assert results[0]['source'] == "past_posts.txt"
+    assert results[0]['text'].startswith("Kubernetes costs dropped")
+    assert knowledge.search("quantum") == []
+    assert knowledge.stats()['files'] == 2
+
+
+def test_context_for_lists_the_snippets(knowledge_dir):
+    context = index(knowledge_dir).context_for("hashtags", k=1)
+    assert context.splitlines()[1] == "- [preferences.md] Never use more than three hashtags."
+    assert index(knowledge_dir).context_for("quantum") == ""
+
+
+def test_only_changed_files_are_reindexed(knowledge_dir):
+    knowledge = index(knowledge_dir)
+    knowledge.search("onboarding")
+    assert knowledge.stats()['files_indexed'] == 2
+
+    (knowledge_dir / "preferences.md").write_text(PREFERENCES + "\nAlways end with a question.\n")
+    assert knowledge.refresh()
+    assert knowledge.stats()['files_indexed'] == 3
+    assert knowledge.search("question", k=1)[0]['text'] == "Always end with a question."
+    assert knowledge.search("buddy", k=1)[0]['source'] == "past_posts.txt"
+
+    os.remove(knowledge_dir / "past_posts.txt")
+    assert knowledge.refresh()
+    assert knowledge.search("buddy") == []
+
+
+def test_index_is_shared_between_instances(knowledge_dir):
+    first = index(knowledge_dir)
+    first.refresh()
+    second = index(knowledge_dir)
+    assert not second.refresh()
+    assert second.stats()['files_indexed'] == 0
+    assert second.search("buddy", k=1)[0]['source'] == "past_posts.txt"
+
+
+def test_rebuild_removes_generations_left_by_a_lost_race(knowledge_dir):
+    knowledge = index(knowledge_dir)
+    knowledge.refresh()
+    index_dir = knowledge_dir.parent / "index"
+    # Another process's rebuild whose manifest lost the swap, and one still being written
+    stale = [index_dir / f"0123456789abcdef.{suffix}" for suffix in ('postings', 'docs', 'text')]
+    fresh = index_dir / "fedcba9876543210.postings"
+    for path in stale + [fresh]:
+        path.write_bytes(b"")
+    old = time.time() - STALE_GENERATION_SECONDS - 1
+    for path in stale:
+        os.utime(path, (old, old))
+
+    (knowledge_dir / "preferences.md").write_text(PREFERENCES + "\nAlways end with a question.\n")
+    assert knowledge.refresh()
+    assert not any(path.exists() for path in stale)
+    assert fresh.exists()
+    assert knowledge.search("question", k=1)[0]['text'] == "Always end with a question."
+
+
+def test_vector_mode_fuses_bm25_and_embeddings(knowledge_dir):
+    def embed(texts):
+        # Two-dimensional "embedding": does the text talk about people or about infrastructure
+        return [[sum(word in text.lower() for word in ('hire', 'buddy', 'onboarding', 'people')),
+                 sum(word in text.lower() for word in ('kubernetes', 'clusters', 'costs', 'servers'))] for text in texts]
+
+    knowledge = index(knowledge_dir, mode='vector', embedder=embed)
+    results = knowledge.search("servers", k=1)
+    assert results[0]['text'].startswith("Kubernetes costs dropped")
+
+
+def test_unknown_mode_is_rejected(knowledge_dir):
+    with pytest.raises(ValueError):
+        index(knowledge_dir, mode='graph')
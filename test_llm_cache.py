@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - LLM Response Cache Tests
+
+Unit tests for LLMResponseCache keys, TTLs, tiers and near-duplicate
+matching, and for when the cache is turned on.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.fakes import fake_text
+from linkedin_post_creator.llm_cache import LLMResponseCache, agent_role, create_llm_cache, response_key
+from linkedin_post_creator.metrics import MetricsRegistry
+
+MODEL = "gemini/gemini-2.5-pro"
+PARAMS = {'temperature': 0.7}
+
+
+def messages(prompt, role="Content Creator"):
+    return [
+        {'role': 'system', 'content': f"You are {role}. You write LinkedIn posts."},
+        {'role': 'user', 'content': prompt},
+    ]
+
+
+def cache(tmp_path, **kwargs):
+    return LLMResponseCache(directory=str(tmp_path / "llm"), registry=MetricsRegistry(), **kwargs)
+
+
+def test_key_ignores_whitespace_but_not_parameters():
+    assert response_key(MODEL, messages("Write  a\npost"), PARAMS) == response_key(MODEL, messages("Write a post"), PARAMS)
+    assert response_key(MODEL, messages("Write a post"), PARAMS) != response_key(MODEL, messages("Write a post"), {'temperature': 0.2})
+    assert response_key(MODEL, messages("Write a post"), PARAMS) != response_key("gemini/other", messages("Write a post"), PARAMS)
+
+
+def test_agent_role_comes_from_the_system_prompt():
+    assert agent_role(messages("hi", role="Writing Critic")) == "Writing Critic"
+    assert agent_role([{'role': 'user', 'content': 'hi'}]) == "unknown"
+
+
+def test_hit_from_memory_then_from_disk(tmp_path):
+    first = cache(tmp_path)
+    first.put(MODEL, messages("Write a post"), PARAMS, "A post")
+    assert first.get(MODEL, messages("Write a post"), PARAMS) == "A post"
+
+    second = cache(tmp_path)
+    assert second.get(MODEL, messages("Write a post"), PARAMS) == "A post"
+    stats = second.stats()
+    assert stats['disk_hits'] == 1
+    assert stats['by_agent']['Content Creator']['hits'] == 1
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    llm_cache = cache(tmp_path, ttl_seconds=0.05)
+    llm_cache.put(MODEL, messages("Write a post"), PARAMS, "A post")
+    time.sleep(0.1)
+    assert llm_cache.get(MODEL, messages("Write a post"), PARAMS) is None
+    assert cache(tmp_path, ttl_seconds=0.05).get(MODEL, messages("Write a post"), PARAMS) is None
+    assert not llm_cache._files()
+
+
+def test_disk_tier_keeps_the_most_recent_entries(tmp_path):
+    llm_cache = cache(tmp_path, max_disk_entries=2)
+    for i in range(3):
+        llm_cache.put(MODEL, messages(f"Prompt {i}"), PARAMS, f"Answer {i}")
+        time.sleep(0.01)
+    assert llm_cache.prune() == 1
+    assert cache(tmp_path).get(MODEL, messages("Prompt 0"), PARAMS) is None
+    assert cache(tmp_path).get(MODEL, messages("Prompt 2"), PARAMS) == "Answer 2"
+
+
+def test_near_duplicates_only_when_enabled(tmp_path):
+    prompt = fake_text(200, "near")
+    edited = prompt + " today"
+    exact = cache(tmp_path / "exact")
+    exact.put(MODEL, messages(prompt), PARAMS, "A post")
+    assert exact.get(MODEL, messages(edited), PARAMS) is None
+
+    near = cache(tmp_path / "near", near_duplicates=True, similarity_threshold=0.9)
+    near.put(MODEL, messages(prompt), PARAMS, "A post")
+    assert near.get(MODEL, messages(edited), PARAMS) == "A post"
+    assert near.get(MODEL, messages(fake_text(200, "other")), PARAMS) is None
+
+
+def test_cache_is_off_unless_enabled(tmp_path, monkeypatch):
+    monkeypatch.setenv('LLM_CACHE_DIR', str(tmp_path / "llm"))
+    monkeypatch.delenv('LLM_CACHE', raising=False)
+    assert create_llm_cache() is None
+    monkeypatch.setenv('LLM_CACHE', 'true')
+    assert create_llm_cache() is not None
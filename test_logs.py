@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Logging Tests
+
+Unit tests for the logging profiles, the queued JSON log writer and
+per-job traces.
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import logs
+from linkedin_post_creator.logs import JobTrace, configure_logging, log_profile, shutdown_logging, trace_job
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage(), record.fields))
+
+    def messages(self):
+        return [message for _, message, _ in self.records]
+
+
+@pytest.fixture
+def traced(monkeypatch):
+    handler = Records()
+    monkeypatch.setattr(logs.trace_logger, 'level', logging.DEBUG)
+    logs.trace_logger.addHandler(handler)
+    yield handler
+    logs.trace_logger.removeHandler(handler)
+
+
+@pytest.fixture
+def profile(monkeypatch):
+    """Let a test change the process-wide profile, restoring it afterwards"""
+    monkeypatch.setattr(logs, '_profile', None)
+    monkeypatch.setattr(logs, '_sample_rate', 0.0)
+    monkeypatch.delenv('LOG_PROFILE', raising=False)
+    return monkeypatch
+
+
+def test_profile_comes_from_the_environment(profile):
+    assert log_profile() == 'verbose'
+    assert logs.crew_verbose()
+    profile.setenv('LOG_PROFILE', 'Quiet')
+    assert log_profile() == 'quiet'
+    assert not logs.crew_verbose()
+    profile.setenv('LOG_PROFILE', 'chatty')
+    with pytest.raises(ValueError):
+        log_profile()
+
+
+def test_configure_logging_writes_json_lines_off_thread(profile):
+    stream = io.StringIO()
+    # Start a listener of our own even if an earlier import configured logging
+    shutdown_logging()
+    try:
+        assert configure_logging('structured', sample_rate=2.0, stream=stream) == 'structured'
+        assert logs.stats()['sample_rate'] == 1.0
+        logs.logger.info("started", extra={'fields': {'port': 8080}})
+    finally:
+        shutdown_logging()
+        logs.logger.propagate = True
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert (entry['message'], entry['port'], entry['level']) == ("started", 8080, 'INFO')
+
+
+def test_unsampled_jobs_only_log_failures(traced):
+    trace = JobTrace(['job'], sampled=False)
+    trace('task_completed', {'task': 'research_task'})
+    trace.finish(output=None)
+    assert traced.records == []
+    trace.finish(error=RuntimeError("boom"))
+    assert traced.records[0][:2] == (logging.ERROR, 'job_failed')
+    assert traced.records[0][2]['job_ids'] == ['job']
+
+
+def test_sampled_jobs_log_completions_but_not_starts(traced):
+    trace = JobTrace(['job'], sampled=True, fields={'run': 'abc'})
+    trace('task_started', {'task': 'research_task'})
+    trace('tool_finished', {'tool': 'search'})
+    trace('task_completed', {'task': 'research_task'})
+    trace.finish()
+    assert traced.messages() == ['tool_finished', 'task_completed', 'job_completed']
+    assert all(fields['run'] == 'abc' for _, _, fields in traced.records)
+
+
+def test_debug_jobs_log_every_event_and_the_streamed_answer(traced):
+    debug = []
+    trace = JobTrace(lambda: ['job-1', 'job-2'], debug=lambda: bool(debug), sampled=False)
+    trace('task_started', {'task': 'content_creation_task'})
+    debug.append(True)
+    trace('task_started', {'task': 'content_creation_task'})
+    trace('token', {'task': 'content_creation_task', 'text': 'Remote '})
+    trace('token', {'task': 'content_creation_task', 'text': 'teams win'})
+    trace('task_completed', {'task': 'content_creation_task'})
+    assert traced.messages() == ['task_started', 'task_completed']
+    assert traced.records[1][2]['answer'] == 'Remote teams win'
+    assert traced.records[1][2]['job_ids'] == ['job-1', 'job-2']
+
+
+def test_trace_job_logs_an_exception_leaving_the_block(traced):
+    with pytest.raises(ValueError), trace_job(['job']):
+        raise ValueError("bad input")
+    assert traced.messages() == ['job_failed']
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Metrics Tests
+
+Unit tests for the metrics primitives, the Prometheus export and the
+per-stage instrumentation of crew runs.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.fakes import FakeLLM
+from linkedin_post_creator.instrumentation import StageRecorder, record_stages
+from linkedin_post_creator.metrics import Histogram, MetricsRegistry, render_prometheus
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'professional', 'audience': 'engineers',
+          'current_year': '2026'}
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram("latency", buckets=(0.1, 1.0, 10.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 4
+    assert snapshot['p50'] == 1.0
+    assert snapshot['p99'] == 5.0
+    assert snapshot['buckets'] == {'0.1': 1, '1.0': 3, '10.0': 4, '+Inf': 4}
+
+
+def test_registry_reuses_metrics_by_name_and_labels():
+    registry = MetricsRegistry()
+    assert registry.counter("jobs_total") is registry.counter("jobs_total")
+    assert registry.counter("jobs_total", labels={'task': 'a'}) is not registry.counter("jobs_total")
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total")
+
+
+def test_prometheus_export_groups_labelled_series():
+    registry = MetricsRegistry()
+    registry.counter("tokens_total", "Tokens used", labels={'task': 'research_task'}).inc(5)
+    registry.counter("tokens_total", "Tokens used", labels={'task': 'say "hi"'}).inc(2)
+    registry.histogram("run_seconds", buckets=(1.0,)).observe(0.5)
+    text = render_prometheus(registry)
+    assert text.count("# TYPE tokens_total counter") == 1
+    assert 'tokens_total{task="research_task"} 5' in text
+    assert 'tokens_total{task="say \\"hi\\""} 2' in text
+    assert 'run_seconds_bucket{le="1.0"} 1' in text
+    assert "run_seconds_count 1" in text
+
+
+def test_stage_recorder_summarises_task_events():
+    registry = MetricsRegistry()
+    recorder = StageRecorder(queue_wait=0.25, registry=registry)
+    recorder('context_compacted', {'task': 'content_creation_task', 'context_tokens': 300, 'tokens_saved': 900})
+    recorder('task_started', {'task': 'content_creation_task', 'agent': 'Content Creator'})
+    recorder('agent_step', {'seconds': 0.5})
+    recorder('tool_finished', {'tool': 'Search the internet', 'seconds': 0.2, 'from_cache': True})
+    recorder('task_completed', {'task': 'content_creation_task', 'seconds': 1.0, 'prompt_tokens': 40,
+                                'completion_tokens': 10})
+    recorder.finish()
+
+    summary = recorder.summary()
+    assert summary['queue_wait_seconds'] == 0.25
+    assert summary['slowest_task'] == 'content_creation_task'
+    assert summary['context_tokens_saved'] == 900
+    stage = summary['tasks'][0]
+    assert (stage['llm_calls'], stage['search_calls'], stage['cached_tool_calls']) == (1, 1, 1)
+    assert stage['context_tokens'] == 300
+    assert registry.counter("crew_prompt_tokens_total", labels={'task': 'content_creation_task'}).value == 40
+
+
+def test_record_stages_of_a_crew_run(fake_creator):
+    llm = FakeLLM(searches=1)
+    with record_stages() as stages:
+        fake_creator(llm).crew().kickoff(inputs=INPUTS)
+    summary = stages.summary()
+    assert [stage['task'] for stage in summary['tasks']][:2] == ['research_task', 'content_creation_task']
+    assert summary['llm_calls'] == llm.calls
+    assert summary['search_calls'] == 1
+    assert summary['completion_tokens'] > 0
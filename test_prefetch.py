@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Prefetch Tests
+
+Unit tests for parsing prefetch pairs and for when a background prefetch
+gives way to live jobs.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.metrics import MetricsRegistry
+from linkedin_post_creator.prefetch import DEFAULT_INDUSTRY, ResearchPrefetcher, parse_pairs
+
+
+class FakeScheduler:
+    def __init__(self, spare=0, live=0):
+        self.spare = spare
+        self.live = live
+
+    def pending(self, priorities):
+        return self.live
+
+    def spare_workers(self):
+        return self.spare
+
+
+def prefetcher(scheduler, reserve_workers=1):
+    return ResearchPrefetcher(None, scheduler, reserve_workers=reserve_workers, registry=MetricsRegistry())
+
+
+def test_parse_pairs_defaults_the_industry():
+    assert parse_pairs("AI in Healthcare|Healthcare; Remote Work ;") == [
+        ('AI in Healthcare', 'Healthcare'),
+        ('Remote Work', DEFAULT_INDUSTRY),
+    ]
+    with pytest.raises(ValueError):
+        parse_pairs("|Technology")
+
+
+def test_prefetch_starts_only_with_workers_to_spare():
+    assert prefetcher(FakeScheduler(spare=2))._idle()
+    assert not prefetcher(FakeScheduler(spare=1))._idle()
+    assert not prefetcher(FakeScheduler(spare=2, live=1))._idle()
+
+
+def test_prefetch_gives_way_only_when_live_jobs_lack_workers():
+    assert not prefetcher(FakeScheduler(spare=0))._preempt()
+    assert not prefetcher(FakeScheduler(spare=3, live=1))._preempt()
+    assert prefetcher(FakeScheduler(spare=1, live=1))._preempt()
+    assert prefetcher(FakeScheduler(spare=0, live=2))._preempt()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Rate Limit Tests
+
+Unit tests for the provider token buckets, the AIMD concurrency limit and
+ProviderLimiter slots.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.cancellation import CancelToken, JobCancelledError
+from linkedin_post_creator.fakes import FakeSerperResponse
+from linkedin_post_creator.metrics import MetricsRegistry
+from linkedin_post_creator.rate_limit import (
+    DEFAULT_THROTTLE_BACKOFF,
+    AdaptiveConcurrency,
+    ProviderLimiter,
+    SharedTokenBucket,
+    TokenBucket,
+    throttle_delay,
+)
+
+
+def throttled(retry_after=None):
+    headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+    response = FakeSerperResponse({}, 429, headers)
+    return requests.HTTPError("429 Client Error", response=response)
+
+
+def test_throttle_delay_uses_retry_after():
+    assert throttle_delay(throttled(3)) == 3.0
+    assert throttle_delay(throttled()) == DEFAULT_THROTTLE_BACKOFF
+    assert throttle_delay(ValueError("boom")) is None
+
+
+def test_token_bucket_queues_callers_at_its_rate():
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_pause_delays_new_reservations():
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.pause(1.0)
+    assert bucket.reserve() == pytest.approx(1.1, abs=0.05)
+
+
+def test_shared_token_bucket_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = SharedTokenBucket(rate=1, burst=1, path=path, name='gemini')
+    second = SharedTokenBucket(rate=1, burst=1, path=path, name='gemini')
+    assert first.reserve() == 0.0
+    assert second.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_adaptive_concurrency_halves_once_per_round_and_grows_back():
+    concurrency = AdaptiveConcurrency(max_limit=8)
+    tokens = [concurrency.acquire() for _ in range(4)]
+    concurrency.release(tokens[0], throttled=True)
+    concurrency.release(tokens[1], throttled=True)
+    assert concurrency.limit == 4
+    for _ in range(8):
+        concurrency.release(concurrency.acquire())
+    assert concurrency.limit > 4
+
+
+def test_adaptive_concurrency_times_out_when_full():
+    concurrency = AdaptiveConcurrency(max_limit=1)
+    assert concurrency.acquire() is not None
+    assert concurrency.acquire(timeout=0.05) is None
+
+
+def limiter(bucket=None, max_concurrency=4, max_retries=2):
+    return ProviderLimiter('test', bucket, AdaptiveConcurrency(max_concurrency),
+                           max_retries=max_retries, registry=MetricsRegistry())
+
+
+def test_limiter_retries_throttled_calls():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise throttled(0.01)
+        return 'ok'
+
+    provider = limiter(TokenBucket(rate=100, burst=1))
+    assert provider.call(flaky) == 'ok'
+    assert provider.stats()['throttled'] == 1
+    assert provider.stats()['retries'] == 1
+
+
+def test_limiter_does_not_retry_when_the_caller_vetoes_it():
+    calls = []
+
+    def throttled_call():
+        calls.append(1)
+        raise throttled(0.01)
+
+    provider = limiter(TokenBucket(rate=100, burst=1))
+    with pytest.raises(requests.HTTPError):
+        provider.call(throttled_call, retry=lambda: False)
+    assert len(calls) == 1
+    assert provider.stats()['retries'] == 0
+
+
+def test_limiter_releases_the_slot_when_the_bucket_fails():
+    class BrokenBucket(TokenBucket):
+        def reserve(self, tokens=1):
+            raise sqlite3.OperationalError("database is locked")
+
+    provider = limiter(BrokenBucket(rate=1, burst=1))
+    with pytest.raises(sqlite3.OperationalError):
+        provider.call(lambda: 'never')
+    assert provider.concurrency.in_flight == 0
+
+
+def test_limiter_wait_stops_when_the_job_is_cancelled():
+    provider = limiter(TokenBucket(rate=0.1, burst=1))
+    provider.call(lambda: None)
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    start = time.monotonic()
+    with cancellation.bind(token), pytest.raises(JobCancelledError):
+        provider.call(lambda: None)
+    assert time.monotonic() - start < 1.0
+    assert provider.concurrency.in_flight == 0
+
+
+def test_limiter_waiting_for_a_slot_stops_when_the_job_is_cancelled():
+    provider = limiter(max_concurrency=1)
+    held = provider.concurrency.acquire()
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    with cancellation.bind(token), pytest.raises(JobCancelledError):
+        provider.call(lambda: None)
+    provider.concurrency.release(held)
+    assert provider.concurrency.in_flight == 0
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Research Cache Tests
+
+Unit tests for ResearchCache keys, TTLs and its memory and disk tiers.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.metrics import MetricsRegistry
+from linkedin_post_creator.research_cache import ResearchCache, create_research_cache, research_key
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'current_year': '2025'}
+
+
+def cache(tmp_path, **kwargs):
+    return ResearchCache(directory=str(tmp_path / "research"), registry=MetricsRegistry(), **kwargs)
+
+
+def test_key_ignores_tone_audience_and_spacing():
+    variant = dict(INPUTS, topic=' remote  work', tone='casual', audience='Founders')
+    assert research_key(variant) == research_key(INPUTS)
+    assert research_key(dict(INPUTS, current_year='2026')) != research_key(INPUTS)
+
+
+def test_hit_from_memory_then_from_disk(tmp_path):
+    first = cache(tmp_path)
+    first.put(INPUTS, "Findings", tokens=1200)
+    assert first.get(INPUTS).output == "Findings"
+
+    second = cache(tmp_path)
+    assert second.get(dict(INPUTS, tone='formal')).output == "Findings"
+    stats = second.stats()
+    assert stats['disk_hits'] == 1
+    assert stats['tokens_saved'] == 1200
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    research = cache(tmp_path, ttl_seconds=0.05)
+    research.put(INPUTS, "Findings")
+    time.sleep(0.1)
+    assert research.get(INPUTS) is None
+    assert research.peek(INPUTS) is None
+    assert research.prune() == 1
+    assert research.stats()['misses'] == 1
+
+
+def test_peek_does_not_count_lookups(tmp_path):
+    research = cache(tmp_path)
+    assert research.peek(INPUTS) is None
+    research.put(INPUTS, "Findings")
+    assert research.peek(INPUTS).output == "Findings"
+    stats = research.stats()
+    assert stats['misses'] == 0
+    assert stats['memory_hits'] == 0
+
+
+def test_memory_tier_keeps_the_most_recent_entries(tmp_path):
+    research = ResearchCache(directory=None, max_entries=2, registry=MetricsRegistry())
+    for year in ('2023', '2024', '2025'):
+        research.put(dict(INPUTS, current_year=year), f"Findings {year}")
+    assert research.get(dict(INPUTS, current_year='2023')) is None
+    assert research.get(dict(INPUTS, current_year='2025')).output == "Findings 2025"
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv('RESEARCH_CACHE_DIR', str(tmp_path / "research"))
+    monkeypatch.setenv('RESEARCH_CACHE', 'off')
+    assert create_research_cache() is None
+    monkeypatch.delenv('RESEARCH_CACHE')
+    assert create_research_cache() is not None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Scheduler Tests
+
+Unit tests for JobScheduler admission control, lane priority, cancellation
+of queued jobs and draining.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.metrics import MetricsRegistry
+from linkedin_post_creator.scheduler import JobScheduler, QueueFullError, SchedulerShutdownError
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(workers=1, max_queue=4, registry=MetricsRegistry())
+    yield scheduler
+    scheduler.shutdown(cancel_pending=True)
+
+
+def block(scheduler):
+    """Occupy the only worker until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait()
+
+    future = scheduler.submit(blocker)
+    started.wait()
+    return release, future
+
+
+def test_runs_jobs_and_reports_failures(scheduler):
+    assert scheduler.submit(lambda x: x * 2, 21).result(timeout=1) == 42
+    with pytest.raises(ZeroDivisionError):
+        scheduler.submit(lambda: 1 / 0).result(timeout=1)
+    assert scheduler.stats()['failed'] == 1
+
+
+def test_full_queue_rejects_with_retry_after(scheduler):
+    release, _ = block(scheduler)
+    for _ in range(4):
+        scheduler.submit(lambda: None)
+    with pytest.raises(QueueFullError) as error:
+        scheduler.submit(lambda: None)
+    assert error.value.retry_after >= 1
+    assert scheduler.stats()['rejected'] == 1
+    release.set()
+
+
+def test_low_lane_only_gets_its_share_of_the_queue(scheduler):
+    release, _ = block(scheduler)
+    scheduler.submit(lambda: None, priority='low')
+    scheduler.submit(lambda: None, priority='low')
+    with pytest.raises(QueueFullError):
+        scheduler.submit(lambda: None, priority='low')
+    scheduler.submit(lambda: None, priority='high')
+    release.set()
+
+
+def test_higher_lanes_run_first(scheduler):
+    release, _ = block(scheduler)
+    order = []
+    futures = [
+        scheduler.submit(order.append, priority, priority=priority)
+        for priority in ('low', 'normal', 'high')
+    ]
+    assert scheduler.pending(('high', 'normal')) == 2
+    assert scheduler.spare_workers() == 0
+    release.set()
+    for future in futures:
+        future.result(timeout=1)
+    assert order == ['high', 'normal', 'low']
+
+
+def test_cancel_frees_a_queued_slot(scheduler):
+    release, running = block(scheduler)
+    queued = scheduler.submit(lambda: 'never')
+    assert not scheduler.cancel(running)
+    assert scheduler.cancel(queued)
+    assert queued.cancelled()
+    assert scheduler.stats()['queue_depth'] == 0
+    release.set()
+
+
+def test_drain_waits_for_queued_jobs_then_refuses_work(scheduler):
+    release, _ = block(scheduler)
+    queued = scheduler.submit(lambda: 'done')
+    assert not scheduler.drain(timeout=0.05)
+    release.set()
+    assert scheduler.drain(timeout=1)
+    assert queued.result() == 'done'
+    with pytest.raises(SchedulerShutdownError):
+        scheduler.submit(lambda: None)
+
+
+def test_unknown_priority_is_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.submit(lambda: None, priority='urgent')
+
+
+def test_worker_threads_start_on_demand():
+    scheduler = JobScheduler(workers=4, registry=MetricsRegistry())
+    try:
+        assert scheduler.stats()['threads'] == 0
+        for _ in range(3):
+            scheduler.submit(lambda: None).result(timeout=1)
+            # The future resolves just before its worker goes back to waiting
+            while scheduler._idle < 1:
+                time.sleep(0.001)
+        # Sequential jobs are all picked up by the first, now idle, worker
+        assert scheduler.stats()['threads'] == 1
+    finally:
+        scheduler.shutdown()
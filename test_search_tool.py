@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Search Tool Tests
+
+Unit tests for CachedSerperDevTool's disk cache and in-flight
+de-duplication, run against the offline Serper fake.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator import cancellation
+from linkedin_post_creator.cancellation import CancelToken, JobCancelledError
+from linkedin_post_creator.fakes import FakeSerperSession, install_fake_search
+from linkedin_post_creator.tools.custom_tool import CachedSerperDevTool, normalize_query
+
+
+@pytest.fixture
+def tool(fake_search, tmp_path):
+    return CachedSerperDevTool(cache_dir=str(tmp_path))
+
+
+def test_normalize_query_ignores_case_stopwords_and_order():
+    assert normalize_query("The future of AI in Healthcare") == normalize_query("healthcare AI future")
+
+
+def test_repeated_search_is_served_from_disk_cache(tool):
+    session = FakeSerperSession()
+    install_fake_search(session)
+    first = tool._make_api_request("ai trends", "search")
+    second = tool._make_api_request("AI trends", "search")
+    assert first == second
+    assert session.requests == 1
+
+
+def test_concurrent_searches_share_one_request(tool):
+    session = FakeSerperSession(latency=0.3)
+    install_fake_search(session)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(tool._make_api_request("cloud costs", "search")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert session.requests == 1
+
+
+def test_follower_retries_when_leader_job_is_cancelled(tool, monkeypatch):
+    session = FakeSerperSession(latency=0.1)
+    install_fake_search(session)
+    send = tool._send
+    leader_started = threading.Event()
+
+    def cancelled_leader(search_query, search_type):
+        # The first request belongs to a job that is cancelled while it runs
+        if not leader_started.is_set():
+            leader_started.set()
+            time.sleep(0.3)
+            raise JobCancelledError("Job cancelled")
+        return send(search_query, search_type)
+
+    monkeypatch.setattr(tool, '_send', cancelled_leader)
+    errors, results = [], []
+
+    def leader():
+        try:
+            tool._make_api_request("edge computing", "search")
+        except JobCancelledError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    leader_started.wait()
+    results.append(tool._make_api_request("edge computing", "search"))
+    thread.join()
+
+    assert len(errors) == 1
+    assert results[0]['searchParameters']['q'] == "edge computing"
+    assert session.requests == 1
+
+
+def test_follower_stops_waiting_when_its_own_job_is_cancelled(tool):
+    install_fake_search(FakeSerperSession(latency=2.0))
+    leader = threading.Thread(target=tool._make_api_request, args=("slow query", "search"))
+    leader.start()
+    time.sleep(0.1)
+
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    start = time.monotonic()
+    with cancellation.bind(token), pytest.raises(JobCancelledError):
+        tool._make_api_request("slow query", "search")
+    assert time.monotonic() - start < 1.5
+    leader.join()
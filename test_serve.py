@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Production Server Tests
+
+Unit tests for the multi-worker server's settings and its shared job state
+requirement.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api import serve
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """Run serve.main without starting workers, recording the config it would use"""
+    configs = []
+    monkeypatch.setattr(serve, 'load_dotenv', lambda: None)
+    monkeypatch.setattr(serve, 'serve', lambda config: configs.append(config) or 0)
+    for name in ('JOB_STORE', 'SERVER_WORKERS', 'DRAIN_TIMEOUT'):
+        # Set first so monkeypatch restores the variable main() may set
+        monkeypatch.setenv(name, '')
+        monkeypatch.delenv(name)
+    return configs
+
+
+def test_config_leaves_time_for_the_job_drain(served, monkeypatch):
+    monkeypatch.setenv('DRAIN_TIMEOUT', '45')
+    assert serve.main(['--workers', '1', '--bind', '127.0.0.1:9000', '--graceful-timeout', '3']) == 0
+    config = served[0]
+    assert config.workers == 1
+    assert config.bind == ['127.0.0.1:9000']
+    assert config.graceful_timeout == 3
+    assert config.shutdown_timeout == 45 + serve.SHUTDOWN_MARGIN
+
+
+def test_several_workers_share_the_sqlite_job_store(served):
+    assert serve.main(['--workers', '2']) == 0
+    assert os.environ['JOB_STORE'] == 'sqlite'
+    assert served[0].workers == 2
+
+
+def test_several_workers_refuse_an_in_memory_job_store(served, monkeypatch):
+    monkeypatch.setenv('JOB_STORE', 'memory')
+    assert serve.main(['--workers', '2']) == 2
+    assert not served
+    assert serve.main(['--workers', '1']) == 0
+
+
+def test_workers_must_be_positive(served):
+    with pytest.raises(SystemExit):
+        serve.main(['--workers', '0'])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Startup Tests
+
+Unit tests for the lazy loading of the agent stack and the startup profile.
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.startup import StartupProfile, import_breakdown
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def loaded_after_import(modules, tmp_path):
+    """Heavy modules loaded by importing ``modules`` in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(ROOT, 'src'), ROOT]))
+    code = (
+        f"import sys\nfor m in {modules!r}: __import__(m)\n"
+        "print(','.join(m for m in ('crewai', 'crewai_tools', 'linkedin_post_creator.crew') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env,
+                               cwd=str(tmp_path), timeout=120)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    return completed.stdout.strip().splitlines()[-1] if completed.stdout.strip() else ""
+
+
+def test_api_and_cli_start_without_the_agent_stack(tmp_path):
+    assert loaded_after_import(['api.app', 'linkedin_post_creator.main'], tmp_path) == ""
+
+
+def test_warm_up_runs_once_and_times_each_step():
+    profile = StartupProfile()
+    calls = []
+    assert profile.warm_up(modules=['json'], steps=[('prefill', lambda: calls.append(1))])
+    assert not profile.warm_up(steps=[('prefill', lambda: calls.append(1))])
+    assert calls == [1]
+    assert profile.wait(0)
+    stats = profile.stats()
+    assert stats['warm'] and stats['error'] is None
+    assert {'prefill', 'warm_up'} <= set(stats['seconds'])
+
+
+def test_failed_warm_up_step_is_reported():
+    profile = StartupProfile()
+
+    def broken():
+        raise RuntimeError("no API key")
+
+    profile.warm_up(modules=[], steps=[('prefill', broken), ('listener', lambda: None)])
+    stats = profile.stats()
+    assert stats['warm']
+    assert stats['error'] == "RuntimeError: no API key"
+    assert 'listener' not in stats['seconds']
+
+
+def test_import_breakdown_summarises_a_fresh_import():
+    report = import_breakdown('linkedin_post_creator.metrics', top=50)
+    assert report['modules_imported'] > 0
+    assert 'linkedin_post_creator' in [row['package'] for row in report['by_package']]
+    assert 'linkedin_post_creator.metrics' in [row['module'] for row in report['slowest']]
+    assert len(import_breakdown('linkedin_post_creator.metrics', top=2)['slowest']) == 2
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Validator Tests
+
+Unit tests for the local post rules and the deterministic fixes applied to
+writer drafts before the critic runs.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.validator import EMOJI_RANGE, MAX_HEADLINE_CHARS, fix_post, validate_post
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'audience': 'Engineering Managers'}
+
+
+def test_valid_post_passes():
+    report = validate_post(
+        "Remote teams win 🚀\n\n"
+        "Async updates beat meetings. Write things down and trust people. 💡\n\n"
+        "#RemoteWork #Leadership #Async"
+    )
+    assert report.ok, report.violations
+    assert report.emojis == 2
+    assert report.hashtags == ['#RemoteWork', '#Leadership', '#Async']
+
+
+def test_violations_name_the_rule():
+    report = validate_post("This headline is far too long to be a hook line\n\nBody text.")
+    assert not report.ok
+    assert any("Headline" in violation for violation in report.violations)
+    assert any("hashtags" in violation for violation in report.violations)
+    assert any("emojis" in violation for violation in report.violations)
+
+
+def test_long_headline_is_split_at_a_clause_break():
+    report = fix_post(
+        "Remote work changed us: here is what we learned 🚀\n\n"
+        "Teams ship faster when they write. 💡\n\n#RemoteWork #Teams #Writing"
+    )
+    assert report.ok, report.violations
+    assert report.headline == "Remote work changed us"
+    assert len(report.headline) < MAX_HEADLINE_CHARS
+
+
+def test_missing_hashtags_come_from_the_inputs():
+    report = fix_post("Remote teams win 🚀\n\nAsync updates beat meetings. 💡", INPUTS)
+    assert report.ok, report.violations
+    assert report.hashtags == ['#RemoteWork', '#Technology', '#EngineeringManagers']
+
+
+def test_extra_emojis_are_trimmed():
+    report = fix_post("Remote teams win 🚀\n\nAsync 💡 updates ✅ beat 👉 meetings 🔥.\n\n#RemoteWork #Teams #Async")
+    assert report.ok, report.violations
+    assert report.emojis == EMOJI_RANGE[1]
+    assert "meetings." in report.text
+
+
+def test_short_single_paragraph_post_gets_enough_emojis():
+    report = fix_post("Remote teams win\n\nAsync updates beat meetings.\n\n#RemoteWork #Teams #Async")
+    assert report.ok, report.violations
+    assert report.emojis == EMOJI_RANGE[0]
+
+
+def test_headline_only_post_gets_enough_emojis():
+    report = fix_post("Remote teams win\n\n#RemoteWork #Teams #Async")
+    assert report.emojis == EMOJI_RANGE[0]
+    assert len(report.headline) < MAX_HEADLINE_CHARS
+
+
+def test_long_hook_is_left_alone_when_adding_emojis():
+    report = fix_post("Async beats meetings, mostly\n\nWrite it down.\n\n#RemoteWork #Teams #Async")
+    assert report.ok, report.violations
+    assert report.headline == "Async beats meetings, mostly"
+
+
+def test_word_count_is_never_fixed():
+    report = fix_post("Remote teams win 🚀\n\n" + "word " * 210 + "💡\n\n#RemoteWork #Teams #Async")
+    assert not report.ok
+    assert report.words > 200
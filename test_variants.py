@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Post Creator - Variant Tests
+
+Unit tests for parsing variant requests and for VariantRunner sharing one
+research pass between variants.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from linkedin_post_creator.scheduler import QueueFullError
+from linkedin_post_creator.variants import VariantError, VariantRunner, parse_variants
+
+INPUTS = {'topic': 'Remote Work', 'industry': 'Technology', 'tone': 'professional', 'audience': 'engineers',
+          'current_year': '2026'}
+
+
+class FakePipeline:
+    """Records research and run calls; a run for the ``fail`` tone raises"""
+
+    def __init__(self, research_error=None):
+        self.research_error = research_error
+        self.researched = 0
+        self.runs = []
+        self._lock = threading.Lock()
+
+    def research(self, inputs, refresh=False):
+        self.researched += 1
+        if self.research_error:
+            raise self.research_error
+        return "Report", False
+
+    def run(self, inputs, research=None, checkpoint=None):
+        with self._lock:
+            self.runs.append((inputs['tone'], inputs['audience'], research))
+        if inputs['tone'] == 'fail':
+            raise RuntimeError("writer failed")
+        return f"A {inputs['tone']} post for {inputs['audience']}"
+
+
+def test_explicit_variants_drop_duplicates():
+    variants = parse_variants({'variants': [{'tone': 'casual'}, {'tone': 'casual'}, {'audience': 'founders'}]}, 5)
+    assert variants == [{'tone': 'casual'}, {'audience': 'founders'}]
+
+
+def test_tones_and_audiences_are_combined():
+    variants = parse_variants({'tones': ['casual', 'formal'], 'audiences': ['founders', 'engineers']}, 10)
+    assert len(variants) == 4
+    assert {'tone': 'formal', 'audience': 'founders'} in variants
+    assert parse_variants({'tones': ['casual', 'formal'], 'audience': 'founders'}, 10) == [
+        {'tone': 'casual', 'audience': 'founders'},
+        {'tone': 'formal', 'audience': 'founders'},
+    ]
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {'variants': []},
+    {'variants': [{'topic': 'Other'}]},
+    {'variants': [{'tone': ' '}]},
+    {'tones': 'casual'},
+    {'tones': ['a', 'b', 'c']},
+])
+def test_malformed_requests_are_rejected(data):
+    with pytest.raises(VariantError):
+        parse_variants(data, 2)
+
+
+def test_runner_shares_research_and_reports_each_variant():
+    pipeline = FakePipeline()
+    variants = [{'tone': 'casual'}, {'tone': 'fail'}, {'audience': 'founders'}]
+    records = list(VariantRunner(pipeline, concurrency=2).run(INPUTS, variants))
+
+    assert records[0]['stage'] == 'research'
+    assert pipeline.researched == 1
+    assert {research for _, _, research in pipeline.runs} == {"Report"}
+    by_variant = {record['variant']: record for record in records[1:]}
+    assert by_variant[0]['result']['tone'] == 'casual'
+    assert by_variant[1]['status'] == 'failed'
+    assert by_variant[1]['error'] == "writer failed"
+    assert by_variant[2]['result']['audience'] == 'founders'
+
+
+def test_failed_research_stops_the_run():
+    pipeline = FakePipeline(research_error=RuntimeError("search down"))
+    records = list(VariantRunner(pipeline).run(INPUTS, [{'tone': 'casual'}]))
+    assert [record['status'] for record in records] == ['failed']
+    assert not pipeline.runs
+
+
+def test_runner_retries_when_the_queue_is_full():
+    executor = ThreadPoolExecutor(max_workers=2)
+    rejected = []
+
+    def submit(fn, *args):
+        if len(rejected) < 2:
+            rejected.append(fn)
+            raise QueueFullError("queue is full", retry_after=0)
+        return executor.submit(fn, *args)
+
+    try:
+        records = list(VariantRunner(FakePipeline(), submit=submit).run(INPUTS, [{'tone': 'casual'}]))
+    finally:
+        executor.shutdown()
+    assert len(rejected) == 2
+    assert [record['status'] for record in records] == ['completed', 'completed']
+
+
+def test_run_async_yields_the_same_records():
+    async def collect(runner):
+        return [record async for record in runner.run_async(INPUTS, [{'tone': 'casual'}, {'tone': 'fail'}])]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        records = asyncio.run(collect(VariantRunner(FakePipeline(), submit=executor.submit)))
+    assert records[0]['stage'] == 'research'
+    assert sorted(record['status'] for record in records[1:]) == ['completed', 'failed']